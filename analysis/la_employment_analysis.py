@@ -5,12 +5,18 @@ Analyze Los Angeles employment trends and sector concentration changes from 2013
 """
 
 import os
+import numpy as np
 import pandas as pd
 import requests
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime
 from dotenv import load_dotenv
+from oes_store import ResultStore
+from lq_engine import compute_location_quotients
+from rolling_metrics import RollingConcentration, month_index
+from shift_share import shift_share, shift_share_frame
+from bls_periods import add_period_columns, to_datetime, MONTHLY
+from seasonal import SeasonalFactors, adjust_frame
+from charts import render_chart, render_batch, draw_lq_trajectory
 
 # Load environment variables
 load_dotenv()
@@ -24,6 +30,7 @@ class LAEmploymentAnalyzer:
             raise ValueError("BLS_API_KEY not found in environment variables")
         
         self.base_url = "https://api.bls.gov/publicAPI/v2/timeseries/data/"
+        self.la_series_prefix = "CEU3108"  # LA series IDs; national IDs start with CEU + supersector
         self.session = requests.Session()
         self.session.headers.update({
             'BLS-API-KEY': self.api_key,
@@ -118,173 +125,288 @@ class LAEmploymentAnalyzer:
         
         return all_data
     
+    def sector_codes(self, series_ids):
+        """Supersector code shared by an LA series and its national counterpart"""
+        # LA:       CEU3108 00 SS 01  -> SS at [9:11]
+        # National: CEU SS 000000 01  -> SS at [3:5]
+        series_ids = pd.Series(series_ids, dtype='string')
+        is_la = series_ids.str.startswith(self.la_series_prefix)
+        return series_ids.str[9:11].where(is_la, series_ids.str[3:5])
+    
     def calculate_concentration_metrics(self, la_data, national_data):
         """Calculate employment concentration metrics"""
         # Convert to DataFrames
         la_df = pd.DataFrame(la_data)
         national_df = pd.DataFrame(national_data)
         
-        # Convert values to numeric
-        la_df['value'] = pd.to_numeric(la_df['value'], errors='coerce')
-        national_df['value'] = pd.to_numeric(national_df['value'], errors='coerce')
-        
-        # Create date column
-        la_df['date'] = pd.to_datetime(la_df['year'] + '-' + la_df['period'].str[1:], format='%Y-%m')
-        national_df['date'] = pd.to_datetime(national_df['year'] + '-' + national_df['period'].str[1:], format='%Y-%m')
+        if la_df.empty or national_df.empty:
+            return pd.DataFrame()
         
-        # Calculate concentration ratios (similar to location quotients)
-        concentration_data = []
-        
-        for la_series in la_df['series_id'].unique():
-            la_series_data = la_df[la_df['series_id'] == la_series]
-            la_description = la_series_data['description'].iloc[0]
+        frames = []
+        for df in (la_df, national_df):
+            # Convert values to numeric
+            df['value'] = pd.to_numeric(df['value'], errors='coerce')
             
-            # Find corresponding national series
-            national_series = la_series.replace('3108', '0000')  # Convert LA to national
-            national_series_data = national_df[national_df['series_id'] == national_series]
+            # Integer month index; annual (M13) and other non-monthly periods are skipped
+            df = add_period_columns(df)
+            df = df[df['frequency'] == MONTHLY].copy()
             
-            if not national_series_data.empty:
-                national_description = national_series_data['description'].iloc[0]
-                
-                # Merge on date
-                merged = pd.merge(la_series_data, national_series_data, 
-                                on='date', suffixes=('_la', '_national'))
-                
-                for _, row in merged.iterrows():
-                    try:
-                        la_value = float(row['value_la'])
-                        national_value = float(row['value_national'])
-                        
-                        # Calculate concentration ratio
-                        concentration_ratio = (la_value / national_value) * 100
-                        
-                        concentration_data.append({
-                            'date': row['date'],
-                            'sector': la_description.replace('Los Angeles ', ''),
-                            'la_employment': la_value,
-                            'national_employment': national_value,
-                            'concentration_ratio': concentration_ratio,
-                            'year': row['year_la']
-                        })
-                    except (ValueError, TypeError, ZeroDivisionError):
-                        continue
-        
-        return pd.DataFrame(concentration_data)
+            # Pair LA and national series by supersector code
+            df['sector_code'] = self.sector_codes(df['series_id']).to_numpy()
+            frames.append(df)
+        la_df, national_df = frames
+        
+        # Pivot once into aligned (month x sector) arrays
+        la_wide = la_df.pivot_table(index='time_index', columns='sector_code', values='value',
+                                    aggfunc='first', dropna=False, sort=True)
+        sector_order = [code for code in la_df['sector_code'].unique() if code in la_wide.columns]
+        la_wide = la_wide[sector_order]
+        national_wide = national_df.pivot_table(index='time_index', columns='sector_code', values='value',
+                                                aggfunc='first', dropna=False)
+        national_wide = national_wide.reindex(index=la_wide.index, columns=la_wide.columns)
+        
+        la_values = la_wide.to_numpy(dtype=float)
+        national_values = national_wide.to_numpy(dtype=float)
+        
+        # Calculate concentration ratios (similar to location quotients) in one division
+        with np.errstate(divide='ignore', invalid='ignore'):
+            concentration_ratio = (la_values / national_values) * 100
+        
+        # Keep (date, sector) cells where both series have a usable observation
+        valid = ~np.isnan(la_values) & ~np.isnan(national_values) & (national_values != 0)
+        
+        # Sector-major order: one block of months per LA series
+        months = la_wide.index.to_numpy()
+        sector_idx, date_idx = np.nonzero(valid.T)
+        
+        sector_names = (la_df.drop_duplicates('sector_code').set_index('sector_code')['description']
+                        .str.replace('Los Angeles ', '', regex=False))
+        sectors = sector_names.reindex(sector_order).to_numpy()
+        
+        return pd.DataFrame({
+            'date': to_datetime(months[date_idx]),
+            'sector': sectors[sector_idx],
+            'la_employment': la_values[date_idx, sector_idx],
+            'national_employment': national_values[date_idx, sector_idx],
+            'concentration_ratio': concentration_ratio[date_idx, sector_idx],
+            'year': (months[date_idx] // 12).astype(str),
+        })
+    
+    def seasonally_adjust(self, concentration_df, cache_path=os.path.join("oes_data", "seasonal_factors.npz")):
+        """Add seasonally adjusted employment and concentration columns (CEU series are NSA)"""
+        if concentration_df.empty:
+            return concentration_df
+        
+        cache = SeasonalFactors.load(cache_path) if os.path.exists(cache_path) else SeasonalFactors()
+        months = month_index(concentration_df['date'].dt.year, concentration_df['date'].dt.month)
+        
+        # LA and national series go through the same batch, keyed by area and sector
+        frame = pd.DataFrame({
+            'key': np.concatenate(["LA:" + concentration_df['sector'].astype(str),
+                                   "US:" + concentration_df['sector'].astype(str)]),
+            'time_index': np.concatenate([months, months]),
+            'value': np.concatenate([concentration_df['la_employment'].to_numpy(dtype=float),
+                                     concentration_df['national_employment'].to_numpy(dtype=float)]),
+        })
+        adjusted = adjust_frame(frame, 'key', 'time_index', 'value', cache).to_numpy()
+        
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        cache.save(cache_path)
+        
+        n = len(concentration_df)
+        result = concentration_df.assign(la_employment_sa=adjusted[:n], national_employment_sa=adjusted[n:])
+        result['concentration_ratio_sa'] = result['la_employment_sa'] / result['national_employment_sa'] * 100
+        return result
     
-    def analyze_concentration_changes(self, concentration_df):
-        """Analyze concentration changes from 2013 to 2023"""
+    def calculate_location_quotients(self, concentration_df, total_sector='Total Nonfarm Employment'):
+        """Calculate sector location quotients (LA vs national) for every month"""
+        if concentration_df.empty:
+            return pd.DataFrame()
+        
+        # Align LA and national employment as (date x sector) matrices
+        la = concentration_df.pivot_table(index='date', columns='sector', values='la_employment', aggfunc='first')
+        national = concentration_df.pivot_table(index='date', columns='sector', values='national_employment', aggfunc='first')
+        
+        if total_sector not in la.columns:
+            print(f"⚠️  '{total_sector}' not available, cannot calculate location quotients")
+            return pd.DataFrame()
+        
+        sectors = [sector for sector in la.columns if sector != total_sector]
+        national = national.reindex(index=la.index, columns=la.columns)
+        
+        # Each month is one row; its own national base broadcasts across sectors
+        lq = compute_location_quotients(
+            la[sectors].to_numpy(dtype=float),
+            area_totals=la[total_sector].to_numpy(dtype=float),
+            national=national[sectors].to_numpy(dtype=float),
+            national_total=national[total_sector].to_numpy(dtype=float),
+        )
+        
+        lq_df = pd.DataFrame(lq, index=la.index, columns=sectors).reset_index()
+        return lq_df.melt(id_vars='date', var_name='sector', value_name='location_quotient')
+    
+    def annual_concentration(self, concentration_df):
+        """Annual-average concentration ratios as a (sector x year) table, from the monthly rows"""
+        df = concentration_df
+        
+        # One groupby for every sector and year; ratio of annual-average employment
+        annual = df.groupby(['sector', 'year'], sort=False)[['la_employment', 'national_employment']].mean()
+        ratios = (annual['la_employment'] / annual['national_employment'] * 100).unstack('year')
+        
+        ratios = ratios.reindex(index=df['sector'].unique(), columns=sorted(ratios.columns))
+        ratios.columns = ratios.columns.astype(str)
+        return ratios
+    
+    def analyze_concentration_changes(self, concentration_df, start_year='2013', end_year='2023'):
+        """Analyze concentration changes between two years (2013 to 2023 by default)"""
         if concentration_df.empty:
             print("❌ No concentration data available")
             return None
         
-        # Get 2013 and 2023 data
-        data_2013 = concentration_df[concentration_df['year'] == '2013']
-        data_2023 = concentration_df[concentration_df['year'] == '2023']
+        ratios = self.annual_concentration(concentration_df)
+        start_year, end_year = str(start_year), str(end_year)
+        if start_year not in ratios.columns or end_year not in ratios.columns:
+            return pd.DataFrame()
+        
+        pair = ratios[[start_year, end_year]].dropna()
+        conc_start = pair[start_year].to_numpy()
+        conc_end = pair[end_year].to_numpy()
         
         # Calculate changes
-        changes = []
-        for sector in concentration_df['sector'].unique():
-            sector_2013 = data_2013[data_2013['sector'] == sector]
-            sector_2023 = data_2023[data_2023['sector'] == sector]
-            
-            if not sector_2013.empty and not sector_2023.empty:
-                conc_2013 = sector_2013['concentration_ratio'].iloc[0]
-                conc_2023 = sector_2023['concentration_ratio'].iloc[0]
-                
-                change = conc_2023 - conc_2013
-                percent_change = ((conc_2023 - conc_2013) / conc_2013) * 100 if conc_2013 > 0 else 0
-                
-                changes.append({
-                    'sector': sector,
-                    'concentration_2013': conc_2013,
-                    'concentration_2023': conc_2023,
-                    'change': change,
-                    'percent_change': percent_change
-                })
-        
-        return pd.DataFrame(changes)
+        change = conc_end - conc_start
+        with np.errstate(divide='ignore', invalid='ignore'):
+            percent_change = np.where(conc_start > 0, change / conc_start * 100, 0)
+        
+        return pd.DataFrame({
+            'sector': pair.index.to_numpy(),
+            f'concentration_{start_year}': conc_start,
+            f'concentration_{end_year}': conc_end,
+            'change': change,
+            'percent_change': percent_change
+        })
+    
+    def concentration_change_panel(self, concentration_df, years=None):
+        """Concentration changes for every sector and every (start, end) year pair at once"""
+        ratios = self.annual_concentration(concentration_df)
+        if years is not None:
+            ratios = ratios[[str(year) for year in years if str(year) in ratios.columns]]
+        
+        values = ratios.to_numpy(dtype=float)
+        year_labels = ratios.columns.to_numpy()
+        start_idx, end_idx = np.triu_indices(len(year_labels), k=1)
+        
+        # (sector x pair) arrays via fancy indexing
+        conc_start = values[:, start_idx]
+        conc_end = values[:, end_idx]
+        change = conc_end - conc_start
+        with np.errstate(divide='ignore', invalid='ignore'):
+            percent_change = np.where(conc_start > 0, change / conc_start * 100, 0)
+        
+        n_sectors, n_pairs = change.shape
+        panel = pd.DataFrame({
+            'sector': np.repeat(ratios.index.to_numpy(), n_pairs),
+            'start_year': np.tile(year_labels[start_idx], n_sectors),
+            'end_year': np.tile(year_labels[end_idx], n_sectors),
+            'concentration_start': conc_start.ravel(),
+            'concentration_end': conc_end.ravel(),
+            'change': change.ravel(),
+            'percent_change': percent_change.ravel()
+        })
+        return panel.dropna(subset=['change']).reset_index(drop=True)
+    
+    def shift_share_analysis(self, concentration_df, total_sector='Total Nonfarm Employment', years=None):
+        """Split LA sector employment change into national growth, industry mix and regional shift"""
+        if concentration_df.empty:
+            return pd.DataFrame()
+        
+        # Annual-average employment per sector, one column per year
+        annual = concentration_df.groupby(['sector', 'year'], sort=False)[['la_employment', 'national_employment']].mean()
+        la_annual = annual['la_employment'].unstack('year')
+        national_annual = annual['national_employment'].unstack('year').reindex(la_annual.index)
+        year_labels = sorted(la_annual.columns) if years is None else [str(y) for y in years]
+        la_annual, national_annual = la_annual[year_labels], national_annual[year_labels]
+        
+        if total_sector not in national_annual.index:
+            print(f"❌ No '{total_sector}' series for the national growth rate")
+            return pd.DataFrame()
+        
+        sectors = [sector for sector in concentration_df['sector'].unique() if sector != total_sector]
+        result = shift_share(la_annual.loc[sectors].to_numpy(dtype=float)[None],
+                             national_annual.loc[sectors].to_numpy(dtype=float),
+                             national_annual.loc[total_sector].to_numpy(dtype=float))
+        
+        return shift_share_frame(result, ["31080"], sectors, year_labels).drop(columns='metro')
+    
+    def update_rolling_metrics(self, concentration_df, state_path=os.path.join("oes_data", "la_rolling_state.npz"),
+                               revision_months=2):
+        """Update the persisted rolling 12-month state with new (and recently revised) months"""
+        if concentration_df.empty:
+            return pd.DataFrame()
+        
+        if os.path.exists(state_path):
+            state = RollingConcentration.load(state_path)
+            frame = concentration_df.assign(
+                area="31080",
+                month=month_index(concentration_df['date'].dt.year, concentration_df['date'].dt.month))
+            # Only months after the saved state, plus the latest months BLS may have revised
+            latest = state.last_month[:len(state)].max(initial=-1)
+            state.update_frame(frame[frame['month'] > latest - revision_months])
+        else:
+            state = RollingConcentration.from_frame(concentration_df, area="31080")
+        
+        os.makedirs(os.path.dirname(state_path), exist_ok=True)
+        state.save(state_path)
+        return state.metrics(total_sector='Total Nonfarm Employment')
     
     def create_visualizations(self, concentration_df, changes_df):
         """Create visualizations of the analysis"""
         if concentration_df.empty:
             return
         
-        # Set up the plotting style
-        plt.style.use('seaborn-v0_8')
-        fig, axes = plt.subplots(2, 2, figsize=(16, 12))
-        fig.suptitle('Los Angeles Employment Concentration Analysis (2013-2023)', fontsize=16, fontweight='bold')
-        
-        # 1. Concentration ratios over time
-        ax1 = axes[0, 0]
-        for sector in concentration_df['sector'].unique():
-            sector_data = concentration_df[concentration_df['sector'] == sector].sort_values('date')
-            if not sector_data.empty:
-                ax1.plot(sector_data['date'], sector_data['concentration_ratio'], label=sector, linewidth=2)
-        
-        ax1.set_title('Employment Concentration Ratios Over Time')
-        ax1.set_ylabel('Concentration Ratio (% of National)')
-        ax1.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
-        ax1.grid(True, alpha=0.3)
-        
-        # 2. Concentration changes (2013-2023)
-        ax2 = axes[0, 1]
-        if not changes_df.empty:
-            colors = ['green' if x > 0 else 'red' for x in changes_df['change']]
-            bars = ax2.barh(changes_df['sector'], changes_df['change'], color=colors, alpha=0.7)
-            ax2.set_title('Concentration Changes (2013-2023)')
-            ax2.set_xlabel('Change in Concentration Ratio')
-            ax2.axvline(x=0, color='black', linestyle='-', alpha=0.5)
-        
-        # 3. Latest concentration levels
-        ax3 = axes[1, 0]
-        latest_data = concentration_df.groupby('sector')['concentration_ratio'].last().sort_values(ascending=False)
-        if not latest_data.empty:
-            ax3.bar(range(len(latest_data)), latest_data.values, alpha=0.7)
-            ax3.set_title('Latest Employment Concentration Levels')
-            ax3.set_ylabel('Concentration Ratio (% of National)')
-            ax3.set_xticks(range(len(latest_data)))
-            ax3.set_xticklabels(latest_data.index, rotation=45, ha='right')
-        
-        # 4. Employment growth comparison
-        ax4 = axes[1, 1]
-        if not changes_df.empty:
-            # Calculate employment growth
-            la_growth = []
-            national_growth = []
-            sectors = []
-            
-            for sector in changes_df['sector']:
-                sector_data = concentration_df[concentration_df['sector'] == sector]
-                if len(sector_data) > 1:
-                    first_la = sector_data.iloc[0]['la_employment']
-                    last_la = sector_data.iloc[-1]['la_employment']
-                    first_national = sector_data.iloc[0]['national_employment']
-                    last_national = sector_data.iloc[-1]['national_employment']
-                    
-                    if first_la > 0 and first_national > 0:
-                        la_growth.append(((last_la - first_la) / first_la) * 100)
-                        national_growth.append(((last_national - first_national) / first_national) * 100)
-                        sectors.append(sector)
-            
-            if la_growth and national_growth:
-                x = range(len(sectors))
-                width = 0.35
-                ax4.bar([i - width/2 for i in x], la_growth, width, label='Los Angeles', alpha=0.7)
-                ax4.bar([i + width/2 for i in x], national_growth, width, label='National', alpha=0.7)
-                ax4.set_title('Employment Growth Comparison (2013-2023)')
-                ax4.set_ylabel('Growth Rate (%)')
-                ax4.set_xticks(x)
-                ax4.set_xticklabels(sectors, rotation=45, ha='right')
-                ax4.legend()
-        
-        plt.tight_layout()
+        # Precompute every aggregate the charts need
+        ratios = concentration_df.pivot_table(index='date', columns='sector', values='concentration_ratio',
+                                              aggfunc='first', sort=True)
+        ratios = ratios[[sector for sector in concentration_df['sector'].unique() if sector in ratios.columns]]
+        
+        ordered = concentration_df.sort_values('date', kind='stable')
+        by_sector = ordered.groupby('sector', sort=False)
+        latest_data = by_sector['concentration_ratio'].last().sort_values(ascending=False)
+        
+        growth = pd.DataFrame()
+        if changes_df is not None and not changes_df.empty:
+            # Employment growth from each sector's first to last observation
+            ends = by_sector[['la_employment', 'national_employment']].agg(['first', 'last', 'size'])
+            ends = ends.reindex(changes_df['sector'])
+            la_first, la_last = ends[('la_employment', 'first')], ends[('la_employment', 'last')]
+            national_first, national_last = ends[('national_employment', 'first')], ends[('national_employment', 'last')]
+            keep = (ends[('la_employment', 'size')] > 1) & (la_first > 0) & (national_first > 0)
+            growth = pd.DataFrame({
+                'la_growth': ((la_last - la_first) / la_first * 100)[keep],
+                'national_growth': ((national_last - national_first) / national_first * 100)[keep],
+            })
+        
+        changes = changes_df[['sector', 'change']] if changes_df is not None else pd.DataFrame()
         
         # Save the plot
         output_file = "la_employment_concentration_analysis.png"
-        plt.savefig(output_file, dpi=300, bbox_inches='tight')
-        print(f"📊 Visualization saved to {output_file}")
+        if render_chart(output_file, draw_concentration_dashboard, ratios, changes, latest_data, growth,
+                        nrows=2, ncols=2, figsize=(16, 12),
+                        title='Los Angeles Employment Concentration Analysis (2013-2023)'):
+            print(f"📊 Visualization saved to {output_file}")
+    
+    def create_sector_charts(self, lq_df, output_dir=os.path.join("charts", "sector_lq"), workers=None):
+        """Render one LQ trajectory chart per sector with the parallel batch renderer"""
+        if lq_df is None or lq_df.empty:
+            return None
+        
+        jobs = []
+        for sector, sector_data in lq_df.sort_values('date').groupby('sector', sort=False):
+            name = "".join(ch if ch.isalnum() else "_" for ch in sector).strip("_").lower()
+            jobs.append((name, (f"{sector} - Los Angeles vs U.S.",
+                                sector_data['date'].to_numpy(), sector_data['location_quotient'].to_numpy())))
         
-        plt.show()
+        print(f"\n📊 Rendering {len(jobs)} sector LQ charts...")
+        return render_batch(jobs, draw_lq_trajectory, output_dir, workers=workers)
     
     def print_analysis_results(self, changes_df):
         """Print analysis results"""
@@ -292,7 +414,11 @@ class LAEmploymentAnalyzer:
             print("❌ No analysis results available")
             return
         
-        print("\n📊 LOS ANGELES EMPLOYMENT CONCENTRATION ANALYSIS (2013-2023)")
+        # Years come from the concentration_<year> columns of analyze_concentration_changes
+        start_col, end_col = [col for col in changes_df.columns if col.startswith('concentration_')][:2]
+        start_year, end_year = start_col.split('_', 1)[1], end_col.split('_', 1)[1]
+        
+        print(f"\n📊 LOS ANGELES EMPLOYMENT CONCENTRATION ANALYSIS ({start_year}-{end_year})")
         print("=" * 80)
         
         # Sort by absolute change
@@ -300,18 +426,63 @@ class LAEmploymentAnalyzer:
         
         print("\n🏆 BIGGEST CONCENTRATION CHANGES")
         print("-" * 80)
-        print(f"{'Rank':<4} {'Sector':<40} {'2013':<8} {'2023':<8} {'Change':<8} {'% Change':<10}")
+        print(f"{'Rank':<4} {'Sector':<40} {start_year:<8} {end_year:<8} {'Change':<8} {'% Change':<10}")
         print("-" * 80)
         
         for i, (_, row) in enumerate(changes_df_sorted.iterrows(), 1):
             change_symbol = "+" if row['change'] > 0 else ""
             percent_symbol = "+" if row['percent_change'] > 0 else ""
-            print(f"{i:<4} {row['sector'][:39]:<40} {row['concentration_2013']:<8.2f} {row['concentration_2023']:<8.2f} {change_symbol}{row['change']:<7.2f} {percent_symbol}{row['percent_change']:<9.1f}%")
+            print(f"{i:<4} {row['sector'][:39]:<40} {row[start_col]:<8.2f} {row[end_col]:<8.2f} {change_symbol}{row['change']:<7.2f} {percent_symbol}{row['percent_change']:<9.1f}%")
         
-        # Save results
-        output_file = "la_employment_concentration_changes.csv"
-        changes_df.to_csv(output_file, index=False)
-        print(f"\n💾 Complete results saved to {output_file}")
+        # Save results (Parquet partitioned by area; CSV only when export is enabled)
+        store = ResultStore()
+        store.write(changes_df, "la_employment_concentration_changes", area="31080",
+                    csv_path="la_employment_concentration_changes.csv")
+        print(f"\n💾 Complete results saved to {store.table_dir('la_employment_concentration_changes')}")
+
+def draw_concentration_dashboard(fig, axes, ratios, changes, latest_data, growth):
+    """Draw the 2x2 concentration dashboard from precomputed aggregates"""
+    # 1. Concentration ratios over time
+    ax1 = axes[0, 0]
+    for sector in ratios.columns:
+        sector_data = ratios[sector].dropna()
+        ax1.plot(sector_data.index, sector_data.values, label=sector, linewidth=2)
+    
+    ax1.set_title('Employment Concentration Ratios Over Time')
+    ax1.set_ylabel('Concentration Ratio (% of National)')
+    ax1.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
+    ax1.grid(True, alpha=0.3)
+    
+    # 2. Concentration changes (2013-2023)
+    ax2 = axes[0, 1]
+    if not changes.empty:
+        colors = np.where(changes['change'] > 0, 'green', 'red')
+        ax2.barh(changes['sector'], changes['change'], color=colors, alpha=0.7)
+        ax2.set_title('Concentration Changes (2013-2023)')
+        ax2.set_xlabel('Change in Concentration Ratio')
+        ax2.axvline(x=0, color='black', linestyle='-', alpha=0.5)
+    
+    # 3. Latest concentration levels
+    ax3 = axes[1, 0]
+    if not latest_data.empty:
+        ax3.bar(range(len(latest_data)), latest_data.values, alpha=0.7)
+        ax3.set_title('Latest Employment Concentration Levels')
+        ax3.set_ylabel('Concentration Ratio (% of National)')
+        ax3.set_xticks(range(len(latest_data)))
+        ax3.set_xticklabels(latest_data.index, rotation=45, ha='right')
+    
+    # 4. Employment growth comparison
+    ax4 = axes[1, 1]
+    if not growth.empty:
+        x = np.arange(len(growth))
+        width = 0.35
+        ax4.bar(x - width/2, growth['la_growth'], width, label='Los Angeles', alpha=0.7)
+        ax4.bar(x + width/2, growth['national_growth'], width, label='National', alpha=0.7)
+        ax4.set_title('Employment Growth Comparison (2013-2023)')
+        ax4.set_ylabel('Growth Rate (%)')
+        ax4.set_xticks(x)
+        ax4.set_xticklabels(growth.index, rotation=45, ha='right')
+        ax4.legend()
 
 def main():
     """Main function to run the analysis"""
@@ -339,10 +510,27 @@ def main():
             # Calculate concentration metrics
             print("\n📈 Calculating concentration metrics...")
             concentration_df = analyzer.calculate_concentration_metrics(la_data, national_data)
+            concentration_df = analyzer.seasonally_adjust(concentration_df)
+            lq_df = analyzer.calculate_location_quotients(concentration_df)
+            rolling_df = analyzer.update_rolling_metrics(concentration_df)
+            if not rolling_df.empty:
+                ResultStore().write(rolling_df, "la_rolling_concentration", area="31080")
+                print(f"🔄 Updated rolling 12-month metrics for {len(rolling_df)} sectors")
+            if not lq_df.empty:
+                ResultStore().write(lq_df, "la_sector_location_quotients", area="31080")
+                print(f"📍 Calculated {lq_df['location_quotient'].notna().sum()} monthly sector location quotients")
             
             # Analyze changes
             print("\n📊 Analyzing concentration changes...")
             changes_df = analyzer.analyze_concentration_changes(concentration_df)
+            panel_df = analyzer.concentration_change_panel(concentration_df)
+            shift_share_df = analyzer.shift_share_analysis(concentration_df)
+            if not shift_share_df.empty:
+                ResultStore().write(shift_share_df, "la_shift_share", area="31080")
+                print(f"📊 Decomposed {len(shift_share_df)} sector changes into shift-share components")
+            if not panel_df.empty:
+                ResultStore().write(panel_df, "la_concentration_change_panel", area="31080")
+                print(f"📊 Computed {len(panel_df)} sector changes across all year pairs")
             
             # Print results
             analyzer.print_analysis_results(changes_df)
@@ -350,6 +538,7 @@ def main():
             # Create visualizations
             print("\n📊 Creating visualizations...")
             analyzer.create_visualizations(concentration_df, changes_df)
+            analyzer.create_sector_charts(lq_df)
             
             print(f"\n✅ Analysis completed successfully!")
         else:
@@ -10,6 +10,9 @@ import requests
 import time
 from datetime import datetime
 from dotenv import load_dotenv
+from lq_ranking import rank_top_k, format_rank_rows, print_rank_table, signed
+from oes_store import ResultStore
+from lq_significance import add_change_significance
 
 # Load environment variables
 load_dotenv()
@@ -247,9 +250,14 @@ class LALocationQuotientAnalyzer:
         # Format: OES + Area Code + Occupation Code + 00000000000000000000
         return f"OES{self.la_area_code}{occupation_code}00000000000000000000"
     
-    def fetch_location_quotient_data(self, occupation_code, start_year=2013, end_year=2023):
-        """Fetch location quotient data for a specific occupation"""
-        series_id = self.generate_series_id(occupation_code)
+    def generate_rse_series_id(self, occupation_code):
+        """Generate OES series ID for the employment percent relative standard error"""
+        # Format: OEU + M (MSA) + 7-digit area + 000000 (all industries) + occupation + 02 (employment RSE)
+        return f"OEUM{self.la_area_code:0>7}000000{occupation_code}02"
+    
+    def fetch_location_quotient_data(self, occupation_code, start_year=2013, end_year=2023, series_id=None):
+        """Fetch location quotient data (or another series, e.g. RSE) for a specific occupation"""
+        series_id = series_id or self.generate_series_id(occupation_code)
         
         payload = {
             "seriesid": [series_id],
@@ -274,8 +282,8 @@ class LALocationQuotientAnalyzer:
             print(f"Error fetching data for {occupation_code}: {e}")
             return []
     
-    def analyze_location_quotient_changes(self):
-        """Analyze location quotient changes from 2013 to 2023"""
+    def analyze_location_quotient_changes(self, include_rse=False):
+        """Analyze location quotient changes from 2013 to 2023 (optionally with employment RSEs)"""
         print("🔍 Analyzing Los Angeles Location Quotient Changes (2013-2023)")
         print("=" * 70)
         
@@ -310,14 +318,22 @@ class LALocationQuotientAnalyzer:
                         change = lq_2023 - lq_2013
                         percent_change = ((lq_2023 - lq_2013) / lq_2013) * 100 if lq_2013 > 0 else 0
                         
-                        results.append({
+                        record = {
                             'occupation_code': code,
                             'description': description,
                             'lq_2013': lq_2013,
                             'lq_2023': lq_2023,
                             'change': change,
                             'percent_change': percent_change
-                        })
+                        }
+                        
+                        if include_rse:
+                            rse_data = self.fetch_location_quotient_data(code, series_id=self.generate_rse_series_id(code))
+                            rse_by_year = {int(item.get('year', 0)): item.get('value') for item in rse_data}
+                            record['rse_2013'] = rse_by_year.get(2013)
+                            record['rse_2023'] = rse_by_year.get(2023)
+                        
+                        results.append(record)
                         
                     except (ValueError, TypeError):
                         continue
@@ -336,41 +352,50 @@ class LALocationQuotientAnalyzer:
         # Convert to DataFrame for easier analysis
         df = pd.DataFrame(results)
         
-        # Sort by absolute change (biggest changes first)
-        df_sorted_by_change = df.sort_values('change', key=abs, ascending=False)
+        # Delta-method significance when employment RSEs were collected
+        has_rse = 'rse_2013' in df.columns and 'rse_2023' in df.columns
+        if has_rse:
+            df = add_change_significance(df, ('lq_2013', 'lq_2023'), ('rse_2013', 'rse_2023'))
         
-        # Sort by percent change
-        df_sorted_by_percent = df.sort_values('percent_change', key=abs, ascending=False)
+        # Select the top 20 by absolute and percent change in one partial-selection pass
+        rankings = rank_top_k(df, {
+            'change': ('change', 'abs'),
+            'percent_change': ('percent_change', 'abs'),
+        }, k=20)
         
         print(f"\n📈 Analysis Complete: {len(df)} occupations with data")
         print("=" * 70)
         
-        # Show biggest absolute changes
-        print("\n🏆 BIGGEST ABSOLUTE CHANGES IN LOCATION QUOTIENT (2013-2023)")
-        print("-" * 70)
-        print(f"{'Rank':<4} {'Occupation':<50} {'2013':<8} {'2023':<8} {'Change':<8} {'% Change':<10}")
-        print("-" * 70)
+        header = f"{'Rank':<4} {'Occupation':<50} {'2013':<8} {'2023':<8} {'Change':<8} {'% Change':<10}"
+        table_columns = [
+            ('description', '<50.49'),
+            ('lq_2013', '<8.2f'),
+            ('lq_2023', '<8.2f'),
+            ('change', signed('<7.2f')),
+            ('percent_change', signed('<9.1f', '%')),
+        ]
         
-        for i, (_, row) in enumerate(df_sorted_by_change.head(20).iterrows(), 1):
-            change_symbol = "+" if row['change'] > 0 else ""
-            percent_symbol = "+" if row['percent_change'] > 0 else ""
-            print(f"{i:<4} {row['description'][:49]:<50} {row['lq_2013']:<8.2f} {row['lq_2023']:<8.2f} {change_symbol}{row['change']:<7.2f} {percent_symbol}{row['percent_change']:<9.1f}%")
+        # Show biggest absolute changes
+        print_rank_table("\n🏆 BIGGEST ABSOLUTE CHANGES IN LOCATION QUOTIENT (2013-2023)", header,
+                         format_rank_rows(df, rankings['change'], table_columns))
         
         # Show biggest percent changes
-        print(f"\n📊 BIGGEST PERCENTAGE CHANGES IN LOCATION QUOTIENT (2013-2023)")
-        print("-" * 70)
-        print(f"{'Rank':<4} {'Occupation':<50} {'2013':<8} {'2023':<8} {'Change':<8} {'% Change':<10}")
-        print("-" * 70)
+        print_rank_table("\n📊 BIGGEST PERCENTAGE CHANGES IN LOCATION QUOTIENT (2013-2023)", header,
+                         format_rank_rows(df, rankings['percent_change'], table_columns))
         
-        for i, (_, row) in enumerate(df_sorted_by_percent.head(20).iterrows(), 1):
-            change_symbol = "+" if row['change'] > 0 else ""
-            percent_symbol = "+" if row['percent_change'] > 0 else ""
-            print(f"{i:<4} {row['description'][:49]:<50} {row['lq_2013']:<8.2f} {row['lq_2023']:<8.2f} {change_symbol}{row['change']:<7.2f} {percent_symbol}{row['percent_change']:<9.1f}%")
+        # Show changes that stand out from sampling noise
+        if has_rse:
+            print(f"\n🎯 Significant changes (|z| ≥ 1.96): {int(df['significant'].sum())} of {df['z_score'].notna().sum()} with RSEs")
+            top_z = rank_top_k(df, {'z': ('z_score', 'abs')}, k=20)['z']
+            z_header = f"{'Rank':<4} {'Occupation':<50} {'2013':<8} {'2023':<8} {'Change':<8} {'z':<8}"
+            print_rank_table("\n📐 BIGGEST CHANGES BY Z-SCORE (2013-2023)", z_header,
+                             format_rank_rows(df, top_z, table_columns[:4] + [('z_score', '<+8.2f')]))
         
-        # Save results
-        output_file = "la_location_quotient_changes_2013_2023.csv"
-        df.to_csv(output_file, index=False)
-        print(f"\n💾 Complete results saved to {output_file}")
+        # Save results (Parquet partitioned by area; CSV only when export is enabled)
+        store = ResultStore()
+        store.write(df, "la_location_quotient_changes_2013_2023", area=self.la_area_code,
+                    csv_path="la_location_quotient_changes_2013_2023.csv")
+        print(f"\n💾 Complete results saved to {store.table_dir('la_location_quotient_changes_2013_2023')}")
         
         return df
 
@@ -4,11 +4,13 @@ Manual OES Data Analysis for Los Angeles Location Quotients
 Analyze manually downloaded OES data files for Los Angeles MSA
 """
 
+import numpy as np
 import pandas as pd
 import os
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime
+from lq_ranking import rank_top_k, format_rank_rows, print_rank_table, signed
+from oes_store import ResultStore
+from charts import render_chart
 
 def analyze_manual_oes_data():
     """Analyze manually downloaded OES data"""
@@ -160,50 +162,33 @@ def analyze_location_quotients(data_2019, data_2024):
     
     print(f"📊 Analysis complete: {len(merged)} occupations with data")
     
-    # Rank by absolute change
-    biggest_changes = merged.sort_values('lq_change', key=abs, ascending=False)
+    # Select the biggest absolute and percentage changes in one partial-selection pass
+    rankings = rank_top_k(merged, {
+        'change': ('lq_change', 'abs'),
+        'percent': ('lq_percent_change', 'abs'),
+    }, k={'change': 20, 'percent': 10})
+    
+    header = f"{'Rank':<4} {'Occupation':<50} {'2019':<8} {'2024':<8} {'Change':<8} {'% Change':<10}"
+    table_columns = [
+        (occupation_col, lambda v: f"{str(v)[:49]:<50}"),
+        (lq_col_2019, '<8.2f'),
+        (lq_col_2024, '<8.2f'),
+        ('lq_change', signed('<7.2f')),
+        ('lq_percent_change', signed('<9.1f', '%')),
+    ]
     
-    print(f"\n🏆 BIGGEST LOCATION QUOTIENT CHANGES (2019-2024)")
-    print("-" * 80)
-    print(f"{'Rank':<4} {'Occupation':<50} {'2019':<8} {'2024':<8} {'Change':<8} {'% Change':<10}")
-    print("-" * 80)
-    
-    for i, (_, row) in enumerate(biggest_changes.head(20).iterrows(), 1):
-        occupation = str(row[occupation_col])[:49]
-        lq_2019 = row[lq_col_2019]
-        lq_2024 = row[lq_col_2024]
-        change = row['lq_change']
-        percent_change = row['lq_percent_change']
-        
-        change_symbol = "+" if change > 0 else ""
-        percent_symbol = "+" if percent_change > 0 else ""
-        
-        print(f"{i:<4} {occupation:<50} {lq_2019:<8.2f} {lq_2024:<8.2f} {change_symbol}{change:<7.2f} {percent_symbol}{percent_change:<9.1f}%")
+    print_rank_table(f"\n🏆 BIGGEST LOCATION QUOTIENT CHANGES (2019-2024)", header,
+                     format_rank_rows(merged, rankings['change'], table_columns), rule_width=80)
     
     # Show biggest percentage changes
-    biggest_percent = merged.sort_values('lq_percent_change', key=abs, ascending=False)
+    print_rank_table(f"\n📈 BIGGEST PERCENTAGE CHANGES (2019-2024)", header,
+                     format_rank_rows(merged, rankings['percent'], table_columns), rule_width=80)
     
-    print(f"\n📈 BIGGEST PERCENTAGE CHANGES (2019-2024)")
-    print("-" * 80)
-    print(f"{'Rank':<4} {'Occupation':<50} {'2019':<8} {'2024':<8} {'Change':<8} {'% Change':<10}")
-    print("-" * 80)
-    
-    for i, (_, row) in enumerate(biggest_percent.head(10).iterrows(), 1):
-        occupation = str(row[occupation_col])[:49]
-        lq_2019 = row[lq_col_2019]
-        lq_2024 = row[lq_col_2024]
-        change = row['lq_change']
-        percent_change = row['lq_percent_change']
-        
-        change_symbol = "+" if change > 0 else ""
-        percent_symbol = "+" if percent_change > 0 else ""
-        
-        print(f"{i:<4} {occupation:<50} {lq_2019:<8.2f} {lq_2024:<8.2f} {change_symbol}{change:<7.2f} {percent_symbol}{percent_change:<9.1f}%")
-    
-    # Save results
-    output_file = os.path.join("oes_data", "la_location_quotient_analysis_2019_2024.csv")
-    merged.to_csv(output_file, index=False)
-    print(f"\n💾 Complete analysis saved to {output_file}")
+    # Save results (Parquet partitioned by area; CSV only when export is enabled)
+    store = ResultStore()
+    store.write(merged, "la_location_quotient_analysis_2019_2024", area="31080",
+                csv_path=os.path.join("oes_data", "la_location_quotient_analysis_2019_2024.csv"))
+    print(f"\n💾 Complete analysis saved to {store.table_dir('la_location_quotient_analysis_2019_2024')}")
     
     return merged
 
@@ -214,38 +199,52 @@ def create_visualizations(results, data_2019, data_2024):
     
     print("\n📊 Creating visualizations...")
     
-    # Set up the plotting style
-    plt.style.use('seaborn-v0_8')
-    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
-    fig.suptitle('Los Angeles Location Quotient Analysis (2019-2024)', fontsize=16, fontweight='bold')
+    # Precompute the aggregates the charts need
+    rankings = rank_top_k(results, {'change': ('lq_change', 'abs'), 'percent': ('lq_percent_change', 'abs')}, k=10)
+    labels = results.iloc[:, 0].astype(str)
+    short_labels = labels.where(labels.str.len() <= 30, labels.str[:30] + '...')
+    top_10_changes = pd.DataFrame({'label': short_labels.to_numpy()[rankings['change']],
+                                   'value': results['lq_change'].to_numpy()[rankings['change']]})
+    top_10_percent = pd.DataFrame({'label': short_labels.to_numpy()[rankings['percent']],
+                                   'value': results['lq_percent_change'].to_numpy()[rankings['percent']]})
+    
+    # Get the LQ column names
+    lq_cols = [col for col in results.columns if 'lq' in col.lower() and any(year in col for year in ['2019', '2024'])]
+    scatter = results[lq_cols[:2]].reset_index(drop=True) if len(lq_cols) >= 2 else pd.DataFrame()
     
+    # Save the plot
+    output_file = os.path.join("oes_data", "la_location_quotient_visualization.png")
+    if render_chart(output_file, draw_location_quotient_dashboard, top_10_changes, top_10_percent,
+                    results['lq_change'].reset_index(drop=True), scatter,
+                    nrows=2, ncols=2, figsize=(16, 12),
+                    title='Los Angeles Location Quotient Analysis (2019-2024)'):
+        print(f"📊 Visualization saved to {output_file}")
+
+def draw_location_quotient_dashboard(fig, axes, top_10_changes, top_10_percent, lq_changes, scatter):
+    """Draw the 2x2 location quotient dashboard from precomputed aggregates"""
     # 1. Biggest absolute changes
     ax1 = axes[0, 0]
-    top_10_changes = results.sort_values('lq_change', key=abs, ascending=False).head(10)
-    
-    colors = ['green' if x > 0 else 'red' for x in top_10_changes['lq_change']]
-    bars = ax1.barh(range(len(top_10_changes)), top_10_changes['lq_change'], color=colors, alpha=0.7)
+    colors = np.where(top_10_changes['value'] > 0, 'green', 'red')
+    ax1.barh(range(len(top_10_changes)), top_10_changes['value'], color=colors, alpha=0.7)
     ax1.set_title('Biggest Location Quotient Changes (2019-2024)')
     ax1.set_xlabel('Change in Location Quotient')
     ax1.set_yticks(range(len(top_10_changes)))
-    ax1.set_yticklabels([str(x)[:30] + '...' if len(str(x)) > 30 else str(x) for x in top_10_changes.iloc[:, 0]], fontsize=8)
+    ax1.set_yticklabels(top_10_changes['label'], fontsize=8)
     ax1.axvline(x=0, color='black', linestyle='-', alpha=0.5)
     
     # 2. Biggest percentage changes
     ax2 = axes[0, 1]
-    top_10_percent = results.sort_values('lq_percent_change', key=abs, ascending=False).head(10)
-    
-    colors = ['green' if x > 0 else 'red' for x in top_10_percent['lq_percent_change']]
-    bars = ax2.barh(range(len(top_10_percent)), top_10_percent['lq_percent_change'], color=colors, alpha=0.7)
+    colors = np.where(top_10_percent['value'] > 0, 'green', 'red')
+    ax2.barh(range(len(top_10_percent)), top_10_percent['value'], color=colors, alpha=0.7)
     ax2.set_title('Biggest Percentage Changes (2019-2024)')
     ax2.set_xlabel('Percentage Change (%)')
     ax2.set_yticks(range(len(top_10_percent)))
-    ax2.set_yticklabels([str(x)[:30] + '...' if len(str(x)) > 30 else str(x) for x in top_10_percent.iloc[:, 0]], fontsize=8)
+    ax2.set_yticklabels(top_10_percent['label'], fontsize=8)
     ax2.axvline(x=0, color='black', linestyle='-', alpha=0.5)
     
     # 3. Distribution of changes
     ax3 = axes[1, 0]
-    ax3.hist(results['lq_change'], bins=30, alpha=0.7, color='skyblue', edgecolor='black')
+    ax3.hist(lq_changes.dropna(), bins=30, alpha=0.7, color='skyblue', edgecolor='black')
     ax3.set_title('Distribution of Location Quotient Changes')
     ax3.set_xlabel('Change in Location Quotient')
     ax3.set_ylabel('Number of Occupations')
@@ -253,26 +252,15 @@ def create_visualizations(results, data_2019, data_2024):
     
     # 4. Scatter plot of 2019 vs 2024
     ax4 = axes[1, 1]
-    # Get the LQ column names
-    lq_cols = [col for col in results.columns if 'lq' in col.lower() and any(year in col for year in ['2019', '2024'])]
-    if len(lq_cols) >= 2:
-        ax4.scatter(results[lq_cols[0]], results[lq_cols[1]], alpha=0.6, s=20)
-        ax4.plot([0, max(results[lq_cols[0]].max(), results[lq_cols[1]].max())], 
-                [0, max(results[lq_cols[0]].max(), results[lq_cols[1]].max())], 
-                'r--', alpha=0.5)
+    if not scatter.empty:
+        x_values, y_values = scatter.iloc[:, 0], scatter.iloc[:, 1]
+        upper = max(x_values.max(), y_values.max())
+        ax4.scatter(x_values, y_values, alpha=0.6, s=20)
+        ax4.plot([0, upper], [0, upper], 'r--', alpha=0.5)
         ax4.set_title('2019 vs 2024 Location Quotients')
         ax4.set_xlabel('2019 Location Quotient')
         ax4.set_ylabel('2024 Location Quotient')
         ax4.grid(True, alpha=0.3)
-    
-    plt.tight_layout()
-    
-    # Save the plot
-    output_file = os.path.join("oes_data", "la_location_quotient_visualization.png")
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
-    print(f"📊 Visualization saved to {output_file}")
-    
-    plt.show()
 
 def print_summary_statistics(results):
     """Print summary statistics"""
@@ -322,7 +310,7 @@ if __name__ == "__main__":
         print(f"📊 Analyzed {len(results)} occupations in Los Angeles MSA")
         print(f"📈 Data covers 2019-2024 period")
         print(f"\n📁 Files created:")
-        print(f"  - oes_data/la_location_quotient_analysis_2019_2024.csv")
+        print(f"  - oes_data/store/la_location_quotient_analysis_2019_2024/")
         print(f"  - oes_data/la_location_quotient_visualization.png")
     else:
         print("\n❌ Analysis could not be completed")
@@ -6,11 +6,14 @@ This demonstrates the API functionality with data that's actually available.
 
 import os
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime
 from dotenv import load_dotenv
 from bls_client import BLSClient
+from oes_store import ResultStore
+from bls_periods import add_period_columns, to_datetime, MONTHLY
+from seasonal import SeasonalFactors, adjust_frame
+from growth import growth_rates, latest_values
+from charts import render_chart
 
 # Load environment variables
 load_dotenv()
@@ -82,40 +85,35 @@ def analyze_employment_trends(df):
     print("\n📊 Employment Trends Analysis")
     print("=" * 50)
     
-    # Convert year to datetime for better plotting
-    df['date'] = pd.to_datetime(df['year'] + '-' + df['period'].str[1:], format='%Y-%m')
+    # Encode periods once; annual averages (M13) would distort monthly trends
+    df = add_period_columns(df)
+    df = df[df['frequency'] == MONTHLY].copy()
     
-    # Get latest data for each series
-    latest_data = df.groupby('description')['value'].last().sort_values(ascending=False)
+    # Dates only for plotting and output
+    df['date'] = to_datetime(df['time_index'])
+    
+    # Typed values once, instead of float() per row
+    df['value'] = pd.to_numeric(df['value'], errors='coerce')
+    
+    # CEU series are not seasonally adjusted; adjust all of them in one batch
+    cache_path = os.path.join("oes_data", "seasonal_factors.npz")
+    cache = SeasonalFactors.load(cache_path) if os.path.exists(cache_path) else SeasonalFactors()
+    df['value_sa'] = adjust_frame(df, 'series_id', 'time_index', 'value', cache)
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    cache.save(cache_path)
+    
+    # Get latest data for each series (by period, not row order)
+    latest_data = latest_values(df, 'description', 'time_index', 'value').sort_values(ascending=False)
     
     print("\n🏢 Latest Employment Levels (thousands):")
     for description, value in latest_data.items():
-        try:
-            numeric_value = float(value)
-            print(f"  {description}: {numeric_value:,.0f}")
-        except (ValueError, TypeError):
-            print(f"  {description}: {value}")
-    
-    # Calculate growth rates
-    growth_data = []
-    for description in df['description'].unique():
-        series_data = df[df['description'] == description].sort_values('date')
-        if len(series_data) > 1:
-            try:
-                first_value = float(series_data.iloc[0]['value'])
-                last_value = float(series_data.iloc[-1]['value'])
-                growth_rate = ((last_value - first_value) / first_value) * 100
-                growth_data.append({
-                    'description': description,
-                    'growth_rate': growth_rate,
-                    'start_value': first_value,
-                    'end_value': last_value
-                })
-            except (ValueError, TypeError):
-                continue
-    
-    growth_df = pd.DataFrame(growth_data)
-    growth_df = growth_df.sort_values('growth_rate', ascending=False)
+        print(f"  {description}: {value:,.0f}")
+    
+    # Calculate growth rates for every series in one pass (full span plus 1y/5y/10y and CAGR)
+    growth_df = growth_rates(df, 'description', 'time_index', 'value')
+    if not growth_df.empty:
+        growth_df = growth_df[growth_df['end_time'] > growth_df['start_time']]
+        growth_df = growth_df.dropna(subset=['growth_rate']).sort_values('growth_rate', ascending=False)
     
     print("\n📈 Employment Growth Rates (10-year):")
     for _, row in growth_df.iterrows():
@@ -128,17 +126,29 @@ def create_visualizations(df, growth_df):
     if df is None or df.empty:
         return
     
-    # Set up the plotting style
-    plt.style.use('seaborn-v0_8')
-    fig, axes = plt.subplots(2, 2, figsize=(15, 12))
-    fig.suptitle('BLS Employment Data Analysis (10-Year Trends)', fontsize=16, fontweight='bold')
+    # Precompute the aggregates the charts need
+    levels = df[df['description'].isin(['Total Nonfarm Employment', 'Private Employment', 'Government Employment'])]
+    levels = levels.pivot_table(index='date', columns='description', values='value', aggfunc='first', sort=True)
+    by_description = df.sort_values('date', kind='stable').groupby('description')['value']
+    latest_data = by_description.last().sort_values(ascending=False)
+    volatility = by_description.std().sort_values(ascending=False)
+    growth = growth_df[['description', 'growth_rate']] if growth_df is not None else pd.DataFrame()
     
+    # Save the plot
+    output_file = "employment_analysis_visualization.png"
+    if render_chart(output_file, draw_employment_dashboard, levels, growth, latest_data, volatility,
+                    nrows=2, ncols=2, figsize=(15, 12),
+                    title='BLS Employment Data Analysis (10-Year Trends)'):
+        print(f"📊 Visualization saved to {output_file}")
+
+def draw_employment_dashboard(fig, axes, levels, growth, latest_data, volatility):
+    """Draw the 2x2 employment dashboard from precomputed aggregates"""
     # 1. Employment levels over time
     ax1 = axes[0, 0]
     for description in ['Total Nonfarm Employment', 'Private Employment', 'Government Employment']:
-        series_data = df[df['description'] == description].sort_values('date')
-        if not series_data.empty:
-            ax1.plot(series_data['date'], series_data['value'], label=description, linewidth=2)
+        if description in levels.columns:
+            series_data = levels[description].dropna()
+            ax1.plot(series_data.index, series_data.values, label=description, linewidth=2)
     
     ax1.set_title('Employment Levels Over Time')
     ax1.set_ylabel('Employment (thousands)')
@@ -147,9 +157,9 @@ def create_visualizations(df, growth_df):
     
     # 2. Growth rates by sector
     ax2 = axes[0, 1]
-    if not growth_df.empty:
-        colors = ['green' if x > 0 else 'red' for x in growth_df['growth_rate']]
-        bars = ax2.barh(growth_df['description'], growth_df['growth_rate'], color=colors, alpha=0.7)
+    if not growth.empty:
+        colors = ['green' if x > 0 else 'red' for x in growth['growth_rate']]
+        bars = ax2.barh(growth['description'], growth['growth_rate'], color=colors, alpha=0.7)
         ax2.set_title('Employment Growth by Sector (10-Year)')
         ax2.set_xlabel('Growth Rate (%)')
         ax2.axvline(x=0, color='black', linestyle='-', alpha=0.5)
@@ -162,41 +172,32 @@ def create_visualizations(df, growth_df):
     
     # 3. Latest employment distribution
     ax3 = axes[1, 0]
-    latest_data = df.groupby('description')['value'].last().sort_values(ascending=False)
     if not latest_data.empty:
         ax3.pie(latest_data.values, labels=latest_data.index, autopct='%1.1f%%', startangle=90)
         ax3.set_title('Latest Employment Distribution')
     
     # 4. Employment volatility (standard deviation)
     ax4 = axes[1, 1]
-    volatility = df.groupby('description')['value'].std().sort_values(ascending=False)
     if not volatility.empty:
         ax4.bar(range(len(volatility)), volatility.values, alpha=0.7)
         ax4.set_title('Employment Volatility (Standard Deviation)')
         ax4.set_ylabel('Standard Deviation')
         ax4.set_xticks(range(len(volatility)))
         ax4.set_xticklabels(volatility.index, rotation=45, ha='right')
-    
-    plt.tight_layout()
-    
-    # Save the plot
-    output_file = "employment_analysis_visualization.png"
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
-    print(f"📊 Visualization saved to {output_file}")
-    
-    plt.show()
 
 def save_analysis_results(df, growth_df):
-    """Save analysis results to CSV files"""
+    """Save analysis results to the columnar result store (CSV only when export is enabled)"""
+    store = ResultStore()
+    
     if df is not None and not df.empty:
-        # Save raw data
-        df.to_csv("employment_data_analysis.csv", index=False)
-        print("💾 Raw employment data saved to employment_data_analysis.csv")
+        # Save raw data, partitioned by year
+        store.write(df, "employment_data_analysis", csv_path="employment_data_analysis.csv")
+        print(f"💾 Raw employment data saved to {store.table_dir('employment_data_analysis')}")
     
     if growth_df is not None and not growth_df.empty:
         # Save growth analysis
-        growth_df.to_csv("employment_growth_analysis.csv", index=False)
-        print("💾 Growth analysis saved to employment_growth_analysis.csv")
+        store.write(growth_df, "employment_growth_analysis", csv_path="employment_growth_analysis.csv")
+        print(f"💾 Growth analysis saved to {store.table_dir('employment_growth_analysis')}")
 
 def main():
     """Main function to run the employment analysis"""
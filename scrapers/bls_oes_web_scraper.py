@@ -7,9 +7,13 @@ Extracts data directly from the BLS OES Query System web interface
 import requests
 import pandas as pd
 import json
+import re
 import time
 from datetime import datetime
 import os
+from table_detect import contains_area, names_from_title
+from oes_areas import names_for_area
+from oes_replay_fetcher import OESReplayFetcher
 
 class BLSOESWebScraper:
     """Web scraper for BLS OES Query System"""
@@ -27,6 +31,7 @@ class BLSOESWebScraper:
         
         # Los Angeles MSA information
         self.la_area_code = "0031080"  # Los Angeles-Long Beach-Anaheim, CA MSA
+        self.area_names = names_for_area(self.la_area_code)
         self.base_url = "https://data.bls.gov/oes"
         
         # Create data directory
@@ -144,6 +149,11 @@ class BLSOESWebScraper:
         print("📋 Extracting table data from HTML...")
         
         try:
+            if not self.area_names:
+                # Area names from the page's <title>/<h1> when none are known
+                heading = re.search(r'<(?:title|h1)[^>]*>(.*?)</(?:title|h1)>', html_content, re.IGNORECASE | re.DOTALL)
+                self.area_names = names_from_title(heading.group(1)) if heading else ()
+            
             # Use pandas to read HTML tables
             tables = pd.read_html(html_content)
             
@@ -155,7 +165,7 @@ class BLSOESWebScraper:
                     print(f"📋 Table {i+1} columns: {list(table.columns)}")
                     
                     # Check if this table contains Los Angeles data
-                    if self.is_la_data_table(table):
+                    if self.is_area_data_table(table):
                         print(f"✅ Found Los Angeles data in table {i+1}")
                         return self.process_table_data(table)
                 
@@ -169,27 +179,10 @@ class BLSOESWebScraper:
             print(f"❌ Error extracting table data: {e}")
             return None
     
-    def is_la_data_table(self, table):
-        """Check if a table contains Los Angeles data"""
-        if table.empty:
-            return False
-        
-        # Convert all values to string and search for LA indicators
-        table_str = table.astype(str)
-        
-        la_indicators = [
-            'los angeles',
-            'long beach',
-            'anaheim',
-            '31080',
-            '0031080'
-        ]
-        
-        for indicator in la_indicators:
-            if table_str.apply(lambda x: x.str.contains(indicator, case=False, na=False)).any().any():
-                return True
-        
-        return False
+    def is_area_data_table(self, table):
+        """Check if a table contains data for the scraper's area (its place names or codes)"""
+        # One compiled regex over each column's joined text, stopping at the first match
+        return contains_area(table, self.la_area_code, self.area_names)
     
     def process_table_data(self, table):
         """Process table data into structured format"""
@@ -281,6 +274,17 @@ class BLSOESWebScraper:
         """Try to access API endpoints"""
         print("🔌 Trying API endpoints...")
         
+        # Replay the endpoints captured from the query system (selenium_oes_scraper.py --capture)
+        fetcher = OESReplayFetcher(base_url=self.base_url, data_dir=self.data_dir,
+                                   headers={'User-Agent': self.session.headers['User-Agent']})
+        if fetcher.templates:
+            print(f"🔁 Replaying {len(fetcher.templates)} captured endpoints...")
+            data = fetcher.fetch(self.la_area_code)
+            if data is not None:
+                print(f"✅ Replay succeeded: {data.shape}")
+                return self.process_oes_data(data.to_dict('records'))
+            print("❌ Captured endpoints returned no data, trying known endpoints")
+        
         # Common API endpoints for OES data
         endpoints = [
             f"{self.base_url}/api/area/{self.la_area_code}/oes",
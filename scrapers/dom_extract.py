@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Single round-trip DOM extraction for the Selenium scrapers
+One injected script serializes every table (headers and cell text) to a
+compact JSON string, which is loaded straight into typed DataFrames instead
+of one WebDriver call per row and cell
+"""
+
+import json
+import pandas as pd
+
+# Headers come from thead rows (or leading th-only rows), with colspans expanded
+# and stacked header rows joined per column. Body rows keep td/th cell text.
+TABLES_SCRIPT = """
+function cellText(cell) { return cell.textContent.replace(/\\s+/g, ' ').trim(); }
+var result = [];
+document.querySelectorAll('table').forEach(function (table, index) {
+    var rows = Array.prototype.slice.call(table.rows);
+    var headerRows = rows.filter(function (row) {
+        return (row.parentNode.tagName === 'THEAD') ||
+            (row.cells.length && Array.prototype.every.call(row.cells, function (c) { return c.tagName === 'TH'; }));
+    });
+    var grid = headerRows.map(function (row) {
+        var expanded = [];
+        Array.prototype.forEach.call(row.cells, function (cell) {
+            for (var k = 0; k < (cell.colSpan || 1); k++) { expanded.push(cellText(cell)); }
+        });
+        return expanded;
+    });
+    var width = grid.reduce(function (w, row) { return Math.max(w, row.length); }, 0);
+    var headers = [];
+    for (var col = 0; col < width; col++) {
+        var parts = [];
+        grid.forEach(function (row) {
+            var text = row[col] || '';
+            if (text && parts[parts.length - 1] !== text) { parts.push(text); }
+        });
+        headers.push(parts.join(' '));
+    }
+    var body = rows.filter(function (row) { return headerRows.indexOf(row) === -1; }).map(function (row) {
+        return Array.prototype.map.call(row.cells, cellText);
+    });
+    result.push({index: index, id: table.id || '', caption: table.caption ? cellText(table.caption) : '',
+                 headers: headers, rows: body});
+});
+return JSON.stringify(result);
+"""
+
+# Rows matching a selector: td cells when present, else (unless cells_only) the row's visible text lines
+ROWS_SCRIPT = """
+var nodes = document.querySelectorAll(arguments[0]);
+var limit = arguments[1] > 0 ? Math.min(arguments[1], nodes.length) : nodes.length;
+var cellsOnly = arguments[2];
+var rows = [];
+for (var i = 0; i < limit; i++) {
+    var cells = nodes[i].querySelectorAll('td');
+    var values = cells.length
+        ? Array.prototype.map.call(cells, function (c) { return c.textContent.replace(/\\s+/g, ' ').trim(); })
+        : cellsOnly ? [] : (nodes[i].innerText || '').split('\\n').map(function (t) { return t.trim(); }).filter(Boolean);
+    if (values.length) { rows.push(values); }
+}
+return JSON.stringify({count: nodes.length, rows: rows});
+"""
+
+# BLS footnote/suppression markers that mean "no value" in numeric columns
+MISSING_MARKERS = {'', '*', '**', '#', '-', '(8)', '(5)', '(4)', '(2)'}
+
+
+def to_typed_frame(headers, rows, numeric_share=0.9):
+    """
+    Build a DataFrame from serialized cell text and convert numeric columns
+
+    Args:
+        headers: Column names (may be empty or shorter than the widest row)
+        rows: List of lists of cell text
+        numeric_share: Share of non-missing cells that must parse as numbers
+            for a column to become numeric
+
+    Returns:
+        DataFrame with numeric columns as floats and the rest as strings
+    """
+    width = max([len(headers)] + [len(row) for row in rows]) if rows or headers else 0
+    if any(headers):
+        columns = [header or f"column_{i}" for i, header in enumerate(list(headers) + [''] * (width - len(headers)))]
+    else:
+        # No header row: positional column names, like pd.DataFrame(rows)
+        columns = list(range(width))
+
+    # Make duplicate header names unique
+    seen = {}
+    for i, name in enumerate(columns):
+        if name in seen:
+            seen[name] += 1
+            columns[i] = f"{name}_{seen[name]}"
+        else:
+            seen[name] = 0
+
+    df = pd.DataFrame([row + [''] * (width - len(row)) for row in rows], columns=columns, dtype=object)
+
+    for column in df.columns:
+        text = df[column].astype(str).str.strip()
+        present = ~text.isin(MISSING_MARKERS)
+        if not present.any():
+            continue
+        numbers = pd.to_numeric(text.str.replace(r'[,$%]', '', regex=True), errors='coerce')
+        if numbers[present].notna().mean() >= numeric_share:
+            df[column] = numbers
+        else:
+            df[column] = text.where(present, None)
+
+    return df
+
+
+def extract_tables(driver):
+    """
+    Serialize every table on the page in one WebDriver call
+
+    Args:
+        driver: Selenium WebDriver on the loaded page
+
+    Returns:
+        List of dictionaries with index, id, caption and a typed DataFrame under 'data'
+    """
+    tables = json.loads(driver.execute_script(TABLES_SCRIPT) or "[]")
+    return [
+        {
+            'index': table['index'],
+            'id': table['id'],
+            'caption': table['caption'],
+            'data': to_typed_frame(table['headers'], table['rows']),
+        }
+        for table in tables
+    ]
+
+
+def extract_rows(driver, selector, limit=0, cells_only=False):
+    """
+    Serialize the cells of every element matching a selector in one WebDriver call
+
+    Args:
+        driver: Selenium WebDriver on the loaded page
+        selector: CSS selector of the row elements
+        limit: Maximum rows to serialize (0 for all)
+        cells_only: Skip rows without td cells instead of splitting their text into lines
+
+    Returns:
+        Tuple of (number of matching elements, typed DataFrame or None)
+    """
+    payload = json.loads(driver.execute_script(ROWS_SCRIPT, selector, limit, cells_only) or "{}")
+    rows = payload.get('rows', [])
+    return payload.get('count', 0), (to_typed_frame([], rows) if rows else None)
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Resumable, streaming download manager for OES flat files
+Downloads go to a .part file and resume with HTTP Range after interruptions;
+ZIP members are streamed to disk chunk by chunk; sizes and SHA-256 checksums
+are verified; each thread gets its own HTTP session so callers can run
+downloads in parallel
+"""
+
+import os
+import shutil
+import re
+import hashlib
+import zipfile
+import threading
+import requests
+
+CHUNK_SIZE = 1024 * 1024
+PART_SUFFIX = ".part"
+CHECKSUM_SUFFIX = ".sha256"
+
+
+def file_sha256(path, chunk_size=CHUNK_SIZE):
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DownloadManager:
+    """Resumable downloads with verification, safe to call from several threads"""
+
+    def __init__(self, session_factory=None, retries=3, timeout=60, chunk_size=CHUNK_SIZE):
+        """
+        Initialize the download manager
+
+        Args:
+            session_factory: Callable returning a configured requests.Session
+                (requests.Session if not given); called once per thread
+            retries: Attempts per file; each retry resumes from the .part file
+            timeout: Connect/read timeout in seconds
+            chunk_size: Bytes per streamed chunk
+        """
+        self.session_factory = session_factory or requests.Session
+        self.local = threading.local()
+        self.retries = retries
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+
+    @property
+    def session(self):
+        """This thread's session (requests.Session is not thread-safe)"""
+        session = getattr(self.local, 'session', None)
+        if session is None:
+            session = self.local.session = self.session_factory()
+        return session
+
+    def is_complete(self, filepath, sha256=None, expected_size=None):
+        """Check if a file was already downloaded and still matches its recorded (or expected) checksum"""
+        sidecar = filepath + CHECKSUM_SUFFIX
+        if not (os.path.exists(filepath) and os.path.exists(sidecar)):
+            return False
+        if expected_size is not None and os.path.getsize(filepath) != expected_size:
+            return False
+        with open(sidecar) as f:
+            recorded = f.read().strip()
+        if sha256 is not None and recorded != sha256:
+            return False
+        # Re-hash the file so a corrupted or truncated copy is downloaded again
+        return file_sha256(filepath, self.chunk_size) == recorded
+
+    def download(self, url, filepath, expected_size=None, sha256=None, force=False):
+        """
+        Download a file, resuming a previous partial transfer
+
+        Args:
+            url: File URL
+            filepath: Destination path
+            expected_size: Expected size in bytes, if known
+            sha256: Expected SHA-256 hex digest, if known
+            force: Download even if a verified copy exists
+
+        Returns:
+            filepath on success, None on failure
+        """
+        if not force and self.is_complete(filepath, sha256, expected_size):
+            print(f"⏭️  Already downloaded: {filepath}")
+            return filepath
+
+        os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+        for attempt in range(1, self.retries + 1):
+            try:
+                return self._transfer(url, filepath, expected_size, sha256)
+            except (requests.RequestException, IOError) as e:
+                print(f"⚠️  Download attempt {attempt} of {url} failed: {e}")
+            except ValueError as e:
+                # Verification failed: the partial file is bad, start over
+                print(f"❌ {e}")
+                self._discard(filepath + PART_SUFFIX)
+        return None
+
+    def _transfer(self, url, filepath, expected_size, sha256):
+        """One attempt: stream into the .part file from where it stopped, then verify"""
+        part = filepath + PART_SUFFIX
+        offset = os.path.getsize(part) if os.path.exists(part) else 0
+        headers = {'Range': f'bytes={offset}-'} if offset else {}
+
+        digest = hashlib.sha256()
+        with self.session.get(url, stream=True, headers=headers, timeout=self.timeout) as response:
+            if offset and response.status_code == 416:
+                # Range past the end: complete only if the .part file matches the size the server reports
+                total, digest = self._unsatisfied_size(response), None
+                if total != offset:
+                    raise ValueError(f"Range not satisfiable for {os.path.basename(filepath)}: "
+                                     f"{offset} bytes on disk, server reported {total}")
+            else:
+                response.raise_for_status()
+                if offset and response.status_code != 206:
+                    print(f"⚠️  Server ignored the range request, restarting {os.path.basename(filepath)}")
+                    offset = 0
+
+                total = self._total_size(response, offset)
+                if offset:
+                    print(f"↩️  Resuming {os.path.basename(filepath)} at {offset / 1e6:.1f} MB")
+                    digest = self._hash_prefix(part, offset)
+
+                with open(part, 'ab' if offset else 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=self.chunk_size):
+                        f.write(chunk)
+                        digest.update(chunk)
+
+        size = os.path.getsize(part)
+        checksum = digest.hexdigest() if digest is not None else file_sha256(part)
+        self._verify(filepath, size, total, expected_size, checksum, sha256)
+
+        os.replace(part, filepath)
+        with open(filepath + CHECKSUM_SUFFIX, 'w') as f:
+            f.write(checksum)
+        print(f"✅ Downloaded: {filepath} ({size / 1e6:.1f} MB)")
+        return filepath
+
+    @staticmethod
+    def _total_size(response, offset):
+        """Full file size from Content-Range or Content-Length (None if unknown)"""
+        content_range = response.headers.get('Content-Range', '')
+        if '/' in content_range and not content_range.endswith('/*'):
+            return int(content_range.rsplit('/', 1)[1])
+        length = response.headers.get('Content-Length')
+        # Compressed transfers report the encoded length, which is not the file size
+        if length is not None and not response.headers.get('Content-Encoding'):
+            return int(length) + offset
+        return None
+
+    @staticmethod
+    def _unsatisfied_size(response):
+        """Full file size from a 416 response's Content-Range (bytes */N), None if absent"""
+        match = re.match(r'bytes\s+\*/(\d+)$', response.headers.get('Content-Range', '').strip())
+        return int(match.group(1)) if match else None
+
+    def _hash_prefix(self, part, offset):
+        """Hash the bytes already on disk so the checksum covers the whole file"""
+        digest = hashlib.sha256()
+        with open(part, 'r+b') as f:
+            f.truncate(offset)
+            for chunk in iter(lambda: f.read(self.chunk_size), b''):
+                digest.update(chunk)
+        return digest
+
+    @staticmethod
+    def _verify(filepath, size, total, expected_size, checksum, sha256):
+        """Raise ValueError when size or checksum do not match"""
+        name = os.path.basename(filepath)
+        if total is not None and size != total:
+            raise ValueError(f"Size mismatch for {name}: {size} bytes, server reported {total}")
+        if expected_size is not None and size != expected_size:
+            raise ValueError(f"Size mismatch for {name}: {size} bytes, expected {expected_size}")
+        if sha256 is not None and checksum != sha256:
+            raise ValueError(f"Checksum mismatch for {name}")
+
+    @staticmethod
+    def _discard(path):
+        """Remove a file if present"""
+        if os.path.exists(path):
+            os.remove(path)
+
+    def extract_members(self, archive, output_dir, suffixes=('.xlsx', '.xls'), first_only=False,
+                        rename=None, pattern=None):
+        """
+        Stream matching ZIP members to disk chunk by chunk
+
+        Args:
+            archive: Path of the downloaded ZIP file
+            output_dir: Directory for the extracted files
+            suffixes: Member name endings to extract
+            first_only: Stop after the first matching member
+            rename: Optional callable(member name) -> output file name
+            pattern: Optional regex the member's base name must match (case-insensitive)
+
+        Returns:
+            List of extracted file paths
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        extracted = []
+        with zipfile.ZipFile(archive) as zip_file:
+            for info in zip_file.infolist():
+                if info.is_dir() or not info.filename.lower().endswith(suffixes):
+                    continue
+                if pattern and not re.search(pattern, os.path.basename(info.filename), re.IGNORECASE):
+                    continue
+
+                name = rename(info.filename) if rename else os.path.basename(info.filename)
+                target = os.path.join(output_dir, name)
+                part = target + PART_SUFFIX
+
+                # zipfile checks the member CRC while reading
+                with zip_file.open(info) as source, open(part, 'wb') as destination:
+                    shutil.copyfileobj(source, destination, self.chunk_size)
+                if os.path.getsize(part) != info.file_size:
+                    self._discard(part)
+                    raise ValueError(f"Size mismatch extracting {info.filename}")
+
+                os.replace(part, target)
+                extracted.append(target)
+                print(f"✅ Extracted: {info.filename} -> {target}")
+                if first_only:
+                    break
+        return extracted
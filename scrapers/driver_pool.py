@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Reusable pool of warm headless Chrome browsers for the Selenium scrapers
+Each browser keeps a persistent profile/cache directory, serves one tab per
+(area, year) job and is recycled after a configurable number of pages
+"""
+
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import WebDriverException
+
+USER_AGENT = ("Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+
+
+def chrome_options(profile_dir=None, headless=True):
+    """Chrome options shared by the scrapers, optionally with a persistent profile"""
+    options = Options()
+    if headless:
+        options.add_argument("--headless")  # Run in background
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument(f"--user-agent={USER_AGENT}")
+
+    if profile_dir:
+        # Persistent profile keeps the HTTP cache warm across jobs and runs
+        options.add_argument(f"--user-data-dir={os.path.abspath(profile_dir)}")
+        options.add_argument(f"--disk-cache-dir={os.path.abspath(os.path.join(profile_dir, 'cache'))}")
+
+    return options
+
+
+class PooledBrowser:
+    """One warm browser in the pool (driver None for a slot whose browser failed to start)"""
+
+    def __init__(self, slot, driver=None):
+        self.slot = slot
+        self.driver = driver
+        self.base_handle = driver.current_window_handle if driver is not None else None
+        self.pages = 0
+
+
+class DriverPool:
+    """Pool of N warm Chrome browsers that hands out one tab per job"""
+
+    def __init__(self, size=2, profile_root=os.path.join("oes_data", "chrome_profiles"),
+                 max_pages=50, headless=True, options_factory=None):
+        """
+        Initialize the pool (browsers start on first use or with start())
+
+        Args:
+            size: Number of browsers kept warm
+            profile_root: Directory holding one persistent profile per browser slot
+            max_pages: Pages served by a browser before it is restarted to cap memory growth
+            headless: Run Chrome headless
+            options_factory: Optional callable(profile_dir) -> Options, e.g. a lean profile
+        """
+        self.size = size
+        self.profile_root = profile_root
+        self.max_pages = max_pages
+        self.headless = headless
+        self.options_factory = options_factory
+
+        self._idle = queue.Queue()
+        self._browsers = {}
+        self._lock = threading.Lock()
+        self._started = False
+        self.pages_served = 0
+        self.recycled = 0
+
+    def _launch(self, slot):
+        """Start the browser for one slot"""
+        profile_dir = os.path.join(self.profile_root, f"slot-{slot}")
+        os.makedirs(profile_dir, exist_ok=True)
+
+        if self.options_factory:
+            options = self.options_factory(profile_dir)
+        else:
+            options = chrome_options(profile_dir, self.headless)
+
+        browser = PooledBrowser(slot, webdriver.Chrome(options=options))
+        self._browsers[slot] = browser
+        return browser
+
+    def start(self):
+        """Start all browsers up front so the first jobs do not pay the startup cost"""
+        with self._lock:
+            if self._started:
+                return self
+            print(f"🔧 Starting {self.size} pooled Chrome browsers...")
+            for slot in range(self.size):
+                self._idle.put(self._launch(slot))
+            self._started = True
+            print("✅ Driver pool ready")
+        return self
+
+    def _recycle(self, browser):
+        """Restart a browser that has served max_pages pages"""
+        print(f"♻️  Recycling browser {browser.slot} after {browser.pages} pages")
+        try:
+            browser.driver.quit()
+        except Exception as e:
+            print(f"⚠️  Error closing browser {browser.slot}: {e}")
+        self.recycled += 1
+        return self._launch(browser.slot)
+
+    @contextmanager
+    def tab(self, timeout=None):
+        """
+        Borrow a browser and open a fresh tab in it
+
+        A WebDriver session runs one command at a time, so a browser serves a
+        single tab (job) at a time; concurrency comes from the pool size.
+
+        Args:
+            timeout: Seconds to wait for a free browser (None waits forever)
+
+        Yields:
+            WebDriver focused on the new tab
+        """
+        if not self._started:
+            self.start()
+
+        browser = self._idle.get(timeout=timeout)
+        if browser.driver is None:
+            # The slot's last restart failed: relaunch now, or hand the slot back and fail this job
+            try:
+                browser = self._launch(browser.slot)
+            except Exception:
+                self._idle.put(browser)
+                raise
+
+        driver = browser.driver
+        healthy = True
+        try:
+            driver.switch_to.new_window('tab')
+            yield driver
+        except WebDriverException:
+            # Only session/browser errors restart Chrome; job errors just close the tab
+            healthy = False
+            raise
+        finally:
+            browser.pages += 1
+            with self._lock:
+                self.pages_served += 1
+
+            try:
+                # Close the job's tab and go back to the browser's base tab
+                if driver.current_window_handle != browser.base_handle:
+                    driver.close()
+                driver.switch_to.window(browser.base_handle)
+            except Exception:
+                healthy = False
+
+            if not healthy or browser.pages >= self.max_pages:
+                try:
+                    browser = self._recycle(browser)
+                except Exception as e:
+                    # Keep the slot: the next job borrowing it retries the launch
+                    print(f"❌ Could not restart browser {browser.slot}: {e}")
+                    browser = PooledBrowser(browser.slot)
+
+            self._idle.put(browser)
+
+    def close(self):
+        """Quit every browser in the pool"""
+        with self._lock:
+            for browser in self._browsers.values():
+                try:
+                    browser.driver.quit()
+                except Exception:
+                    pass
+            self._browsers.clear()
+            self._idle = queue.Queue()
+            self._started = False
+        print(f"🧹 Driver pool closed ({self.pages_served} pages served, {self.recycled} browsers recycled)")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Lean Chrome profile for the Selenium scrapers
+Blocks images, fonts, stylesheets, media and third-party analytics through
+the DevTools protocol, disables extensions and background features, and
+measures bytes transferred and load time per page against a baseline
+"""
+
+import os
+import json
+import pandas as pd
+from driver_pool import chrome_options
+
+# Non-essential resource types (Network.setBlockedURLs wildcard patterns)
+BLOCKED_RESOURCES = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.webp", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.css", "*.mp4", "*.webm",
+]
+
+# Third-party hosts that never carry OES data
+BLOCKED_HOSTS = [
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*dap.digitalgov.gov*", "*facebook.*", "*twitter.com*", "*youtube.com*",
+    "*addthis.com*", "*fonts.googleapis.com*", "*fonts.gstatic.com*",
+]
+
+LEAN_ARGUMENTS = [
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-notifications",
+    "--disable-features=Translate,MediaRouter,OptimizationHints,AutofillServerCommunication",
+    "--blink-settings=imagesEnabled=false",
+    "--mute-audio",
+    "--no-first-run",
+]
+
+# Page weight from the Resource Timing API (transferSize is 0 for cache hits
+# and for cross-origin resources without Timing-Allow-Origin)
+MEASURE_SCRIPT = """
+var nav = performance.getEntriesByType('navigation')[0] || {};
+var resources = performance.getEntriesByType('resource');
+var bytes = nav.transferSize || 0;
+resources.forEach(function (entry) { bytes += entry.transferSize || 0; });
+return {
+    bytes: bytes,
+    requests: resources.length + 1,
+    dom_ms: nav.domContentLoadedEventEnd || null,
+    load_ms: nav.loadEventEnd || performance.now()
+};
+"""
+
+
+def make_lean(options):
+    """Add lean-profile flags and content preferences to existing Chrome options"""
+    for argument in LEAN_ARGUMENTS:
+        options.add_argument(argument)
+    options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.notifications": 2,
+        "profile.managed_default_content_settings.media_stream": 2,
+    })
+    return options
+
+
+def lean_options(profile_dir=None, headless=True):
+    """Lean Chrome options; usable as DriverPool(options_factory=lean_options)"""
+    return make_lean(chrome_options(profile_dir, headless))
+
+
+def apply_blocking(driver, patterns=None):
+    """
+    Block non-essential requests in the driver's current tab
+
+    Blocking is per DevTools target, so call it again after switching to a new tab.
+
+    Args:
+        driver: Chrome WebDriver
+        patterns: URL wildcard patterns (defaults to resources plus third-party hosts)
+    """
+    patterns = patterns if patterns is not None else BLOCKED_RESOURCES + BLOCKED_HOSTS
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+
+
+def measure_page(driver):
+    """Bytes transferred, request count and load timings of the loaded page"""
+    return driver.execute_script(MEASURE_SCRIPT)
+
+
+class LoadReport:
+    """Per-page load costs of baseline and lean runs"""
+
+    def __init__(self):
+        self.records = []
+
+    def record(self, url, mode, metrics):
+        """Add one page measurement ('baseline' or 'lean')"""
+        self.records.append({'url': url, 'mode': mode, **metrics})
+        print(f"📦 {mode}: {metrics['bytes'] / 1024:.0f} KB, {metrics['requests']} requests, "
+              f"{metrics['load_ms']:.0f} ms - {url}")
+
+    def compare(self):
+        """
+        Lean vs baseline per page
+
+        Returns:
+            DataFrame per URL with baseline/lean bytes and load times, bytes_saved,
+            bytes_saved_pct and load_ms_saved (mean over repeated measurements)
+        """
+        if not self.records:
+            return pd.DataFrame()
+        frame = pd.DataFrame(self.records)
+        table = frame.pivot_table(index='url', columns='mode', values=['bytes', 'load_ms', 'requests'], aggfunc='mean')
+        table.columns = [f"{mode}_{metric}" for metric, mode in table.columns]
+        table = table.reset_index()
+
+        if {'baseline_bytes', 'lean_bytes'} <= set(table.columns):
+            table['bytes_saved'] = table['baseline_bytes'] - table['lean_bytes']
+            table['bytes_saved_pct'] = table['bytes_saved'] / table['baseline_bytes'] * 100
+            table['load_ms_saved'] = table['baseline_load_ms'] - table['lean_load_ms']
+        return table
+
+    def save(self, output_file=os.path.join("oes_data", "lean_profile_report.json")):
+        """Write the raw measurements and the comparison"""
+        os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+        with open(output_file, 'w') as f:
+            json.dump({'records': self.records, 'comparison': self.compare().to_dict('records')}, f, indent=2)
+        print(f"💾 Load report saved to {output_file}")
+        return output_file
+
+
+def benchmark(urls, wait=None, headless=True):
+    """
+    Load each URL with a baseline and a lean browser and compare their cost
+
+    Args:
+        urls: Pages to load
+        wait: Optional callable(driver) run after each load (e.g. PageReadiness().wait)
+        headless: Run Chrome headless
+
+    Returns:
+        LoadReport with both runs recorded
+    """
+    from selenium import webdriver
+
+    report = LoadReport()
+    for mode, options in (('baseline', chrome_options(headless=headless)), ('lean', lean_options(headless=headless))):
+        driver = webdriver.Chrome(options=options)
+        try:
+            if mode == 'lean':
+                apply_blocking(driver)
+            for url in urls:
+                driver.get(url)
+                if wait:
+                    wait(driver)
+                report.record(url, mode, measure_page(driver))
+        finally:
+            driver.quit()
+
+    print(report.compare().to_string(index=False))
+    return report
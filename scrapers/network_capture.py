@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Network capture for the OES query system single-page app
+Reads Chrome's DevTools performance log, picks out the JSON data responses,
+saves their raw payloads and keeps a manifest of the endpoints so they can
+be replayed without a browser
+"""
+
+import os
+import re
+import json
+import base64
+from datetime import datetime
+
+# Responses from these hosts are never OES data
+IGNORED_HOSTS = ('google-analytics', 'googletagmanager', 'doubleclick', 'dap.digitalgov.gov', 'fonts.')
+
+MANIFEST_FILE = "endpoints.json"
+
+
+def enable_performance_logging(options):
+    """Turn on Chrome's DevTools performance log (network events) on webdriver options"""
+    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    return options
+
+
+class NetworkCapture:
+    """Harvest JSON data responses of a page from the DevTools performance log"""
+
+    def __init__(self, driver, output_dir=os.path.join("oes_data", "network_capture"),
+                 url_pattern=None, mime_marker="json"):
+        """
+        Initialize the capture
+
+        Args:
+            driver: Chrome WebDriver started with enable_performance_logging
+            output_dir: Directory for the raw payloads and the endpoint manifest
+            url_pattern: Optional regex a data URL must match
+            mime_marker: Substring of the response MIME type that marks data
+        """
+        self.driver = driver
+        self.output_dir = output_dir
+        self.url_pattern = re.compile(url_pattern) if url_pattern else None
+        self.mime_marker = mime_marker
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    def start(self):
+        """Enable network events and drop log entries from earlier pages"""
+        self.driver.execute_cdp_cmd('Network.enable', {})
+        self.driver.get_log('performance')
+
+    def is_data_response(self, url, mime_type):
+        """Check if a response looks like an OES data payload"""
+        if any(host in url for host in IGNORED_HOSTS):
+            return False
+        if self.url_pattern and not self.url_pattern.search(url):
+            return False
+        return self.mime_marker in (mime_type or '').lower()
+
+    def read_events(self):
+        """
+        Group the performance log by request
+
+        Returns:
+            Dictionary of requestId -> request details (url, method, post_data,
+            headers, status, mime_type, bytes, finished)
+        """
+        requests_seen = {}
+        for entry in self.driver.get_log('performance'):
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, ValueError):
+                continue
+
+            method = message.get('method')
+            params = message.get('params', {})
+            request_id = params.get('requestId')
+            if request_id is None:
+                continue
+            request = requests_seen.setdefault(request_id, {'finished': False})
+
+            if method == 'Network.requestWillBeSent':
+                request.update({
+                    'url': params['request']['url'],
+                    'method': params['request'].get('method', 'GET'),
+                    'post_data': params['request'].get('postData'),
+                    'headers': params['request'].get('headers', {}),
+                })
+            elif method == 'Network.responseReceived':
+                response = params['response']
+                request.update({
+                    'url': response['url'],
+                    'status': response.get('status'),
+                    'mime_type': response.get('mimeType'),
+                })
+            elif method == 'Network.loadingFinished':
+                request.update({'finished': True, 'bytes': params.get('encodedDataLength')})
+
+        return requests_seen
+
+    def collect(self, label="page"):
+        """
+        Save the raw JSON of every finished data response and update the manifest
+
+        Args:
+            label: Prefix for the saved payload files (e.g. area code and year)
+
+        Returns:
+            List of manifest entries for the responses captured from this page
+        """
+        captured = []
+        for request_id, request in self.read_events().items():
+            if not request['finished'] or not self.is_data_response(request.get('url', ''), request.get('mime_type')):
+                continue
+
+            try:
+                body = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+            except Exception as e:
+                print(f"⚠️  Could not read response body for {request['url']}: {e}")
+                continue
+
+            content = body.get('body', '')
+            if body.get('base64Encoded'):
+                content = base64.b64decode(content).decode('utf-8', errors='replace')
+
+            output_file = os.path.join(self.output_dir, f"{label}_{len(captured) + 1:02d}.json")
+            with open(output_file, 'w', encoding='utf-8') as f:
+                f.write(content)
+
+            captured.append({
+                'url': request['url'],
+                'method': request.get('method', 'GET'),
+                'post_data': request.get('post_data'),
+                'headers': request.get('headers', {}),
+                'status': request.get('status'),
+                'mime_type': request.get('mime_type'),
+                'bytes': request.get('bytes'),
+                'file': output_file,
+                'label': label,
+                'captured_at': datetime.now().isoformat(timespec='seconds'),
+            })
+            print(f"📡 Captured {request['url']} -> {output_file}")
+
+        self.update_manifest(captured)
+        return captured
+
+    def update_manifest(self, captured):
+        """Merge captured endpoints into the manifest (one entry per method + URL)"""
+        manifest_file = os.path.join(self.output_dir, MANIFEST_FILE)
+        manifest = load_manifest(manifest_file)
+        entries = {(entry['method'], entry['url']): entry for entry in manifest}
+        for entry in captured:
+            entries[(entry['method'], entry['url'])] = entry
+
+        with open(manifest_file, 'w') as f:
+            json.dump(list(entries.values()), f, indent=2)
+
+
+def data_url_pattern(manifest_file=os.path.join("oes_data", "network_capture", MANIFEST_FILE), default=None):
+    """
+    URL prefix shared by the captured data endpoints, for matching the data XHR
+
+    Args:
+        manifest_file: Manifest written by NetworkCapture
+        default: Pattern returned when nothing has been captured
+
+    Returns:
+        URL prefix up to the last path separator before any query string or
+        area/year digits, or default
+    """
+    urls = [entry['url'].split('?', 1)[0] for entry in load_manifest(manifest_file)]
+    if not urls:
+        return default
+    prefix = os.path.commonprefix(urls)
+    digits = re.search(r'\d{4,}', prefix)
+    if digits:
+        prefix = prefix[:digits.start()]
+    prefix = prefix[:prefix.rfind('/') + 1]
+    return prefix if prefix.count('/') > 2 else default
+
+
+def load_manifest(manifest_file=os.path.join("oes_data", "network_capture", MANIFEST_FILE)):
+    """Endpoint manifest written by NetworkCapture (empty list if missing)"""
+    if not os.path.exists(manifest_file):
+        return []
+    with open(manifest_file) as f:
+        return json.load(f)
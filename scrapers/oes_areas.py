@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+OES area metadata shared by the scrapers
+Area codes, the place names that identify an area on BLS pages and tables,
+and the CSV names the scrapers and the replay fetcher write per area and year
+"""
+
+LA_AREA_CODE = "0031080"
+
+# Place names that identify an area's pages and rows besides its codes
+AREA_NAMES = {
+    LA_AREA_CODE: ('los angeles', 'long beach', 'anaheim'),
+}
+
+
+def names_for_area(area_code, names=None):
+    """Place names of an area: the given ones, else those in AREA_NAMES (empty if unknown)"""
+    return tuple(names) if names else AREA_NAMES.get(area_code, ())
+
+
+def area_label(area_code, names=None):
+    """Readable name of an area for log messages (its code when no name is known)"""
+    names = names_for_area(area_code, names)
+    return names[0].title() if names else f"area {area_code}"
+
+
+def output_filename(area_code, year=None):
+    """CSV name of the scraped table of an area (and year)"""
+    name = "la_oes" if area_code == LA_AREA_CODE else f"oes_{area_code}"
+    return f"{name}_{year}_selenium_data.csv" if year else f"{name}_selenium_data.csv"
+
+
+def debug_prefix(area_code, year=None):
+    """File name prefix of a scrape's page source and screenshot (LA keeps the names the processors read)"""
+    name = "bls_oes" if area_code == LA_AREA_CODE else f"bls_oes_{area_code}"
+    return f"{name}_{year}" if year else name
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Multi-area, multi-year OES scraper
+Runs a list of (area_code, year) jobs concurrently over a DriverPool with
+retries and per-job timeouts, and writes every result to the partitioned
+ResultStore (one area=/year= partition per job)
+"""
+
+import os
+import sys
+import time
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from driver_pool import DriverPool
+from selenium_oes_scraper import SeleniumBLSOESScraper
+from selenium_oes_scraper_2019 import SeleniumBLSOESScraper2019
+from oes_store import ResultStore
+from lean_profile import lean_options
+
+STORE_TABLE = "oes_area_occupations"
+
+
+class OESJobScraper:
+    """Concurrent (area_code, year) job runner for the Selenium OES scrapers"""
+
+    def __init__(self, pool=None, store=None, table=STORE_TABLE, retries=2, job_timeout=60,
+                 data_dir="oes_data", lean=True, area_names=None):
+        """
+        Initialize the job runner
+
+        Args:
+            pool: DriverPool shared by the jobs (a 2-browser pool if not given)
+            store: ResultStore for the results (default store if not given)
+            table: Store table the results are written to
+            retries: Extra attempts per failed job
+            job_timeout: Page load and readiness timeout per attempt, in seconds
+            data_dir: Directory for the per-job CSVs
+            lean: Block non-essential resources (the default pool then uses lean_options)
+            area_names: Optional mapping of area_code -> place names; areas without
+                names fall back to oes_areas.AREA_NAMES, then to the page title
+        """
+        self.lean = lean
+        self.pool = pool or DriverPool(options_factory=lean_options if lean else None)
+        self.store = store or ResultStore()
+        self.table = table
+        self.retries = retries
+        self.job_timeout = job_timeout
+        self.data_dir = data_dir
+        self.area_names = area_names or {}
+
+    def scraper_for(self, area_code, year=None):
+        """
+        Scraper for one job: the query system for the current vintage (year None),
+        the archived May page for a given year
+        """
+        if year is None:
+            scraper = SeleniumBLSOESScraper(area_code, pool=self.pool, data_dir=self.data_dir,
+                                            save_debug=False, page_load_timeout=self.job_timeout, lean=self.lean,
+                                            area_names=self.area_names.get(area_code))
+        else:
+            scraper = SeleniumBLSOESScraper2019(area_code, year, pool=self.pool,
+                                                data_dir=os.path.join(self.data_dir, str(year)),
+                                                save_debug=False, page_load_timeout=self.job_timeout, lean=self.lean,
+                                                area_names=self.area_names.get(area_code))
+        scraper.readiness.timeout = self.job_timeout
+        return scraper
+
+    def run_job(self, area_code, year=None):
+        """
+        Scrape one (area_code, year) job with retries and store the result
+
+        Returns:
+            Dictionary with area_code, year, status, rows, attempts, seconds, error
+            and the page's bytes and load_ms
+        """
+        started = time.perf_counter()
+        error = None
+
+        for attempt in range(1, self.retries + 2):
+            try:
+                scraper = self.scraper_for(area_code, year)
+                data = scraper.get_oes_data()
+                if data is not None and not data.empty:
+                    data = data.copy()
+                    data.columns = [str(col) for col in data.columns]
+                    self.store.write(data, self.table, area=area_code, year=year)
+                    cost = scraper.page_cost or {}
+                    return {'area_code': area_code, 'year': year, 'status': 'ok', 'rows': len(data),
+                            'attempts': attempt, 'seconds': time.perf_counter() - started, 'error': None,
+                            'bytes': cost.get('bytes'), 'load_ms': cost.get('load_ms')}
+                error = "no data extracted"
+            except Exception as e:
+                error = str(e)
+
+            if attempt <= self.retries:
+                print(f"🔄 Retrying {area_code} {year or ''} (attempt {attempt + 1}): {error}")
+                time.sleep(2 ** attempt)  # Back off before retrying
+
+        return {'area_code': area_code, 'year': year, 'status': 'failed', 'rows': 0,
+                'attempts': self.retries + 1, 'seconds': time.perf_counter() - started, 'error': error}
+
+    def run(self, jobs, workers=None):
+        """
+        Run every job concurrently
+
+        Args:
+            jobs: Iterable of (area_code, year) tuples (year None for the current vintage)
+            workers: Concurrent jobs (defaults to the pool size)
+
+        Returns:
+            DataFrame job report, also written to the store as <table>_jobs
+        """
+        jobs = list(dict.fromkeys(jobs))
+        workers = workers or self.pool.size
+        print(f"🚀 Running {len(jobs)} OES jobs with {workers} workers...")
+
+        report = []
+        with self.pool:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(self.run_job, area_code, year): (area_code, year)
+                           for area_code, year in jobs}
+                for future in as_completed(futures):
+                    result = future.result()
+                    report.append(result)
+                    status = "✅" if result['status'] == 'ok' else "❌"
+                    print(f"{status} {result['area_code']} {result['year'] or 'current'}: "
+                          f"{result['rows']} rows in {result['seconds']:.1f}s ({result['attempts']} attempts)")
+
+        report = pd.DataFrame(report)
+        self.store.write(report, f"{self.table}_jobs", partition_cols=())
+        ok = (report['status'] == 'ok').sum() if not report.empty else 0
+        print(f"📊 {ok}/{len(jobs)} jobs succeeded")
+        return report
+
+
+def parse_jobs(args):
+    """Parse 'area[:year]' arguments into (area_code, year) jobs"""
+    jobs = []
+    for arg in args:
+        area_code, _, year = arg.partition(':')
+        jobs.append((area_code, int(year) if year else None))
+    return jobs
+
+
+def main():
+    """Main function to run the job scraper"""
+    print("🚀 Multi-area OES Job Scraper")
+    print("=" * 50)
+
+    # e.g. python oes_job_scraper.py 0031080 0031080:2019 0035620:2019
+    jobs = parse_jobs(sys.argv[1:]) or [("0031080", None), ("0031080", 2019)]
+
+    scraper = OESJobScraper()
+    report = scraper.run(jobs)
+    print(report.to_string(index=False))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Browserless replay of the OES query system's JSON endpoints
+Turns the endpoints recorded by network_capture into templates and requests
+them directly for any (area, year) with pooled connections and a thread pool
+"""
+
+import os
+import json
+import pandas as pd
+import requests
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from network_capture import load_manifest
+from oes_areas import LA_AREA_CODE, output_filename
+
+DEFAULT_BASE_URL = "https://data.bls.gov/oes"
+
+
+# Query/body fields that carry the area or the year in OES query-system requests
+AREA_FIELDS = ('area', 'area_code', 'areacode', 'area_id', 'areaid', 'msa', 'msa_code')
+YEAR_FIELDS = ('year', 'survey_year', 'surveyyear', 'ref_year', 'period_year')
+
+# Stands in for a numeric JSON year so the filled body keeps a number
+YEAR_NUMBER = "__year_number__"
+
+# Captured headers that the HTTP client sets itself
+SKIPPED_HEADERS = ('content-length', 'host', 'connection', 'accept-encoding')
+
+
+def _field_kind(name):
+    """'area', 'year' or None for a query/body field name"""
+    name = str(name).lower().replace('-', '_')
+    if name in AREA_FIELDS:
+        return 'area'
+    if name in YEAR_FIELDS:
+        return 'year'
+    return None
+
+
+def _template_pairs(pairs, area_code, year):
+    """Template the values of known area/year fields in (name, value) pairs"""
+    templated = []
+    for name, value in pairs:
+        kind = _field_kind(name)
+        if kind == 'area' and value == area_code:
+            value = '{area}'
+        elif kind == 'year' and year is not None and value == str(year):
+            value = '{year}'
+        templated.append((name, value))
+    return templated
+
+
+def _template_json(node, area_code, year):
+    """Template the values of known area/year keys anywhere in a JSON body"""
+    if isinstance(node, list):
+        return [_template_json(item, area_code, year) for item in node]
+    if not isinstance(node, dict):
+        return node
+    templated = {}
+    for key, value in node.items():
+        kind = _field_kind(key)
+        if kind == 'area' and str(value) == area_code:
+            value = '{area}'
+        elif kind == 'year' and year is not None and str(value) == str(year):
+            value = '{year}' if isinstance(value, str) else YEAR_NUMBER
+        else:
+            value = _template_json(value, area_code, year)
+        templated[key] = value
+    return templated
+
+
+def make_template(entry, base_url, area_code, year=None):
+    """
+    Turn a captured manifest entry into a replayable template
+
+    Only whole values are templated: known area/year query and body fields
+    (AREA_FIELDS, YEAR_FIELDS) and URL path segments equal to the area code,
+    so other IDs that merely contain the code or the year are left alone.
+
+    Args:
+        entry: Manifest entry (url, method, post_data, headers)
+        base_url: Base URL the endpoint was captured from
+        area_code: Area code of the captured page
+        year: Year of the captured page, if it appears in the request
+
+    Returns:
+        Dictionary with method, url, post_data (using {base_url}, {area} and
+        {year} placeholders), the captured headers and the captured year that
+        fills {year} when a request gives none
+    """
+    url = entry['url']
+    base_url = base_url.rstrip('/')
+    if url.startswith(base_url):
+        url = '{base_url}' + url[len(base_url):]
+
+    parts = urlsplit(url)
+    path = '/'.join('{area}' if segment == area_code else segment for segment in parts.path.split('/'))
+    query = urlencode(_template_pairs(parse_qsl(parts.query, keep_blank_values=True), area_code, year), safe='{}')
+    url = urlunsplit((parts.scheme, parts.netloc, path, query, parts.fragment))
+
+    post_data = entry.get('post_data')
+    if post_data:
+        try:
+            body = _template_json(json.loads(post_data), area_code, year)
+            post_data = json.dumps(body).replace(f'"{YEAR_NUMBER}"', '{year}')
+        except ValueError:
+            # Form-encoded body
+            pairs = parse_qsl(post_data, keep_blank_values=True)
+            post_data = urlencode(_template_pairs(pairs, area_code, year), safe='{}')
+
+    return {
+        'method': entry.get('method', 'GET'),
+        'url': url,
+        'post_data': post_data,
+        'year': year if '{year}' in url + (post_data or '') else None,
+        'headers': {name: value for name, value in (entry.get('headers') or {}).items()
+                    if not name.startswith(':') and name.lower() not in SKIPPED_HEADERS},
+    }
+
+
+def fill_template(text, base_url, area_code, year=None):
+    """Substitute the placeholders of a template string (ValueError if it needs a year and none is given)"""
+    if not text:
+        return text
+    text = text.replace('{base_url}', base_url.rstrip('/')).replace('{area}', area_code)
+    if '{year}' in text:
+        if year is None:
+            raise ValueError(f"Template needs a year: {text}")
+        text = text.replace('{year}', str(year))
+    return text
+
+
+def find_records(obj):
+    """
+    Largest table of records in a JSON payload
+
+    Handles lists of objects and {columns/headers, data/rows} layouts at any depth.
+
+    Returns:
+        List of dictionaries (empty if the payload has no table)
+    """
+    best = []
+    stack = [obj]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            columns = node.get('columns') or node.get('headers')
+            rows = node.get('data') or node.get('rows')
+            if isinstance(columns, list) and isinstance(rows, list) and rows and isinstance(rows[0], list):
+                names = [col.get('name', col.get('title')) if isinstance(col, dict) else col for col in columns]
+                records = [dict(zip(names, row)) for row in rows]
+                if len(records) > len(best):
+                    best = records
+            stack.extend(node.values())
+        elif isinstance(node, list) and node:
+            if isinstance(node[0], dict) and len(node) > len(best):
+                best = node
+            stack.extend(item for item in node if isinstance(item, (dict, list)))
+    return best
+
+
+class OESReplayFetcher:
+    """HTTP-only fetcher for captured OES query-system endpoints"""
+
+    def __init__(self, base_url=DEFAULT_BASE_URL, templates=None,
+                 manifest_file=os.path.join("oes_data", "network_capture", "endpoints.json"),
+                 captured_base_url=DEFAULT_BASE_URL, captured_area=LA_AREA_CODE, captured_year=None,
+                 workers=8, timeout=15, retries=2, headers=None, data_dir="oes_data"):
+        """
+        Initialize the fetcher
+
+        Args:
+            base_url: Base URL to replay against (e.g. a local fixture server)
+            templates: Endpoint templates; built from the capture manifest when omitted
+            manifest_file: Manifest written by network_capture
+            captured_base_url: Base URL the manifest was captured from
+            captured_area: Area code of the captured pages
+            captured_year: Year of the captured pages, if it appears in the requests
+            workers: Concurrent requests (also the connection pool size)
+            timeout: Seconds per request
+            retries: Retries on connection errors and 429/5xx responses
+            headers: Extra session headers
+            data_dir: Directory for the output CSVs
+        """
+        self.base_url = base_url
+        self.workers = workers
+        self.timeout = timeout
+        self.data_dir = data_dir
+        os.makedirs(self.data_dir, exist_ok=True)
+
+        if templates is None:
+            templates = [make_template(entry, captured_base_url, captured_area, captured_year)
+                         for entry in load_manifest(manifest_file)]
+        self.templates = templates
+
+        # One keep-alive connection pool shared by all worker threads
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Accept': 'application/json, text/plain, */*',
+        })
+        if headers:
+            self.session.headers.update(headers)
+        retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=None)
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def request(self, template, area_code, year=None):
+        """Request one templated endpoint and return its JSON payload"""
+        # Templates with a {year} placeholder fall back to the year they were captured for
+        if year is None:
+            year = template.get('year')
+        url = fill_template(template['url'], self.base_url, area_code, year)
+        body = fill_template(template.get('post_data'), self.base_url, area_code, year)
+        # Captured headers (Content-Type included) are replayed as the page sent them
+        headers = template.get('headers') or {}
+        if template.get('method', 'GET').upper() == 'POST':
+            response = self.session.post(url, data=body, timeout=self.timeout, headers=headers)
+        else:
+            response = self.session.get(url, timeout=self.timeout, headers=headers)
+        response.raise_for_status()
+        return response.json()
+
+    def fetch(self, area_code, year=None):
+        """
+        Fetch the OES table of one area (and year) without a browser
+
+        Args:
+            area_code: OES area code (e.g. "0031080")
+            year: Optional year for templates with a {year} placeholder (their
+                captured year when omitted)
+
+        Returns:
+            DataFrame of the largest record table across the endpoints, with
+            area_code (and year) columns, or None
+        """
+        best = []
+        for template in self.templates:
+            try:
+                records = find_records(self.request(template, area_code, year))
+            except (requests.RequestException, ValueError) as e:
+                print(f"❌ Replay failed for {area_code} {year or ''}: {e}")
+                continue
+            if len(records) > len(best):
+                best = records
+
+        if not best:
+            return None
+
+        df = pd.json_normalize(best)
+        df.insert(0, 'area_code', area_code)
+        if year is not None:
+            df.insert(1, 'year', year)
+        return df
+
+    def fetch_many(self, jobs, save=True):
+        """
+        Fetch many (area_code, year) jobs concurrently
+
+        Args:
+            jobs: Iterable of (area_code, year) tuples (year may be None)
+            save: Write each result to the Selenium scraper's CSV name
+
+        Returns:
+            Dictionary of (area_code, year) -> DataFrame (None on failure)
+        """
+        jobs = list(jobs)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            frames = list(executor.map(lambda job: self.fetch(*job), jobs))
+
+        results = dict(zip(jobs, frames))
+        if save:
+            for (area_code, year), df in results.items():
+                if df is not None:
+                    self.save(df, area_code, year)
+
+        found = sum(df is not None for df in frames)
+        print(f"✅ Replayed {found}/{len(jobs)} jobs")
+        return results
+
+    def save(self, df, area_code, year=None):
+        """Write a result where the Selenium scraper writes its table"""
+        output_file = os.path.join(self.data_dir, output_filename(area_code, year))
+        df.to_csv(output_file, index=False)
+        print(f"💾 Data saved to {output_file}")
+        return output_file
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Event-driven page readiness for the Selenium scrapers
+Polls one combined in-page condition (area marker present, and data rows
+stable or the data XHR finished) instead of sleeping and trying selectors
+one after another
+"""
+
+import time
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+
+# One round-trip per poll: row count, document state, finished data requests, marker text
+READY_SCRIPT = """
+var selector = arguments[0], pattern = arguments[1], markers = arguments[2];
+var rows = document.querySelectorAll(selector).length;
+var xhr = performance.getEntriesByType('resource').filter(function (entry) {
+    return (entry.initiatorType === 'xmlhttprequest' || entry.initiatorType === 'fetch') &&
+        entry.responseEnd > 0 && (!pattern || entry.name.indexOf(pattern) !== -1);
+}).length;
+var text = document.body ? document.body.textContent.toLowerCase() : '';
+return {
+    rows: rows,
+    xhr: xhr,
+    ready_state: document.readyState,
+    markers: markers.filter(function (marker) { return text.indexOf(marker.toLowerCase()) !== -1; }),
+    page_ms: performance.now()
+};
+"""
+
+
+class PageReadiness:
+    """Wait until a page's data is present and record how long it took"""
+
+    def __init__(self, row_selector="table tbody tr:has(td)", xhr_pattern=None, markers=(),
+                 stable_for=0.5, poll=0.1, timeout=30):
+        """
+        Initialize the detector
+
+        Args:
+            row_selector: CSS selector of the data rows to count (header and layout rows excluded)
+            xhr_pattern: Substring of the data request URL (None matches any XHR/fetch,
+                analytics beacons included)
+            markers: Area-specific text (e.g. place names); when given, at least one must
+                be on the page (case-insensitive) before it counts as ready
+            stable_for: Seconds the row count must stay unchanged to count as loaded
+            poll: Seconds between checks
+            timeout: Seconds before giving up
+        """
+        self.row_selector = row_selector
+        self.xhr_pattern = xhr_pattern
+        self.markers = list(markers)
+        self.stable_for = stable_for
+        self.poll = poll
+        self.timeout = timeout
+
+        # Measured latency of every wait, for reporting across many pages
+        self.history = []
+
+    def wait(self, driver, timeout=None):
+        """
+        Block until the area marker and data rows are present, and the row count is stable
+        or the data XHR completed
+
+        Args:
+            driver: Selenium WebDriver that has just started loading the page
+            timeout: Optional override of the default timeout
+
+        Returns:
+            Dictionary with ready, reason, rows, markers, latency (seconds spent
+            waiting) and page_ms (milliseconds since navigation start)
+        """
+        started = time.perf_counter()
+        state = {'rows': -1, 'since': started, 'last': None}
+
+        def condition(driver):
+            snapshot = driver.execute_script(READY_SCRIPT, self.row_selector, self.xhr_pattern or "", self.markers)
+            state['last'] = snapshot
+            now = time.perf_counter()
+
+            changed = snapshot['rows'] != state['rows']
+            if changed:
+                state['rows'], state['since'] = snapshot['rows'], now
+            if snapshot['rows'] <= 0:
+                return False
+            if self.markers and not snapshot['markers']:
+                # Rows of some other page (or a placeholder) until the area is named
+                return False
+
+            # Data rows are present: done once the data request finished and rendering
+            # settled for a poll, or the rows stopped changing
+            if snapshot['xhr'] > 0 and snapshot['ready_state'] == 'complete' and not changed:
+                return 'xhr_complete'
+            if now - state['since'] >= self.stable_for:
+                return 'rows_stable'
+            return False
+
+        try:
+            reason = WebDriverWait(driver, timeout or self.timeout, poll_frequency=self.poll).until(condition)
+            ready = True
+        except TimeoutException:
+            reason, ready = 'timeout', False
+
+        last = state['last'] or {}
+        result = {
+            'ready': ready,
+            'reason': reason,
+            'rows': last.get('rows', 0),
+            'markers': last.get('markers', []),
+            'latency': time.perf_counter() - started,
+            'page_ms': last.get('page_ms'),
+        }
+        self.history.append(result)
+        return result
+
+    def summary(self):
+        """Latency statistics across every wait so far"""
+        if not self.history:
+            return {}
+        latencies = sorted(result['latency'] for result in self.history)
+        return {
+            'pages': len(latencies),
+            'timeouts': sum(not result['ready'] for result in self.history),
+            'mean_latency': sum(latencies) / len(latencies),
+            'median_latency': latencies[len(latencies) // 2],
+            'max_latency': latencies[-1],
+        }
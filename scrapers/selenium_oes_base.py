@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Shared Selenium scraper for BLS OES pages
+Driver setup (standalone or a tab borrowed from a DriverPool), event-driven
+readiness, single round-trip extraction, debug artifacts and a summary of
+the extracted table; subclasses set the page URL, the readiness condition
+and how the data table is picked
+"""
+
+import os
+from abc import ABC, abstractmethod
+import pandas as pd
+from selenium import webdriver
+from driver_pool import chrome_options
+from dom_extract import extract_rows
+from network_capture import NetworkCapture, enable_performance_logging
+from lean_profile import make_lean, apply_blocking, measure_page
+from oes_areas import names_for_area, area_label, output_filename, debug_prefix
+from table_detect import contains_area, names_from_title
+
+# Page heading and title, where BLS prints the area name
+AREA_TITLE_SCRIPT = """
+var heading = document.querySelector('h1, h2');
+return [heading ? heading.textContent : '', document.title].join('\\n');
+"""
+
+class SeleniumOESScraperBase(ABC):
+    """Selenium scraper for one OES area (and year); subclasses set url, readiness and extract_table_data"""
+
+    # Fallback row extraction: rows per selector (0 for all), td-only rows, matches needed to accept a selector
+    element_limit = 0
+    element_cells_only = False
+    element_min_count = 0
+
+    def __init__(self, area_code="0031080", year=None, pool=None, data_dir="oes_data", save_debug=True,
+                 page_load_timeout=None, lean=False, area_names=None, capture_mode=False):
+        # OES area (defaults to Los Angeles-Long Beach-Anaheim, CA MSA) and the place names that identify it
+        self.area_code = area_code
+        self.year = year
+        self.area_names = names_for_area(area_code, area_names)
+        self.area_label = area_label(area_code, self.area_names)
+
+        # Page to scrape, set by the subclass
+        self.url = None
+        self.page_description = "BLS OES page"
+
+        # Create data directory
+        self.data_dir = data_dir
+        os.makedirs(self.data_dir, exist_ok=True)
+
+        # Initialize webdriver (borrowed from a DriverPool when one is given)
+        self.driver = None
+        self.pool = pool
+
+        # Capture mode saves the page's JSON responses instead of scraping the DOM
+        self.capture_mode = capture_mode
+
+        # Screenshots/page source are skipped for batch jobs; pooled tabs get a page load timeout
+        self.save_debug = save_debug
+        self.page_load_timeout = page_load_timeout
+
+        # Lean profile blocks images, fonts, styles and analytics (use lean_options for a pool)
+        self.lean = lean
+        self.page_cost = None
+
+        # Event-driven readiness (PageReadiness) set by the subclass
+        self.readiness = None
+        self.last_readiness = None
+
+    @property
+    def debug_prefix(self):
+        """File name prefix of the screenshot and page source"""
+        return debug_prefix(self.area_code, self.year)
+
+    def setup_driver(self):
+        """Setup Chrome webdriver with appropriate options"""
+        print("🔧 Setting up Chrome webdriver...")
+
+        # Same base options as the pooled browsers
+        options = chrome_options()
+
+        if self.lean:
+            make_lean(options)
+
+        if self.capture_mode:
+            enable_performance_logging(options)
+
+        try:
+            self.driver = webdriver.Chrome(options=options)
+            print("✅ Chrome webdriver initialized successfully")
+            return True
+        except Exception as e:
+            print(f"❌ Error initializing Chrome webdriver: {e}")
+            print("💡 Make sure Chrome is installed and chromedriver is available")
+            return False
+
+    def navigate_to_oes_page(self):
+        """Navigate to the OES page of the area"""
+        print(f"🌐 Navigating to {self.page_description}...")
+        print(f"📍 Target URL: {self.url}")
+
+        try:
+            self.driver.get(self.url)
+            print("✅ Successfully loaded the page")
+
+            # Wait until the data is present instead of a fixed sleep
+            self.last_readiness = self.readiness.wait(self.driver)
+            print(f"⏱️  Page ready in {self.last_readiness['latency']:.2f}s ({self.last_readiness['reason']}, "
+                  f"{self.last_readiness['rows']} rows)")
+
+            # Bytes and load time of the page, for comparing lean and baseline runs
+            self.page_cost = measure_page(self.driver)
+            print(f"📦 Page weight: {self.page_cost['bytes'] / 1024:.0f} KB in {self.page_cost['requests']} requests")
+
+            # Check if page loaded correctly (readiness already required the area's name when known)
+            if self.area_names and not self.last_readiness['markers']:
+                print(f"❌ Page does not mention {self.area_label}")
+                return False
+            if not self.area_names:
+                self.learn_area_names()
+            print(f"✅ Page loaded for {self.area_label}")
+            return True
+
+        except Exception as e:
+            print(f"❌ Error navigating to page: {e}")
+            return False
+
+    def wait_for_data_to_load(self, timeout=30):
+        """Wait for data to load on the page"""
+        # navigate_to_oes_page already waited on the readiness condition
+        if self.last_readiness is None or not self.last_readiness['ready']:
+            print("⏳ Waiting for data to load...")
+            self.last_readiness = self.readiness.wait(self.driver, timeout)
+
+        if self.last_readiness['ready']:
+            print(f"✅ Data loaded ({self.last_readiness['rows']} rows, {self.last_readiness['latency']:.2f}s)")
+            return True
+
+        print("⚠️  Data readiness timed out")
+        return False
+
+    def learn_area_names(self):
+        """Take the area's place names from the page title when none were given"""
+        try:
+            names = names_from_title(self.driver.execute_script(AREA_TITLE_SCRIPT))
+        except Exception as e:
+            print(f"⚠️  Could not read the area title: {e}")
+            return ()
+        if names:
+            self.area_names = names
+            self.area_label = area_label(self.area_code, names)
+            print(f"🏷️  Area names from page title: {', '.join(names)}")
+        return names
+
+    @abstractmethod
+    def extract_table_data(self):
+        """Extract the area's data table from the page (subclass-specific)"""
+
+    def is_area_data_table(self, df):
+        """Check if a table contains data for the scraper's area (its place names or codes)"""
+        # One compiled regex over each column's joined text, stopping at the first match
+        return contains_area(df, self.area_code, self.area_names)
+
+    def extract_data_from_elements(self):
+        """Extract data from page elements as fallback"""
+        print("🔍 Extracting data from page elements...")
+
+        try:
+            # Try different selectors for data rows
+            selectors = [
+                "tbody tr",
+                ".data-row",
+                "[data-testid='data-row']",
+                ".oes-row",
+                "tr"
+            ]
+
+            for selector in selectors:
+                try:
+                    # One call per selector serializes the matching rows' cells
+                    count, df = extract_rows(self.driver, selector, limit=self.element_limit,
+                                             cells_only=self.element_cells_only)
+                    print(f"📊 Found {count} elements with selector: {selector}")
+
+                    if df is not None and count > self.element_min_count:
+                        print(f"✅ Extracted data with selector {selector}: {df.shape}")
+                        return df
+
+                except Exception as e:
+                    print(f"❌ Error with selector {selector}: {e}")
+                    continue
+
+            print("❌ No data found in page elements")
+            return None
+
+        except Exception as e:
+            print(f"❌ Error extracting from elements: {e}")
+            return None
+
+    def save_page_source(self):
+        """Save the page source for debugging"""
+        try:
+            page_source = self.driver.page_source
+            output_file = os.path.join(self.data_dir, f"{self.debug_prefix}_page_source.html")
+
+            with open(output_file, 'w', encoding='utf-8') as f:
+                f.write(page_source)
+
+            print(f"💾 Page source saved to {output_file}")
+            return output_file
+
+        except Exception as e:
+            print(f"❌ Error saving page source: {e}")
+            return None
+
+    def take_screenshot(self):
+        """Take a screenshot of the page"""
+        try:
+            screenshot_file = os.path.join(self.data_dir, f"{self.debug_prefix}_screenshot.png")
+            self.driver.save_screenshot(screenshot_file)
+            print(f"📸 Screenshot saved to {screenshot_file}")
+            return screenshot_file
+
+        except Exception as e:
+            print(f"❌ Error taking screenshot: {e}")
+            return None
+
+    def get_oes_data(self):
+        """Main method to get OES data"""
+        vintage = f"{self.year} " if self.year else ""
+        print(f"🚀 Starting Selenium-based {vintage}OES data extraction for {self.area_label}...")
+
+        if self.pool is not None:
+            # Borrow a tab in a warm browser; the pool owns the browser's lifetime
+            try:
+                with self.pool.tab() as driver:
+                    self.driver = driver
+                    if self.page_load_timeout:
+                        driver.set_page_load_timeout(self.page_load_timeout)
+                    return self.scrape_page()
+            except Exception as e:
+                print(f"❌ Error during data extraction: {e}")
+                return None
+            finally:
+                self.driver = None
+
+        # Setup webdriver
+        if not self.setup_driver():
+            return None
+
+        try:
+            return self.scrape_page()
+        finally:
+            # Clean up
+            if self.driver:
+                self.driver.quit()
+                print("🧹 Webdriver closed")
+
+    def scrape_page(self):
+        """Navigate, wait and extract the OES data with the current driver"""
+        try:
+            if self.lean:
+                # Blocking applies per tab, so set it on every page
+                apply_blocking(self.driver)
+
+            if self.capture_mode:
+                return self.capture_network_data()
+
+            # Navigate to the page
+            if not self.navigate_to_oes_page():
+                return None
+
+            # Wait for data to load
+            if not self.wait_for_data_to_load():
+                print("⚠️  Data loading timeout, proceeding anyway...")
+
+            if self.save_debug:
+                # Screenshot and page source for debugging
+                self.take_screenshot()
+                self.save_page_source()
+
+            # Try to extract table data
+            data = self.extract_table_data()
+
+            if data is None:
+                # Try alternative extraction method
+                print("🔄 Trying alternative data extraction method...")
+                data = self.extract_data_from_elements()
+
+            if data is not None:
+                # Save the data
+                output_file = os.path.join(self.data_dir, output_filename(self.area_code, self.year))
+                data.to_csv(output_file, index=False)
+                print(f"💾 Data saved to {output_file}")
+
+                return data
+            else:
+                print("❌ Could not extract any data")
+                return None
+
+        except Exception as e:
+            print(f"❌ Error during data extraction: {e}")
+            return None
+
+    def capture_network_data(self):
+        """Save the page's JSON data responses from the network log instead of scraping the DOM"""
+        print("📡 Capturing OES data responses from network traffic...")
+
+        capture = NetworkCapture(self.driver, os.path.join(self.data_dir, "network_capture"))
+        capture.start()
+
+        # The readiness wait in navigation returns once the data XHR has finished
+        if not self.navigate_to_oes_page():
+            return None
+
+        captured = capture.collect(label=f"area_{self.area_code}" + (f"_{self.year}" if self.year else ""))
+        if not captured:
+            print("❌ No JSON data responses captured")
+            print("💡 With a DriverPool, pass options_factory that calls enable_performance_logging")
+            return None
+
+        print(f"✅ Captured {len(captured)} data responses (manifest in {capture.output_dir})")
+        return pd.DataFrame(captured)
+
+    def analyze_extracted_data(self, data):
+        """Analyze the extracted data"""
+        if data is None or data.empty:
+            print("❌ No data to analyze")
+            return None
+
+        vintage = f" {self.year}" if self.year else ""
+        print(f"\n📊 ANALYZING EXTRACTED{vintage} DATA")
+        print("=" * 50)
+
+        print(f"📊 Data shape: {data.shape}")
+        print(f"📋 Columns: {list(data.columns)}")
+        print(f"📄 First few rows:")
+        print(data.head())
+
+        # Try to identify location quotient data
+        lq_columns = []
+        for col in data.columns:
+            if any(term in str(col).lower() for term in ['location quotient', 'lq', 'quotient']):
+                lq_columns.append(col)
+
+        if lq_columns:
+            print(f"🎯 Found location quotient columns: {lq_columns}")
+
+            # Basic statistics for LQ columns
+            for col in lq_columns:
+                try:
+                    numeric_data = pd.to_numeric(data[col], errors='coerce')
+                    print(f"\n📈 Statistics for {col}:")
+                    print(f"   Mean: {numeric_data.mean():.3f}")
+                    print(f"   Median: {numeric_data.median():.3f}")
+                    print(f"   Min: {numeric_data.min():.3f}")
+                    print(f"   Max: {numeric_data.max():.3f}")
+                    print(f"   Count: {numeric_data.count()}")
+                except Exception as e:
+                    print(f"❌ Error analyzing {col}: {e}")
+        else:
+            print("⚠️  No location quotient columns found")
+
+        return data
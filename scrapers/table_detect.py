@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Single-pass detection of tables that belong to an OES area
+All indicators (area names and codes) are compiled into one case-insensitive
+regex, and each column is scanned once as a joined text buffer, stopping at
+the first match
+"""
+
+import re
+from functools import lru_cache
+import pandas as pd
+from oes_areas import LA_AREA_CODE, AREA_NAMES
+
+
+# MSA titles as BLS prints them, e.g. "Los Angeles-Long Beach-Anaheim, CA"
+PLACE = r"[A-Z][\w.']*(?: [A-Z][\w.']*)*"
+AREA_TITLE = re.compile(rf"({PLACE}(?:-{PLACE})*),\s*[A-Z]{{2}}(?:-[A-Z]{{2}})*\b")
+
+
+def names_from_title(title):
+    """
+    Place names of an area from a page or table title
+
+    Args:
+        title: Text containing an MSA title such as "Los Angeles-Long Beach-Anaheim, CA"
+
+    Returns:
+        Tuple of lower-case place names (empty if the text has no area title)
+    """
+    match = AREA_TITLE.search(title or "")
+    if not match:
+        return ()
+    return tuple(name.strip().lower() for name in match.group(1).split('-') if name.strip())
+
+
+def area_indicators(area_code=LA_AREA_CODE, names=None):
+    """Indicators of an area: its place names, 5-digit CBSA code and 7-digit OES code"""
+    names = AREA_NAMES.get(area_code, ()) if names is None else names
+    return tuple(names) + (area_code[-5:], area_code)
+
+
+@lru_cache(maxsize=128)
+def compile_indicators(indicators):
+    """One case-insensitive alternation of every indicator (longest first)"""
+    ordered = sorted(set(indicators), key=len, reverse=True)
+    return re.compile("|".join(re.escape(indicator) for indicator in ordered), re.IGNORECASE)
+
+
+def contains_area(df, area_code=LA_AREA_CODE, names=None):
+    """
+    Check if any cell of a table mentions the area
+
+    Args:
+        df: Table to scan
+        area_code: 7-digit OES area code (e.g. "0031080")
+        names: Place names to look for (defaults to AREA_NAMES for the area)
+
+    Returns:
+        True at the first column whose text matches an indicator
+    """
+    if df is None or df.empty:
+        return False
+
+    pattern = compile_indicators(area_indicators(area_code, names))
+
+    for _, column in df.items():
+        if pd.api.types.is_bool_dtype(column):
+            continue
+        values = column.dropna()
+        if values.empty:
+            continue
+        # Newline separators keep matches inside a single cell
+        if pattern.search("\n".join(map(str, values.tolist()))):
+            return True
+
+    return False
@@ -8,21 +8,72 @@ import requests
 import pandas as pd
 import os
 import zipfile
-import io
-import time
+import sys
+import threading
 from datetime import datetime
 from urllib.parse import urljoin, urlparse
 import re
+import json
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from download_manager import DownloadManager
+
+BLS_ROOT = "https://www.bls.gov"
+FIRST_OES_YEAR = 1997
+
+# Candidate flat-file locations across OES vintages, in order of preference.
+# {year} is the 4-digit year, {yy} the 2-digit year.
+LINK_PATTERNS = [
+    "/oes/{year}/may/oessrcma.xlsx",           # Location quotients by MSA
+    "/oes/{year}/may/oessrcma.xls",            # Alternative format
+    "/oes/{year}/may/oes_{year}_may_srcma.xlsx",
+    "/oes/special-requests/oesm{yy}ma.zip",   # May estimates, current site layout
+    "/oes/special.requests/oesm{yy}ma.zip",   # May estimates, older site layout
+    "/oes/special-requests/oes{yy}ma.zip",    # 1997-2002 annual estimates
+    "/oes/special.requests/oes{yy}ma.zip",
+]
+
+# MSA data members of the zipped flat files, in order of preference
+# ({year} is the 4-digit year); other members are field descriptions or other area types.
+# Older .xls vintages split the MSA data into numbered parts (..._dl_1.xls, ..._dl_2.xls)
+MSA_MEMBER_PATTERNS = [
+    r"^MSA_M{year}_dl(_\d+)?\.xlsx?$",
+    r"^MSA_.*_dl(_\d+)?\.xlsx?$",
+]
+
+# Pages scraped for links when no candidate URL answers
+LINK_PAGES = [
+    "/oes/{year}/may/oessrcma.htm",
+    "/oes/tables.htm",
+]
+
+
+def latest_oes_year():
+    """Most recent May reference year (estimates are published the following spring)"""
+    return datetime.now().year - 1
+
+
+def fill_pattern(pattern, year):
+    """Absolute URL of a link pattern for a year"""
+    return BLS_ROOT + pattern.format(year=year, yy=f"{year % 100:02d}")
+
+
+def part_number(name):
+    """Part number of a split MSA data file (..._1.xls), 0 when not split"""
+    match = re.search(r'_(\d+)\.xlsx?$', name, re.IGNORECASE)
+    return int(match.group(1)) if match else 0
+
+
+def member_filename(member, year):
+    """Local name of an MSA data member: oes_<year>_srcma[_<part>] with the member's own extension"""
+    extension = os.path.splitext(member)[1].lower()
+    part = part_number(member)
+    return f"oes_{year}_srcma_{part}{extension}" if part else f"oes_{year}_srcma{extension}"
 
 class BLSWebScraper:
     """Web scraper for BLS OES data"""
     
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
-        
         # Los Angeles MSA information
         self.la_msa_code = "31080"
         self.la_msa_name = "Los Angeles-Long Beach-Anaheim, CA"
@@ -30,86 +81,155 @@ class BLSWebScraper:
         # Create data directory
         self.data_dir = "oes_data"
         os.makedirs(self.data_dir, exist_ok=True)
-    
-    def get_oes_links(self, year):
-        """Get OES data links for a specific year"""
-        if year == 2024:
-            base_url = "https://www.bls.gov/oes/2024/may/"
-        elif year == 2019:
-            base_url = "https://www.bls.gov/oes/2019/may/"
-        else:
-            raise ValueError(f"Year {year} not supported. Only 2019 and 2024 are supported.")
-        
-        # OES data file patterns
-        file_patterns = [
-            "oessrcma.xlsx",  # Location quotients by MSA
-            "oessrcma.xls",   # Alternative format
-            "oes_2024_may_srcma.xlsx",  # 2024 specific
-            "oes_2019_may_srcma.xlsx",  # 2019 specific
-        ]
         
-        links = []
-        for pattern in file_patterns:
-            url = urljoin(base_url, pattern)
+        # Concurrent HEAD probes and downloads; the semaphore caps requests in flight
+        # across all years at the worker count
+        self.workers = 8
+        self.request_slots = threading.Semaphore(self.workers)
+        
+        # Resumable, verified downloads; every thread gets its own session from new_session
+        self.downloader = DownloadManager(session_factory=self.new_session)
+        
+        # Link pattern that worked for each year, reused on later runs
+        self.pattern_cache_file = os.path.join(self.data_dir, "oes_link_patterns.json")
+        self.pattern_cache = self.load_pattern_cache()
+        self.cache_lock = threading.Lock()
+    
+    @staticmethod
+    def new_session():
+        """HTTP session with the scraper's headers and a keep-alive connection pool"""
+        session = requests.Session()
+        session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        })
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+    
+    @property
+    def session(self):
+        """This thread's session (requests.Session is not thread-safe), shared with its downloads"""
+        return self.downloader.session
+    
+    def load_pattern_cache(self):
+        """Year -> link pattern that worked before"""
+        if os.path.exists(self.pattern_cache_file):
             try:
-                response = self.session.head(url)
-                if response.status_code == 200:
-                    links.append(url)
-                    print(f"✅ Found: {url}")
-            except Exception as e:
-                print(f"❌ Error checking {url}: {e}")
+                with open(self.pattern_cache_file) as f:
+                    cache = json.load(f)
+                if isinstance(cache, dict):
+                    return cache
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Ignoring unreadable link pattern cache {self.pattern_cache_file}: {e}")
+        return {}
+    
+    def save_pattern_cache(self):
+        """Persist the per-year link patterns"""
+        with open(self.pattern_cache_file, 'w') as f:
+            json.dump(self.pattern_cache, f, indent=2, sort_keys=True)
+    
+    def url_exists(self, url):
+        """HEAD a candidate URL"""
+        try:
+            with self.request_slots:
+                response = self.session.head(url, allow_redirects=True, timeout=15)
+            return response.status_code == 200
+        except Exception as e:
+            print(f"❌ Error checking {url}: {e}")
+            return False
+    
+    def get_oes_links(self, year):
+        """Get OES data links for a specific year (1997 to the latest vintage)"""
+        if not FIRST_OES_YEAR <= year <= latest_oes_year():
+            raise ValueError(f"Year {year} not supported. OES vintages run from {FIRST_OES_YEAR} to {latest_oes_year()}.")
+        
+        # The pattern that worked last time needs a single HEAD
+        cached = self.pattern_cache.get(str(year))
+        if cached:
+            url = fill_pattern(cached, year)
+            if self.url_exists(url):
+                print(f"✅ Found (cached pattern): {url}")
+                return [url]
+        
+        # Otherwise probe every candidate at once
+        candidates = [fill_pattern(pattern, year) for pattern in LINK_PATTERNS]
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            found = list(executor.map(self.url_exists, candidates))
+        
+        links = [url for url, ok in zip(candidates, found) if ok]
+        for url in links:
+            print(f"✅ Found: {url}")
+        
+        if links:
+            with self.cache_lock:
+                self.pattern_cache[str(year)] = LINK_PATTERNS[found.index(True)]
+                self.save_pattern_cache()
         
         return links
     
     def download_oes_file(self, url, year):
-        """Download OES data file"""
-        filename = f"oes_{year}_srcma.xlsx"
-        filepath = os.path.join(self.data_dir, filename)
+        """Download OES data file; returns the list of data file paths (several for split vintages) or None"""
+        source_name = os.path.basename(urlparse(url).path)
+        extension = os.path.splitext(source_name)[1].lower()
+        filepath = os.path.join(self.data_dir, f"oes_{year}_srcma{extension if extension in ('.xlsx', '.xls') else '.xlsx'}")
         
         print(f"🔍 Downloading {url}...")
         
         try:
-            response = self.session.get(url, stream=True)
-            response.raise_for_status()
-            
-            # Check if it's a zip file
-            if 'zip' in response.headers.get('content-type', ''):
-                # Handle zip file
-                with zipfile.ZipFile(io.BytesIO(response.content)) as zip_file:
-                    # Extract Excel files
-                    for file_info in zip_file.filelist:
-                        if file_info.filename.endswith(('.xlsx', '.xls')):
-                            with zip_file.open(file_info.filename) as file:
-                                with open(filepath, 'wb') as f:
-                                    f.write(file.read())
-                            print(f"✅ Extracted: {file_info.filename} -> {filepath}")
-                            break
-            else:
-                # Direct file download
-                with open(filepath, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                print(f"✅ Downloaded: {filepath}")
-            
-            return filepath
-            
+            if extension in ('.xlsx', '.xls'):
+                # Direct file download, resumable and verified
+                with self.request_slots:
+                    path = self.downloader.download(url, filepath)
+                return [path] if path else None
+        
+            # Archives are downloaded to disk first instead of being buffered in memory
+            with self.request_slots:
+                archive = self.downloader.download(url, os.path.join(self.data_dir, f"oes_{year}_{source_name}"))
+            if archive is None:
+                return None
+        
+            if zipfile.is_zipfile(archive):
+                # Stream every part of the MSA data to disk (the archive also holds field descriptions)
+                for pattern in MSA_MEMBER_PATTERNS:
+                    extracted = self.downloader.extract_members(archive, self.data_dir,
+                                                                rename=lambda member: member_filename(member, year),
+                                                                pattern=pattern.format(year=year))
+                    if extracted:
+                        return sorted(extracted, key=part_number)
+                print(f"❌ No MSA data member (MSA_M{year}_dl or MSA_*_dl) in {archive}")
+                return None
+        
+            os.replace(archive, filepath)
+            print(f"✅ Downloaded: {filepath}")
+            return [filepath]
+        
         except Exception as e:
             print(f"❌ Error downloading {url}: {e}")
             return None
     
     def find_oes_data_links(self, year):
-        """Find OES data links by scraping the main page"""
-        if year == 2024:
-            url = "https://www.bls.gov/oes/2024/may/oessrcma.htm"
-        elif year == 2019:
-            url = "https://www.bls.gov/oes/2019/may/oessrcma.htm"
-        else:
-            raise ValueError(f"Year {year} not supported")
-        
+        """Find OES data links by scraping the year's page (or the tables index)"""
+        yy = f"{year % 100:02d}"
+        
+        for page in LINK_PAGES:
+            url = fill_pattern(page, year)
+            links = self.scrape_data_links(url)
+            if page == "/oes/tables.htm":
+                # The index lists every vintage; keep this year's files
+                links = [link for link in links if str(year) in link or f"m{yy}ma" in link or f"oes{yy}ma" in link]
+            if links:
+                return links
+        
+        return []
+    
+    def scrape_data_links(self, url):
+        """Excel/ZIP data links on a page"""
         print(f"🔍 Scraping {url} for data links...")
         
         try:
-            response = self.session.get(url)
+            with self.request_slots:
+                response = self.session.get(url, timeout=30)
             response.raise_for_status()
             
             # Look for Excel file links
@@ -117,6 +237,7 @@ class BLSWebScraper:
                 r'href=["\']([^"\']*\.xlsx)["\']',
                 r'href=["\']([^"\']*\.xls)["\']',
                 r'href=["\']([^"\']*srcma[^"\']*)["\']',
+                r'href=["\']([^"\']*ma\.zip)["\']',
             ]
             
             links = []
@@ -138,37 +259,57 @@ class BLSWebScraper:
             print(f"❌ Error scraping {url}: {e}")
             return []
     
-    def download_all_oes_data(self):
-        """Download OES data for both years"""
-        years = [2019, 2024]
-        downloaded_files = {}
-        
-        for year in years:
-            print(f"\n📊 Processing {year} OES data...")
-            print("=" * 50)
-            
-            # Try direct links first
-            direct_links = self.get_oes_links(year)
-            
-            # If no direct links, scrape the page
-            if not direct_links:
-                print("🔍 No direct links found, scraping page...")
-                direct_links = self.find_oes_data_links(year)
-            
-            # Download files
-            for link in direct_links:
-                filepath = self.download_oes_file(link, year)
-                if filepath and os.path.exists(filepath):
-                    downloaded_files[year] = filepath
-                    break
-            
-            # Rate limiting
-            time.sleep(2)
+    def download_year(self, year):
+        """Discover and download one year's data; returns its file paths (one per part) or None"""
+        print(f"\n📊 Processing {year} OES data...")
+        
+        # Try direct links first
+        direct_links = self.get_oes_links(year)
+        
+        # If no direct links, scrape the page
+        if not direct_links:
+            print(f"🔍 No direct links found for {year}, scraping page...")
+            direct_links = self.find_oes_data_links(year)
+        
+        # Download files
+        for link in direct_links:
+            filepaths = self.download_oes_file(link, year)
+            if filepaths and all(os.path.exists(filepath) for filepath in filepaths):
+                return filepaths
+        
+        print(f"❌ No {year} OES file downloaded")
+        return None
+    
+    def download_all_oes_data(self, years=None):
+        """Download OES data for several years concurrently (defaults to 2019 and 2024)"""
+        years = years or [2019, 2024]
+        
+        # Years run in parallel; throughput is bounded by bandwidth and the worker count
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(years))) as executor:
+            paths = list(executor.map(self.download_year, years))
         
-        return downloaded_files
+        return {year: path for year, path in zip(years, paths) if path}
     
-    def read_oes_excel(self, filepath):
-        """Read OES Excel file and extract Los Angeles data"""
+    def backfill_all_vintages(self, start_year=FIRST_OES_YEAR, end_year=None):
+        """Download every OES vintage from start_year to end_year (latest by default)"""
+        end_year = end_year or latest_oes_year()
+        print(f"📥 Backfilling OES vintages {start_year}-{end_year}...")
+        downloaded = self.download_all_oes_data(list(range(start_year, end_year + 1)))
+        print(f"✅ Downloaded {len(downloaded)} of {end_year - start_year + 1} vintages")
+        return downloaded
+    
+    def read_oes_excel(self, filepaths):
+        """Read an OES Excel file, or the parts of a split one, into one DataFrame"""
+        if isinstance(filepaths, str):
+            return self.read_oes_sheet(filepaths)
+        
+        frames = [self.read_oes_sheet(filepath) for filepath in filepaths]
+        if any(df is None for df in frames):
+            return None
+        return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+    
+    def read_oes_sheet(self, filepath):
+        """Read the data sheet of one OES Excel file"""
         print(f"📖 Reading {filepath}...")
         
         try:
@@ -341,6 +482,11 @@ def main():
     
     scraper = BLSWebScraper()
     
+    # --backfill downloads every OES vintage instead of running the 2019-2024 analysis
+    if "--backfill" in sys.argv:
+        scraper.backfill_all_vintages()
+        return
+    
     # Download OES data
     print("📥 Downloading OES data...")
     downloaded_files = scraper.download_all_oes_data()
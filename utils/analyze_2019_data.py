@@ -6,6 +6,7 @@ Analyze the already extracted 2019 data from CSV
 
 import pandas as pd
 import os
+from oes_store import ResultStore
 
 def analyze_2019_data():
     """Analyze the 2019 OES data"""
@@ -169,7 +170,6 @@ def analyze_oes_data_2019(df):
         print(f"   Low concentration (LQ ≤ 0.5): {len(low_concentration)} occupations")
         
         # Save analysis results
-        analysis_file = "scrapers/oes_data_2019/la_oes_2019_analysis_results.csv"
         
         # Create analysis summary
         analysis_summary = pd.DataFrame({
@@ -180,8 +180,10 @@ def analyze_oes_data_2019(df):
                      lq_stats['mean'], lq_stats['50%']]
         })
         
-        analysis_summary.to_csv(analysis_file, index=False)
-        print(f"\n💾 Analysis results saved to {analysis_file}")
+        store = ResultStore()
+        store.write(analysis_summary, "la_oes_analysis_results", area="31080", year=2019,
+                    csv_path="scrapers/oes_data_2019/la_oes_2019_analysis_results.csv")
+        print(f"\n💾 Analysis results saved to {store.table_dir('la_oes_analysis_results')}")
         
     except Exception as e:
         print(f"❌ Error analyzing data: {e}")
@@ -245,9 +247,10 @@ def create_location_quotient_report_2019(df):
         report_df.insert(0, 'Rank', range(1, len(report_df) + 1))
         
         # Save report
-        report_file = "scrapers/oes_data_2019/la_location_quotient_2019_report.csv"
-        report_df.to_csv(report_file, index=False)
-        print(f"💾 Location quotient report saved to {report_file}")
+        store = ResultStore()
+        store.write(report_df, "la_location_quotient_report", area="31080", year=2019,
+                    csv_path="scrapers/oes_data_2019/la_location_quotient_2019_report.csv")
+        print(f"💾 Location quotient report saved to {store.table_dir('la_location_quotient_report')}")
         
         # Print summary
         print(f"\n📊 REPORT SUMMARY:")
@@ -271,7 +274,7 @@ def main():
         if cleaned_data is not None:
             print(f"\n✅ 2019 Data analysis completed successfully!")
             print(f"📊 Analyzed {len(cleaned_data)} occupations")
-            print(f"📁 Files created in scrapers/oes_data_2019/")
+            print(f"📁 Tables written to oes_data/store/ (year=2019 partitions)")
             
         else:
             print("\n❌ Data analysis failed")
@@ -0,0 +1,111 @@
+"""
+Vectorized codec for BLS (year, period) pairs
+
+BLS time series label observations with a year and a period code:
+M01-M12 (monthly), M13 (annual average), Q01-Q04 (quarterly), Q05 (annual
+average), S01-S02 (semiannual), S03 (annual average) and A01 (annual).
+encode_periods maps them to a compact integer time index (months since
+year 0: year * 12 + month - 1, of the first month of the period) plus a
+frequency code, resolving each distinct period code once rather than parsing
+strings per row. Convert to datetime only when presenting results.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Tuple
+
+# Frequency codes
+MONTHLY = 0
+QUARTERLY = 1
+SEMIANNUAL = 2
+ANNUAL = 3
+
+FREQUENCY_NAMES = {
+    MONTHLY: 'monthly',
+    QUARTERLY: 'quarterly',
+    SEMIANNUAL: 'semiannual',
+    ANNUAL: 'annual',
+}
+
+# Period code -> (month offset within the year, frequency)
+PERIOD_CODES = {f"M{m:02d}": (m - 1, MONTHLY) for m in range(1, 13)}
+PERIOD_CODES.update({f"Q{q:02d}": (3 * (q - 1), QUARTERLY) for q in range(1, 5)})
+PERIOD_CODES.update({f"S{s:02d}": (6 * (s - 1), SEMIANNUAL) for s in range(1, 3)})
+PERIOD_CODES.update({'M13': (0, ANNUAL), 'Q05': (0, ANNUAL), 'S03': (0, ANNUAL), 'A01': (0, ANNUAL)})
+
+# Frequency -> period code prefix, for decoding
+_PREFIX = {MONTHLY: 'M', QUARTERLY: 'Q', SEMIANNUAL: 'S', ANNUAL: 'A'}
+_MONTHS_PER_PERIOD = {MONTHLY: 1, QUARTERLY: 3, SEMIANNUAL: 6, ANNUAL: 12}
+
+# Marks codes outside PERIOD_CODES
+UNKNOWN = -1
+
+
+def month_index(year, month) -> np.ndarray:
+    """Integer month index (year * 12 + month - 1)"""
+    return np.asarray(year, dtype=np.int64) * 12 + np.asarray(month, dtype=np.int64) - 1
+
+
+def encode_periods(years, periods) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encode (year, period) pairs
+
+    Args:
+        years: Array-like of years (strings or integers)
+        periods: Array-like of BLS period codes ("M01", "M13", "Q02", ...)
+
+    Returns:
+        Tuple of (int32 time index of the period's first month, int8 frequency
+        code). Unknown period codes get time index -1 and frequency UNKNOWN
+    """
+    # Resolve each distinct year and period code once; factorize marks missing values
+    # with -1, which indexes the trailing UNKNOWN entry of each lookup table
+    period_codes, period_uniques = pd.factorize(np.asarray(periods, dtype=object).ravel())
+    lookup = [PERIOD_CODES.get(str(code).strip(), (UNKNOWN, UNKNOWN)) for code in period_uniques]
+    offsets = np.array([entry[0] for entry in lookup] + [UNKNOWN], dtype=np.int64)
+    frequencies = np.array([entry[1] for entry in lookup] + [UNKNOWN], dtype=np.int8)
+
+    year_codes, year_uniques = pd.factorize(np.asarray(years, dtype=object).ravel())
+    year_values = pd.to_numeric(pd.Series(year_uniques, dtype=object), errors='coerce').to_numpy(dtype=float)
+    year_values = np.append(year_values, np.nan)
+
+    offset = offsets[period_codes]
+    year = year_values[year_codes]
+    valid = (offset >= 0) & ~np.isnan(year)
+
+    time_index = np.where(valid, np.nan_to_num(year).astype(np.int64) * 12 + offset, -1).astype(np.int32)
+    frequency = np.where(valid, frequencies[period_codes], UNKNOWN).astype(np.int8)
+    return time_index, frequency
+
+
+def decode_periods(time_index, frequency) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Decode time indices back to (year, period code)
+
+    Annual observations decode to "A01"; use the series' own convention
+    (e.g. M13 in CES) when writing them back out.
+    """
+    time_index = np.asarray(time_index, dtype=np.int64)
+    frequency = np.asarray(frequency, dtype=np.int8)
+    years = time_index // 12
+    months = time_index % 12
+
+    periods = np.full(time_index.shape, '', dtype=object)
+    for code, prefix in _PREFIX.items():
+        mask = frequency == code
+        numbers = months[mask] // _MONTHS_PER_PERIOD[code] + 1
+        periods[mask] = [f"{prefix}{n:02d}" for n in numbers]
+    return years, periods
+
+
+def to_datetime(time_index) -> pd.DatetimeIndex:
+    """Timestamp of the first day of each period (presentation edge only)"""
+    time_index = np.asarray(time_index, dtype=np.int64)
+    months = (time_index - 1970 * 12).astype('datetime64[M]')
+    return pd.DatetimeIndex(np.where(time_index >= 0, months, np.datetime64('NaT')).astype('datetime64[ns]'))
+
+
+def add_period_columns(df: pd.DataFrame, year_col: str = 'year', period_col: str = 'period') -> pd.DataFrame:
+    """Add time_index and frequency columns to a BLS table"""
+    time_index, frequency = encode_periods(df[year_col].to_numpy(), df[period_col].to_numpy())
+    return df.assign(time_index=time_index, frequency=frequency)
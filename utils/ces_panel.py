@@ -0,0 +1,301 @@
+"""
+All-metro CES supersector panel as a dense (area x supersector x month) cube
+
+Supersector employment for every MSA (State and Area, `sm`) and the nation
+(`ce`) is ingested from the BLS flat files or the API into one float32 array
+with axis index arrays. The cube is persisted as .npy so it can be memory-mapped,
+and cross-metro concentration comparisons become array slices.
+
+Flat files: https://download.bls.gov/pub/time.series/sm/ and .../ce/
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from typing import Iterable, List, Optional, Sequence, Union
+from bls_periods import encode_periods, to_datetime, MONTHLY
+
+# Area code used for the national (ce) rows of the cube
+NATIONAL_AREA = "0000000"
+
+# CES supersectors (plus total nonfarm, total private and government aggregates)
+SUPERSECTORS = {
+    "00": "Total Nonfarm",
+    "05": "Total Private",
+    "10": "Mining and Logging",
+    "20": "Construction",
+    "30": "Manufacturing",
+    "40": "Trade, Transportation, and Utilities",
+    "50": "Information",
+    "55": "Financial Activities",
+    "60": "Professional and Business Services",
+    "65": "Education and Health Services",
+    "70": "Leisure and Hospitality",
+    "80": "Other Services",
+    "90": "Government",
+}
+
+# All employees, in thousands
+ALL_EMPLOYEES = "01"
+
+# Series per API request (BLS v2 limit)
+API_BATCH_SIZE = 50
+
+VALUES_FILE = "values.npy"
+AXES_FILE = "axes.npz"
+
+
+def parse_series_ids(series_ids: Iterable[str]) -> pd.DataFrame:
+    """
+    Split sm/ce series IDs into their fields
+
+    sm: SM + seasonal + state(2) + area(5) + supersector(2) + industry(6) + datatype(2)
+    ce: CE + seasonal + supersector(2) + industry(6) + datatype(2)
+
+    Args:
+        series_ids: Series IDs from either survey
+
+    Returns:
+        DataFrame with series_id, seasonal, area, supersector, industry, datatype
+        (area is NATIONAL_AREA for ce series)
+    """
+    ids = pd.Series(list(series_ids), dtype='string').str.strip()
+    is_sm = ids.str.startswith('SM')
+
+    return pd.DataFrame({
+        'series_id': ids,
+        'seasonal': ids.str[2],
+        'area': ids.str[3:10].where(is_sm, NATIONAL_AREA),
+        'supersector': ids.str[10:12].where(is_sm, ids.str[3:5]),
+        'industry': ids.str[12:18].where(is_sm, ids.str[5:11]),
+        'datatype': ids.str[18:20].where(is_sm, ids.str[11:13]),
+    })
+
+
+def sm_series_id(area: str, supersector: str, seasonal: str = 'U', datatype: str = ALL_EMPLOYEES) -> str:
+    """State and Area series ID of a supersector aggregate (area = state + MSA code, e.g. 0631080)"""
+    return f"SM{seasonal}{area:0>7}{supersector}000000{datatype}"
+
+
+def ce_series_id(supersector: str, seasonal: str = 'U', datatype: str = ALL_EMPLOYEES) -> str:
+    """National CES series ID of a supersector aggregate"""
+    return f"CE{seasonal}{supersector}000000{datatype}"
+
+
+class CESPanel:
+    """Dense (area x supersector x month) employment cube"""
+
+    def __init__(self, values: np.ndarray, areas: np.ndarray, supersectors: np.ndarray, months: np.ndarray):
+        """
+        Initialize panel
+
+        Args:
+            values: float32 array of shape (n_areas, n_supersectors, n_months), NaN where missing
+            areas: Area codes of axis 0 (state + MSA, NATIONAL_AREA for the nation)
+            supersectors: Supersector codes of axis 1
+            months: Month index of axis 2 (bls_periods time index, year * 12 + month - 1)
+        """
+        self.values = values
+        self.areas = np.asarray(areas).astype(str)
+        self.supersectors = np.asarray(supersectors).astype(str)
+        self.months = np.asarray(months, dtype=np.int32)
+
+        self._area_pos = {code: i for i, code in enumerate(self.areas)}
+        self._supersector_pos = {code: i for i, code in enumerate(self.supersectors)}
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    @classmethod
+    def from_long(cls, df: pd.DataFrame) -> 'CESPanel':
+        """
+        Build the cube from a long table
+
+        Args:
+            df: Rows with area, supersector, year, period (M01-M12) and value;
+                M13 annual averages and other periods are ignored
+
+        Returns:
+            CESPanel
+        """
+        time_index, frequency = encode_periods(df['year'].to_numpy(), df['period'].to_numpy())
+        monthly = frequency == MONTHLY
+        df = df[monthly]
+        month_index = time_index[monthly]
+
+        if df.empty:
+            # Nothing monthly to place: an empty (0 x 0 x 0) panel
+            return cls(np.empty((0, 0, 0), dtype=np.float32), [], [], [])
+
+        values = pd.to_numeric(df['value'], errors='coerce').to_numpy(dtype=np.float32)
+
+        # Factorize each axis once, then scatter all values into the cube
+        area_idx, areas = pd.factorize(df['area'].astype(str), sort=True)
+        sector_idx, supersectors = pd.factorize(df['supersector'].astype(str), sort=True)
+        first, last = month_index.min(), month_index.max()
+        months = np.arange(first, last + 1, dtype=np.int32)
+
+        cube = np.full((len(areas), len(supersectors), len(months)), np.nan, dtype=np.float32)
+        cube[area_idx, sector_idx, month_index - first] = values
+
+        return cls(cube, np.asarray(areas), np.asarray(supersectors), months)
+
+    @classmethod
+    def from_flat_files(cls, paths: Union[str, Sequence[str]], seasonal: str = 'U',
+                        datatype: str = ALL_EMPLOYEES, areas: Optional[Iterable[str]] = None,
+                        chunksize: int = 1_000_000) -> 'CESPanel':
+        """
+        Ingest supersector series from sm/ce flat files (e.g. sm.data.0.Current, ce.data.0.AllCESSeries)
+
+        Args:
+            paths: One or more tab-separated data files
+            seasonal: 'U' (not seasonally adjusted) or 'S'
+            datatype: CES data type code (01 = all employees)
+            areas: Optional subset of area codes to keep
+            chunksize: Rows per chunk while scanning the files
+
+        Returns:
+            CESPanel
+        """
+        if isinstance(paths, str):
+            paths = [paths]
+        keep_areas = set(areas) if areas is not None else None
+
+        frames = []
+        for path in paths:
+            print(f"📂 Reading {os.path.basename(path)}...")
+            reader = pd.read_csv(path, sep='\t', usecols=[0, 1, 2, 3], dtype=str, chunksize=chunksize)
+            for chunk in reader:
+                chunk.columns = [col.strip() for col in chunk.columns]
+                fields = parse_series_ids(chunk['series_id'])
+                wanted = ((fields['seasonal'] == seasonal) & (fields['datatype'] == datatype)
+                          & (fields['industry'] == '000000')).to_numpy()
+                if keep_areas is not None:
+                    wanted &= (fields['area'].isin(keep_areas) | (fields['area'] == NATIONAL_AREA)).to_numpy()
+                if not wanted.any():
+                    continue
+                frames.append(pd.DataFrame({
+                    'area': fields['area'].to_numpy()[wanted],
+                    'supersector': fields['supersector'].to_numpy()[wanted],
+                    'year': chunk['year'].str.strip().to_numpy()[wanted],
+                    'period': chunk['period'].str.strip().to_numpy()[wanted],
+                    'value': chunk['value'].str.strip().to_numpy()[wanted],
+                }))
+
+        if not frames:
+            raise ValueError("No supersector series found in the given files")
+
+        panel = cls.from_long(pd.concat(frames, ignore_index=True))
+        print(f"✅ Built panel with shape {panel.shape}")
+        return panel
+
+    @classmethod
+    def from_api(cls, client, areas: Iterable[str], start_year: int, end_year: int,
+                 supersectors: Iterable[str] = SUPERSECTORS, seasonal: str = 'U',
+                 include_national: bool = True) -> 'CESPanel':
+        """
+        Pull supersector series for the given areas through the BLS API
+
+        Args:
+            client: BLSClient
+            areas: Area codes (state + MSA, e.g. 0631080 for Los Angeles)
+            start_year: Start year (the API serves at most 20 years per request)
+            end_year: End year
+            supersectors: Supersector codes to pull
+            seasonal: 'U' or 'S'
+            include_national: Also pull the national ce series
+
+        Returns:
+            CESPanel
+        """
+        supersectors = list(supersectors)
+        series_ids = [sm_series_id(area, ss, seasonal) for area in areas for ss in supersectors]
+        if include_national:
+            series_ids += [ce_series_id(ss, seasonal) for ss in supersectors]
+
+        frames = []
+        for i in range(0, len(series_ids), API_BATCH_SIZE):
+            batch = series_ids[i:i + API_BATCH_SIZE]
+            print(f"🔍 Fetching series {i + 1}-{i + len(batch)} of {len(series_ids)}")
+            data = client.parse_series_response(client.get_series_data(batch, start_year, end_year))
+            if not data.empty:
+                frames.append(data)
+
+        if not frames:
+            raise ValueError("No data returned from the BLS API")
+
+        data = pd.concat(frames, ignore_index=True)
+        fields = parse_series_ids(data['series_id'])
+        data['area'] = fields['area'].to_numpy()
+        data['supersector'] = fields['supersector'].to_numpy()
+        return cls.from_long(data)
+
+    def save(self, path: str):
+        """Persist the cube (values.npy) and its axes (axes.npz) under a directory"""
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, VALUES_FILE), np.ascontiguousarray(self.values, dtype=np.float32))
+        np.savez(os.path.join(path, AXES_FILE), areas=self.areas, supersectors=self.supersectors,
+                 months=self.months)
+        print(f"💾 Saved panel {self.shape} to {path}")
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'CESPanel':
+        """
+        Load a saved panel
+
+        Args:
+            path: Directory written by save()
+            mmap: Memory-map the cube read-only instead of reading it into memory
+
+        Returns:
+            CESPanel
+        """
+        values = np.load(os.path.join(path, VALUES_FILE), mmap_mode='r' if mmap else None)
+        with np.load(os.path.join(path, AXES_FILE)) as axes:
+            return cls(values, axes['areas'], axes['supersectors'], axes['months'])
+
+    def area_index(self, area: str) -> int:
+        """Position of an area code on axis 0"""
+        return self._area_pos[str(area)]
+
+    def supersector_index(self, supersector: str) -> int:
+        """Position of a supersector code on axis 1"""
+        return self._supersector_pos[str(supersector)]
+
+    def dates(self) -> pd.DatetimeIndex:
+        """Month axis as timestamps (for presentation only)"""
+        return to_datetime(self.months)
+
+    def series(self, area: str, supersector: str) -> pd.Series:
+        """One area/supersector series indexed by date"""
+        values = self.values[self.area_index(area), self.supersector_index(supersector)]
+        return pd.Series(np.asarray(values, dtype=float), index=self.dates())
+
+    def concentration_ratios(self, national_area: str = NATIONAL_AREA) -> np.ndarray:
+        """(area x supersector x month) area employment as a percent of national employment"""
+        national = self.values[self.area_index(national_area)]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.values / national[None] * 100
+
+    def location_quotients(self, national_area: str = NATIONAL_AREA, total_supersector: str = "00") -> np.ndarray:
+        """(area x supersector x month) LQs of each supersector against total nonfarm"""
+        total = self.values[:, [self.supersector_index(total_supersector)], :]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            shares = self.values / total
+            lq = shares / shares[self.area_index(national_area)][None]
+        lq[~np.isfinite(lq)] = np.nan
+        return lq
+
+    def to_frame(self, areas: Optional[List[str]] = None) -> pd.DataFrame:
+        """Long (area, supersector, date, employment) table, optionally for a subset of areas"""
+        area_idx = (np.arange(len(self.areas)) if areas is None
+                    else np.array([self.area_index(area) for area in areas]))
+        cube = np.asarray(self.values[area_idx], dtype=float)
+        n_areas, n_sectors, n_months = cube.shape
+        return pd.DataFrame({
+            'area': np.repeat(self.areas[area_idx], n_sectors * n_months),
+            'supersector': np.tile(np.repeat(self.supersectors, n_months), n_areas),
+            'date': np.tile(np.asarray(self.dates()), n_areas * n_sectors),
+            'employment': cube.ravel(),
+        })
@@ -0,0 +1,231 @@
+"""
+Headless chart rendering with cached outputs
+
+matplotlib is imported lazily on first render and always uses the
+non-interactive Agg backend, so scripts that never draw a chart do not pay
+its import cost and batch runs never block on a window. Charts are drawn from
+precomputed aggregates by a draw(fig, axes, *data) callable; a sidecar
+<output>.sha256 file stores a hash of those inputs and the render is skipped
+when it is unchanged.
+
+render_batch fans thousands of small charts (per-occupation or per-metro LQ
+trajectories, change bars) out to a process pool. Each worker reuses one
+figure template and writes straight to files.
+"""
+
+import os
+import time
+import hashlib
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+STYLE = 'seaborn-v0_8'
+DEFAULT_DPI = 300
+HASH_SUFFIX = '.sha256'
+
+_pyplot = None
+
+
+def get_pyplot():
+    """Import matplotlib.pyplot with the Agg backend on first use"""
+    global _pyplot
+    if _pyplot is None:
+        import matplotlib
+        matplotlib.use('Agg', force=True)
+        import matplotlib.pyplot as plt
+        _pyplot = plt
+    return _pyplot
+
+
+def data_hash(*parts) -> str:
+    """
+    Stable hash of the inputs a chart is drawn from
+
+    Args:
+        *parts: DataFrames, Series, arrays or plain values (lists, strings, numbers)
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, (pd.DataFrame, pd.Series)):
+            labels = list(part.columns) if isinstance(part, pd.DataFrame) else [part.name]
+            digest.update(repr(labels).encode())
+            digest.update(pd.util.hash_pandas_object(part, index=True).to_numpy().tobytes())
+        elif isinstance(part, np.ndarray):
+            digest.update(f"{part.dtype}{part.shape}".encode())
+            digest.update(np.ascontiguousarray(part).tobytes())
+        else:
+            digest.update(repr(part).encode())
+    return digest.hexdigest()
+
+
+def is_up_to_date(output_file: str, key: str) -> bool:
+    """Check whether output_file was rendered from inputs with the given hash"""
+    hash_file = output_file + HASH_SUFFIX
+    if not (os.path.exists(output_file) and os.path.exists(hash_file)):
+        return False
+    with open(hash_file) as f:
+        return f.read().strip() == key
+
+
+def code_fingerprint(code) -> Tuple:
+    """Bytecode, constants and names of a function's code, with nested code objects expanded"""
+    if code is None:
+        return ()
+    consts = tuple(code_fingerprint(const) if hasattr(const, 'co_code') else const
+                   for const in code.co_consts)
+    return (code.co_code, consts, code.co_names)
+
+
+def render_key(draw: Callable, data: Tuple, figsize, dpi, nrows, ncols, style, title=None) -> str:
+    """Hash of the chart inputs, the draw function (code, constants, names) and the figure settings"""
+    draw_id = (getattr(draw, '__qualname__', repr(draw)), code_fingerprint(getattr(draw, '__code__', None)))
+    return data_hash(draw_id, figsize, dpi, nrows, ncols, style, title, *data)
+
+
+def render_chart(output_file: str, draw: Callable, *data, nrows: int = 1, ncols: int = 1,
+                 figsize: Tuple[float, float] = (16, 12), dpi: int = DEFAULT_DPI,
+                 style: Optional[str] = STYLE, title: Optional[str] = None, force: bool = False) -> bool:
+    """
+    Render a chart to a file unless its inputs are unchanged
+
+    Args:
+        output_file: Image path (format from the extension)
+        draw: Callable draw(fig, axes, *data) that only plots precomputed data
+        *data: Aggregates passed to draw; also hashed for the cache check
+        nrows: Subplot rows
+        ncols: Subplot columns
+        figsize: Figure size in inches
+        dpi: Output resolution
+        style: matplotlib style applied only while this chart is drawn
+        title: Optional figure title
+        force: Render even when the cached output is up to date
+
+    Returns:
+        True if the chart was rendered, False if the cached file was kept
+    """
+    key = render_key(draw, data, figsize, dpi, nrows, ncols, style, title)
+    if not force and is_up_to_date(output_file, key):
+        print(f"⏭️  {output_file} is up to date, skipping render")
+        return False
+
+    plt = get_pyplot()
+    with plt.style.context(style or 'default'):
+        fig, axes = plt.subplots(nrows, ncols, figsize=figsize)
+        try:
+            if title:
+                fig.suptitle(title, fontsize=16, fontweight='bold')
+            draw(fig, axes, *data)
+            fig.tight_layout()
+            fig.savefig(output_file, dpi=dpi, bbox_inches='tight')
+        finally:
+            plt.close(fig)
+
+    with open(output_file + HASH_SUFFIX, 'w') as f:
+        f.write(key)
+    return True
+
+
+def render_batch(jobs: Sequence[Tuple[str, Tuple]], draw: Callable, output_dir: str, fmt: str = 'png',
+                 nrows: int = 1, ncols: int = 1, figsize: Tuple[float, float] = (6, 4), dpi: int = 100,
+                 style: Optional[str] = STYLE, workers: Optional[int] = None, force: bool = False) -> Dict[str, float]:
+    """
+    Render many small charts in parallel
+
+    Args:
+        jobs: Sequence of (name, data) where data is the tuple passed to
+            draw(fig, axes, *data); the chart is written to output_dir/name.fmt
+        draw: Module-level draw function (it is pickled to the workers) that
+            only draws on the given axes
+        output_dir: Directory for the images
+        fmt: Image format / extension
+        nrows: Subplot rows of the template
+        ncols: Subplot columns of the template
+        figsize: Figure size in inches
+        dpi: Output resolution
+        style: matplotlib style used by the workers
+        workers: Number of worker processes (defaults to the CPU count)
+        force: Render even when cached outputs are up to date
+
+    Returns:
+        Dictionary with rendered, skipped, seconds and figures_per_second
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    start = time.perf_counter()
+
+    # Cache check in the parent so unchanged charts never reach a worker
+    pending = []
+    for name, data in jobs:
+        output_file = os.path.join(output_dir, f"{name}.{fmt}")
+        key = render_key(draw, tuple(data), figsize, dpi, nrows, ncols, style)
+        if force or not is_up_to_date(output_file, key):
+            pending.append((output_file, tuple(data), key))
+    skipped = len(jobs) - len(pending)
+
+    rendered = 0
+    if pending:
+        workers = max(1, min(workers or os.cpu_count() or 1, len(pending)))
+        settings = {'nrows': nrows, 'ncols': ncols, 'figsize': figsize, 'dpi': dpi, 'style': style}
+        # One chunk per worker so each template is reused across many figures
+        chunks = [pending[i::workers] for i in range(workers)]
+        if workers == 1:
+            rendered = _render_chunk(draw, chunks[0], settings)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(_render_chunk, draw, chunk, settings) for chunk in chunks]
+                rendered = sum(future.result() for future in futures)
+
+    seconds = time.perf_counter() - start
+    rate = rendered / seconds if rendered and seconds > 0 else 0.0
+    print(f"🖼️  Rendered {rendered} figures ({skipped} up to date) in {seconds:.1f}s - {rate:.1f} figures/sec")
+
+    return {'rendered': rendered, 'skipped': skipped, 'seconds': seconds, 'figures_per_second': rate}
+
+
+def _render_chunk(draw: Callable, chunk: List[Tuple[str, Tuple, str]], settings: Dict) -> int:
+    """Render a list of charts on one reused figure template (runs in a worker)"""
+    plt = get_pyplot()
+    with plt.style.context(settings['style'] or 'default'):
+        fig, axes = plt.subplots(settings['nrows'], settings['ncols'], figsize=settings['figsize'])
+        template_axes = list(np.atleast_1d(axes).ravel())
+        try:
+            for output_file, data, key in chunk:
+                # Reset the template instead of building a new figure
+                for ax in fig.axes:
+                    if ax not in template_axes:
+                        ax.remove()
+                for ax in template_axes:
+                    ax.clear()
+                fig.texts.clear()
+                fig.suptitle('')
+
+                draw(fig, axes, *data)
+                fig.savefig(output_file, dpi=settings['dpi'])
+                with open(output_file + HASH_SUFFIX, 'w') as f:
+                    f.write(key)
+        finally:
+            plt.close(fig)
+    return len(chunk)
+
+
+def draw_lq_trajectory(fig, ax, title, dates, location_quotients):
+    """Single LQ trajectory with the LQ = 1 reference line"""
+    ax.plot(dates, location_quotients, linewidth=2)
+    ax.axhline(y=1, color='black', linestyle='--', alpha=0.5)
+    ax.set_title(title)
+    ax.set_ylabel('Location Quotient')
+    ax.grid(True, alpha=0.3)
+
+
+def draw_change_bars(fig, ax, title, labels, changes):
+    """Horizontal bars of LQ (or concentration) changes, green up / red down"""
+    changes = np.asarray(changes, dtype=float)
+    ax.barh(range(len(changes)), changes, color=np.where(changes > 0, 'green', 'red'), alpha=0.7)
+    ax.set_yticks(range(len(changes)))
+    ax.set_yticklabels(labels, fontsize=8)
+    ax.axvline(x=0, color='black', linestyle='-', alpha=0.5)
+    ax.set_title(title)
@@ -6,6 +6,9 @@ Analyze changes in Los Angeles location quotients over time
 
 import pandas as pd
 import os
+from lq_ranking import rank_top_k, format_rank_rows, print_rank_table
+from oes_store import ResultStore, load_table
+from lq_significance import add_change_significance, find_rse_column
 
 def load_2019_data():
     """Load 2019 data"""
@@ -24,15 +27,15 @@ def load_2019_data():
         return None
 
 def load_2024_data():
-    """Load 2024 data"""
+    """Load 2024 data (typed store partition, falling back to the legacy CSV)"""
     data_file = "oes_data/la_oes_cleaned_data.csv"
     
-    if not os.path.exists(data_file):
-        print(f"❌ 2024 data file not found: {data_file}")
-        return None
-    
     try:
-        df = pd.read_csv(data_file)
+        df = load_table("la_oes_cleaned_data", csv_path=data_file, area="31080", year=2024)
+        if df is None or df.empty:
+            print(f"❌ 2024 data not found in oes_data/store/ or {data_file}")
+            return None
+        
         print(f"✅ Loaded 2024 data: {df.shape}")
         return df
     except Exception as e:
@@ -83,6 +86,9 @@ def find_matching_occupations(df_2019, df_2024):
         
         print(f"📊 Common occupations found: {len(common_occupations)}")
         
+        rse_col_2019 = find_rse_column(df_2019.columns)
+        rse_col_2024 = find_rse_column(df_2024.columns)
+        
         # Create merged dataset
         merged_data = []
         
@@ -96,13 +102,20 @@ def find_matching_occupations(df_2019, df_2024):
                 lq_2024 = row_2024['Location Quotient  ()'].iloc[0]
                 
                 if pd.notna(lq_2019) and pd.notna(lq_2024):
-                    merged_data.append({
+                    record = {
                         'Occupation': occupation.title(),
                         'LQ_2019': lq_2019,
                         'LQ_2024': lq_2024,
                         'Change': lq_2024 - lq_2019,
                         'Percent_Change': ((lq_2024 - lq_2019) / lq_2019) * 100 if lq_2019 > 0 else 0
-                    })
+                    }
+                    
+                    # Carry employment RSEs when both tables publish them
+                    if rse_col_2019 and rse_col_2024:
+                        record['RSE_2019'] = row_2019[rse_col_2019].iloc[0]
+                        record['RSE_2024'] = row_2024[rse_col_2024].iloc[0]
+                    
+                    merged_data.append(record)
         
         merged_df = pd.DataFrame(merged_data)
         print(f"📊 Merged dataset: {len(merged_df)} occupations")
@@ -130,35 +143,45 @@ def analyze_changes(merged_df):
         print(f"📈 Mean change: {merged_df['Change'].mean():.3f}")
         print(f"📈 Mean percent change: {merged_df['Percent_Change'].mean():.1f}%")
         
-        # Biggest increases
-        print(f"\n🚀 TOP 10 BIGGEST INCREASES (2019-2024):")
-        print("-" * 70)
-        print(f"{'Rank':<4} {'Occupation':<40} {'2019':<8} {'2024':<8} {'Change':<8} {'% Change':<10}")
-        print("-" * 70)
+        # Rank increases, decreases and percentage changes in one partial-selection pass
+        rankings = rank_top_k(merged_df, {
+            'increases': ('Change', 'largest'),
+            'decreases': ('Change', 'smallest'),
+            'percent': ('Percent_Change', 'largest'),
+        }, k=10)
+        
+        header = f"{'Rank':<4} {'Occupation':<40} {'2019':<8} {'2024':<8} {'Change':<8} {'% Change':<10}"
+        table_columns = [
+            ('Occupation', '<40.39'),
+            ('LQ_2019', '<8.3f'),
+            ('LQ_2024', '<8.3f'),
+            ('Change', '<8.3f'),
+            ('Percent_Change', lambda v: f"{v:<9.1f}%"),
+        ]
         
-        biggest_increases = merged_df.nlargest(10, 'Change')
-        for i, (_, row) in enumerate(biggest_increases.iterrows(), 1):
-            print(f"{i:<4} {row['Occupation'][:39]:<40} {row['LQ_2019']:<8.3f} {row['LQ_2024']:<8.3f} {row['Change']:<8.3f} {row['Percent_Change']:<9.1f}%")
+        # Biggest increases
+        print_rank_table(f"\n🚀 TOP 10 BIGGEST INCREASES (2019-2024):", header,
+                         format_rank_rows(merged_df, rankings['increases'], table_columns))
         
         # Biggest decreases
-        print(f"\n📉 TOP 10 BIGGEST DECREASES (2019-2024):")
-        print("-" * 70)
-        print(f"{'Rank':<4} {'Occupation':<40} {'2019':<8} {'2024':<8} {'Change':<8} {'% Change':<10}")
-        print("-" * 70)
-        
-        biggest_decreases = merged_df.nsmallest(10, 'Change')
-        for i, (_, row) in enumerate(biggest_decreases.iterrows(), 1):
-            print(f"{i:<4} {row['Occupation'][:39]:<40} {row['LQ_2019']:<8.3f} {row['LQ_2024']:<8.3f} {row['Change']:<8.3f} {row['Percent_Change']:<9.1f}%")
+        print_rank_table(f"\n📉 TOP 10 BIGGEST DECREASES (2019-2024):", header,
+                         format_rank_rows(merged_df, rankings['decreases'], table_columns))
         
         # Biggest percentage changes
-        print(f"\n📊 TOP 10 BIGGEST PERCENTAGE CHANGES (2019-2024):")
-        print("-" * 70)
-        print(f"{'Rank':<4} {'Occupation':<40} {'2019':<8} {'2024':<8} {'Change':<8} {'% Change':<10}")
-        print("-" * 70)
+        print_rank_table(f"\n📊 TOP 10 BIGGEST PERCENTAGE CHANGES (2019-2024):", header,
+                         format_rank_rows(merged_df, rankings['percent'], table_columns))
         
-        biggest_percent_changes = merged_df.nlargest(10, 'Percent_Change')
-        for i, (_, row) in enumerate(biggest_percent_changes.iterrows(), 1):
-            print(f"{i:<4} {row['Occupation'][:39]:<40} {row['LQ_2019']:<8.3f} {row['LQ_2024']:<8.3f} {row['Change']:<8.3f} {row['Percent_Change']:<9.1f}%")
+        # Sampling-error check: rank by z-score so small noisy occupations don't dominate
+        if 'RSE_2019' in merged_df.columns and 'RSE_2024' in merged_df.columns:
+            merged_df = add_change_significance(merged_df, ('LQ_2019', 'LQ_2024'), ('RSE_2019', 'RSE_2024'))
+            
+            print(f"\n🎯 STATISTICALLY SIGNIFICANT CHANGES (|z| ≥ 1.96): "
+                  f"{int(merged_df['significant'].sum())} of {merged_df['z_score'].notna().sum()} with RSEs")
+            z_columns = table_columns[:4] + [('z_score', '<+8.2f')]
+            z_header = f"{'Rank':<4} {'Occupation':<40} {'2019':<8} {'2024':<8} {'Change':<8} {'z':<8}"
+            top_z = rank_top_k(merged_df, {'z': ('z_score', 'abs')}, k=10)['z']
+            print_rank_table(f"\n📐 TOP 10 CHANGES BY Z-SCORE (2019-2024):", z_header,
+                             format_rank_rows(merged_df, top_z, z_columns))
         
         # Summary statistics
         print(f"\n📈 CHANGE SUMMARY:")
@@ -172,10 +195,11 @@ def analyze_changes(merged_df):
         print(f"   Occupations with decreased LQ: {len(decreased)} ({len(decreased)/len(merged_df)*100:.1f}%)")
         print(f"   Occupations with no change: {len(no_change)} ({len(no_change)/len(merged_df)*100:.1f}%)")
         
-        # Save results
-        output_file = "oes_data/la_location_quotient_comparison_2019_2024.csv"
-        merged_df.to_csv(output_file, index=False)
-        print(f"\n💾 Comparison results saved to {output_file}")
+        # Save results (Parquet partitioned by area; CSV only when export is enabled)
+        store = ResultStore()
+        store.write(merged_df, "la_location_quotient_comparison_2019_2024", area="31080",
+                    csv_path="oes_data/la_location_quotient_comparison_2019_2024.csv")
+        print(f"\n💾 Comparison results saved to {store.table_dir('la_location_quotient_comparison_2019_2024')}")
         
         return merged_df
         
@@ -217,7 +241,7 @@ def main():
         if results is not None:
             print(f"\n✅ Comparison completed successfully!")
             print(f"📊 Compared {len(results)} occupations")
-            print(f"📁 Results saved to oes_data/la_location_quotient_comparison_2019_2024.csv")
+            print(f"📁 Results saved to oes_data/store/la_location_quotient_comparison_2019_2024/")
             
         else:
             print("\n❌ Comparison failed")
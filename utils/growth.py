@@ -0,0 +1,103 @@
+"""
+Vectorized growth rates for many time series
+
+Sorts a long (series, month, value) table once, takes typed first/last values
+per series from group boundaries, and looks up values at fixed horizons
+(1, 5, 10 years back from each series' latest month) with one searchsorted
+over the sorted keys. Thousands of series are handled in a single pass.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional
+
+# Horizon name -> months back from the latest observation
+DEFAULT_HORIZONS = {
+    '1y': 12,
+    '5y': 60,
+    '10y': 120,
+}
+
+
+def _sorted_series(df: pd.DataFrame, key_col: str, time_col: str, value_col: str):
+    """Factorize keys, coerce values and sort by (key, time) once"""
+    key_idx, keys = pd.factorize(df[key_col], sort=False)
+    times = df[time_col].to_numpy(dtype=np.int64)
+    values = pd.to_numeric(df[value_col], errors='coerce').to_numpy(dtype=float)
+
+    # Missing values never serve as endpoints
+    keep = (key_idx >= 0) & ~np.isnan(values)
+    key_idx, times, values = key_idx[keep], times[keep], values[keep]
+
+    order = np.lexsort((times, key_idx))
+    return keys, key_idx[order], times[order], values[order]
+
+
+def latest_values(df: pd.DataFrame, key_col: str, time_col: str, value_col: str) -> pd.Series:
+    """Most recent numeric value of each series (by time, not row order)"""
+    keys, key_idx, times, values = _sorted_series(df, key_col, time_col, value_col)
+    if len(key_idx) == 0:
+        return pd.Series(dtype=float)
+    last = np.flatnonzero(np.r_[key_idx[1:] != key_idx[:-1], True])
+    return pd.Series(values[last], index=pd.Index(keys[key_idx[last]], name=key_col))
+
+
+def growth_rates(df: pd.DataFrame, key_col: str, time_col: str, value_col: str,
+                 horizons: Optional[Dict[str, int]] = None, cagr: bool = True) -> pd.DataFrame:
+    """
+    Growth rates for every series in a long table
+
+    Args:
+        df: Long table with one row per series and period
+        key_col: Series key column (e.g. series_id or description)
+        time_col: Integer month index column (bls_periods time index)
+        value_col: Value column (numbers or numeric strings)
+        horizons: Mapping of name -> months back from the latest observation
+            (defaults to 1y/5y/10y); a series without an observation exactly
+            that far back gets NaN
+        cagr: Also compute the compound annual growth rate over the full span
+
+    Returns:
+        DataFrame indexed like the unique keys with start_time, end_time,
+        start_value, end_value, growth_rate (full span, %), growth_<horizon>
+        (%) and cagr (%)
+    """
+    horizons = DEFAULT_HORIZONS if horizons is None else horizons
+    keys, key_idx, times, values = _sorted_series(df, key_col, time_col, value_col)
+    if len(key_idx) == 0:
+        return pd.DataFrame()
+
+    # Group boundaries of the sorted keys give typed first/last values directly
+    boundary = np.r_[True, key_idx[1:] != key_idx[:-1]]
+    first = np.flatnonzero(boundary)
+    last = np.r_[first[1:] - 1, len(key_idx) - 1]
+
+    start_value, end_value = values[first], values[last]
+    start_time, end_time = times[first], times[last]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = pd.DataFrame({
+            key_col: keys[key_idx[first]],
+            'start_time': start_time,
+            'end_time': end_time,
+            'start_value': start_value,
+            'end_value': end_value,
+            'growth_rate': np.where(start_value != 0, (end_value - start_value) / start_value * 100, np.nan),
+        })
+
+        # Composite (key, time) codes are sorted, so one searchsorted finds every horizon value
+        span = int(times.max() - times.min()) + 1
+        composite = key_idx.astype(np.int64) * span + (times - times.min())
+        for name, months in horizons.items():
+            target = key_idx[last].astype(np.int64) * span + (end_time - months - times.min())
+            pos = np.clip(np.searchsorted(composite, target), 0, len(composite) - 1)
+            found = (composite[pos] == target) & (end_time - months >= times.min())
+            base = np.where(found, values[pos], np.nan)
+            result[f'growth_{name}'] = np.where(base != 0, (end_value - base) / base * 100, np.nan)
+
+        if cagr:
+            years = (end_time - start_time) / 12
+            ratio = end_value / start_value
+            result['cagr'] = np.where((years > 0) & (ratio > 0), (ratio ** (1 / years) - 1) * 100, np.nan)
+
+    return result.reset_index(drop=True)
@@ -0,0 +1,151 @@
+"""
+Location quotient engine for raw employment counts
+
+Computes LQ = (e_ia / e_a) / (E_i / E) for every area and occupation (or
+industry) at once with NumPy broadcasting over an (area x occupation)
+employment matrix, so LQs can be built for custom regions and vintages without
+API calls. Suppressed cells are masked and propagate as NaN.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Optional, Sequence, Tuple
+
+# OES/QCEW markers for suppressed or unavailable estimates
+SUPPRESSION_MARKERS = ('*', '**', '#', '-', '(8)', '(5)', '~', 'N/A', '')
+
+
+def parse_employment(values, markers: Sequence[str] = SUPPRESSION_MARKERS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert published employment values to floats and a suppression mask
+
+    Args:
+        values: Array-like of numbers or published strings ("1,230", "**", ...)
+        markers: Strings that mark suppressed estimates
+
+    Returns:
+        Tuple of (float array with NaN for suppressed cells, boolean suppression mask)
+    """
+    series = pd.Series(np.asarray(values).ravel())
+    if series.dtype == object or pd.api.types.is_string_dtype(series):
+        text = series.astype('string').str.strip()
+        series = pd.to_numeric(text.str.replace(',', '', regex=False).where(~text.isin(markers)),
+                               errors='coerce')
+    values_out = series.to_numpy(dtype=float).reshape(np.shape(values))
+    return values_out, np.isnan(values_out)
+
+
+def compute_location_quotients(employment: np.ndarray,
+                               area_totals: Optional[np.ndarray] = None,
+                               national: Optional[np.ndarray] = None,
+                               national_total: Optional[float] = None,
+                               mask: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Compute location quotients for all areas and occupations at once
+
+    Args:
+        employment: (n_areas, n_occupations) employment matrix e_ia
+        area_totals: (n_areas,) all-occupation employment e_a. Defaults to the
+            row sums of unsuppressed cells (use published totals when available,
+            since detailed occupations do not add up to the total)
+        national: (n_occupations,) national/base employment E_i, or one base
+            per row as (n_areas, n_occupations), e.g. for a monthly panel.
+            Defaults to the column sums over the given areas (a custom-region base)
+        national_total: Base all-occupation employment E, scalar or (n_areas,).
+            Defaults to the sum of national (or of area_totals when national
+            is derived)
+        mask: Boolean (n_areas, n_occupations) array of suppressed cells
+
+    Returns:
+        (n_areas, n_occupations) float array of LQs with NaN where the cell is
+        suppressed or a denominator is zero/missing
+    """
+    e = np.asarray(employment, dtype=float)
+    if e.ndim != 2:
+        raise ValueError(f"employment must be 2-D (areas x occupations), got shape {e.shape}")
+
+    suppressed = np.isnan(e)
+    if mask is not None:
+        suppressed |= np.asarray(mask, dtype=bool)
+    e = np.where(suppressed, np.nan, e)
+
+    if area_totals is None:
+        e_a = np.nansum(e, axis=1)
+    else:
+        e_a = np.asarray(area_totals, dtype=float).reshape(-1)
+
+    if national is None:
+        E_i = np.nansum(e, axis=0)
+        E = np.nansum(e_a) if national_total is None else national_total
+    else:
+        E_i = np.asarray(national, dtype=float)
+        E = np.nansum(E_i, axis=-1) if national_total is None else national_total
+    E = np.asarray(E, dtype=float)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        area_share = e / e_a[:, None]
+        # E_i / E broadcasts for a single base (n_occ,) or one base per row (n_areas, n_occ)
+        base_share = E_i / (E[..., None] if E.ndim else E)
+        lq = area_share / base_share
+
+    lq[~np.isfinite(lq)] = np.nan
+    return lq
+
+
+def location_quotients_from_frame(df: pd.DataFrame,
+                                  area_col: str = 'area',
+                                  occupation_col: str = 'occupation_code',
+                                  employment_col: str = 'employment',
+                                  total_code: Optional[str] = None,
+                                  national_area: Optional[str] = None) -> pd.DataFrame:
+    """
+    Compute LQs from a long (area, occupation, employment) table
+
+    Args:
+        df: Long-format employment table
+        area_col: Area code column
+        occupation_col: Occupation (or industry) code column
+        employment_col: Employment column (numbers or published strings)
+        total_code: Occupation code holding each area's all-occupation total
+            (e.g. '000000' in OES). If absent, totals are row sums
+        national_area: Area code holding the national/base rows (e.g. '0000000').
+            If absent, the base is the sum over all areas in the table
+
+    Returns:
+        Long DataFrame with columns area_col, occupation_col, employment_col and
+        'location_quotient'
+    """
+    values, _ = parse_employment(df[employment_col].to_numpy())
+    long = pd.DataFrame({
+        area_col: df[area_col].astype(str).to_numpy(),
+        occupation_col: df[occupation_col].astype(str).to_numpy(),
+        employment_col: values,
+    })
+
+    # One pivot to the dense (area x occupation) matrix
+    matrix = long.pivot_table(index=area_col, columns=occupation_col, values=employment_col,
+                              aggfunc='first', dropna=False)
+
+    national = national_total = None
+    if national_area is not None and national_area in matrix.index:
+        base = matrix.loc[national_area]
+        matrix = matrix.drop(index=national_area)
+        if total_code is not None and total_code in base.index:
+            national_total = base[total_code]
+            base = base.drop(total_code)
+        national = base
+
+    area_totals = None
+    if total_code is not None and total_code in matrix.columns:
+        area_totals = matrix[total_code].to_numpy(dtype=float)
+        matrix = matrix.drop(columns=total_code)
+
+    if national is not None:
+        national = national.reindex(matrix.columns).to_numpy(dtype=float)
+
+    lq = compute_location_quotients(matrix.to_numpy(dtype=float), area_totals=area_totals,
+                                    national=national, national_total=national_total)
+
+    result = pd.DataFrame(lq, index=matrix.index, columns=matrix.columns).reset_index()
+    result = result.melt(id_vars=area_col, var_name=occupation_col, value_name='location_quotient')
+    return long.merge(result, on=[area_col, occupation_col], how='left')
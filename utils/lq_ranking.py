@@ -0,0 +1,128 @@
+"""
+Top-k ranking helpers for location quotient change tables
+
+Selects the top/bottom k rows for several ranking keys with partial selection
+(np.argpartition) instead of fully sorting the frame once per key, and formats
+the selected rows straight from column arrays.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+# Ranking modes: 'largest', 'smallest', 'abs' (largest absolute value)
+RANK_MODES = ('largest', 'smallest', 'abs')
+
+
+def top_k_indices(values: np.ndarray, k: int, mode: str = 'largest') -> np.ndarray:
+    """
+    Return positions of the top k values, ordered best first
+
+    Args:
+        values: 1-D numeric array (NaNs are never selected)
+        k: Number of positions to return
+        mode: 'largest', 'smallest' or 'abs'
+
+    Returns:
+        Integer array of at most k positions into values
+    """
+    if mode not in RANK_MODES:
+        raise ValueError(f"Unknown rank mode '{mode}'. Use one of {RANK_MODES}")
+
+    values = np.asarray(values, dtype=float)
+    if mode == 'abs':
+        keys = -np.abs(values)
+    elif mode == 'largest':
+        keys = -values
+    else:
+        keys = values
+
+    valid = np.flatnonzero(~np.isnan(keys))
+    k = min(k, len(valid))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+
+    keys = keys[valid]
+    if k < len(keys):
+        # Partial selection: O(n) to find the k best, then sort only those k
+        part = np.argpartition(keys, k - 1)[:k]
+    else:
+        part = np.arange(len(keys))
+    order = part[np.argsort(keys[part], kind='stable')]
+
+    return valid[order]
+
+
+def rank_top_k(df: pd.DataFrame, specs: Dict[str, Tuple[str, str]], k: Union[int, Dict[str, int]] = 10) -> Dict[str, np.ndarray]:
+    """
+    Compute top-k row positions for several ranking keys at once
+
+    Args:
+        df: DataFrame holding the ranking columns
+        specs: Mapping of result name -> (column, mode), e.g.
+            {'abs_change': ('change', 'abs'), 'increases': ('change', 'largest')}
+        k: Rows per ranking, either one int or a per-name mapping
+
+    Returns:
+        Dictionary of result name -> positional index array (use with .iloc / array[idx])
+    """
+    columns = list(dict.fromkeys(column for column, _ in specs.values()))
+    # Extract every ranking column once as a contiguous float block
+    block = df[columns].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+    position = {column: i for i, column in enumerate(columns)}
+
+    rankings = {}
+    for name, (column, mode) in specs.items():
+        limit = k[name] if isinstance(k, dict) else k
+        rankings[name] = top_k_indices(block[:, position[column]], limit, mode)
+
+    return rankings
+
+
+def signed(spec: str, suffix: str = "") -> Callable[[float], str]:
+    """Format a number with a leading '+' for positive values (matches the report tables)"""
+    def _format(value):
+        return ("+" if value > 0 else "") + format(value, spec) + suffix
+    return _format
+
+
+def format_rank_rows(df: pd.DataFrame, indices: np.ndarray, columns: Sequence[Tuple[str, Union[str, Callable]]],
+                     rank_format: Optional[str] = "{:<4} ", start: int = 1) -> List[str]:
+    """
+    Format selected rows as fixed-width report lines
+
+    Args:
+        df: Source DataFrame
+        indices: Positional row indices (e.g. from rank_top_k)
+        columns: Sequence of (column, format) where format is a format spec
+            such as '<50.49' / '<8.2f' or a callable returning the cell text
+        rank_format: Format of the leading rank column (None to omit it)
+        start: First rank number
+
+    Returns:
+        List of formatted lines
+    """
+    # Pull only the selected cells as plain arrays; no per-row Series construction
+    cells = []
+    for column, fmt in columns:
+        values = df[column].to_numpy()[indices]
+        formatter = fmt if callable(fmt) else (lambda v, spec=fmt: format(v, spec))
+        cells.append([formatter(v) for v in values.tolist()])
+
+    lines = []
+    for offset, row in enumerate(zip(*cells)):
+        prefix = rank_format.format(start + offset) if rank_format else ""
+        lines.append(prefix + " ".join(row))
+
+    return lines
+
+
+def print_rank_table(title: str, header: Optional[str], lines: List[str], rule_width: int = 70):
+    """Print a ranked table with the standard title/rule layout"""
+    print(title)
+    print("-" * rule_width)
+    if header:
+        print(header)
+        print("-" * rule_width)
+    for line in lines:
+        print(line)
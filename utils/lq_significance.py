@@ -0,0 +1,193 @@
+"""
+Statistical significance of location quotient changes
+
+OES publishes a percent relative standard error (RSE) for every employment
+estimate. Since area and national totals are far more precise than a single
+occupation cell, the cell RSE dominates the LQ's sampling error:
+
+    SE(LQ) ~= LQ * RSE / 100                       (delta method)
+    SE(LQ_2 - LQ_1) = sqrt(SE_1^2 + SE_2^2 - 2 rho SE_1 SE_2)
+
+All occupations (and metros) are scored at once with array operations; the
+bootstrap variant draws all replicates with one NumPy RNG call per block.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Optional, Sequence, Tuple
+
+# Two-sided 95% critical value
+Z_CRITICAL = 1.96
+
+
+def parse_rse(values) -> np.ndarray:
+    """Convert published RSE values ("12.3", "12.3%", "**") to percent floats"""
+    series = pd.Series(np.asarray(values).ravel())
+    if series.dtype == object or pd.api.types.is_string_dtype(series):
+        series = pd.to_numeric(series.astype('string').str.replace('%', '', regex=False).str.strip(),
+                               errors='coerce')
+    return series.to_numpy(dtype=float).reshape(np.shape(values))
+
+
+def lq_standard_error(lq: np.ndarray, rse: np.ndarray, national_rse: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Delta-method standard error of location quotients
+
+    Args:
+        lq: Location quotients
+        rse: Percent RSE of the area/occupation employment estimate
+        national_rse: Optional percent RSE of the national occupation estimate
+
+    Returns:
+        Standard errors with the same shape as lq
+    """
+    rel_var = (np.asarray(rse, dtype=float) / 100.0) ** 2
+    if national_rse is not None:
+        rel_var = rel_var + (np.asarray(national_rse, dtype=float) / 100.0) ** 2
+    return np.abs(np.asarray(lq, dtype=float)) * np.sqrt(rel_var)
+
+
+def change_significance(lq_start: np.ndarray, lq_end: np.ndarray, rse_start: np.ndarray, rse_end: np.ndarray,
+                        correlation: float = 0.0, z_critical: float = Z_CRITICAL) -> dict:
+    """
+    Delta-method z-scores for LQ changes
+
+    Args:
+        lq_start: LQs in the base year
+        lq_end: LQs in the comparison year
+        rse_start: Percent employment RSEs in the base year
+        rse_end: Percent employment RSEs in the comparison year
+        correlation: Correlation between the two estimates (OES pools three
+            years of panels, so adjacent vintages share samples)
+        z_critical: Critical |z| for the significance flag
+
+    Returns:
+        Dictionary of arrays: change, change_se, z_score, significant
+    """
+    lq_start = np.asarray(lq_start, dtype=float)
+    lq_end = np.asarray(lq_end, dtype=float)
+    se_start = lq_standard_error(lq_start, rse_start)
+    se_end = lq_standard_error(lq_end, rse_end)
+
+    change = lq_end - lq_start
+    variance = se_start ** 2 + se_end ** 2 - 2.0 * correlation * se_start * se_end
+    change_se = np.sqrt(np.clip(variance, 0.0, None))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z_score = np.where(change_se > 0, change / change_se, np.nan)
+
+    return {
+        'change': change,
+        'change_se': change_se,
+        'z_score': z_score,
+        'significant': np.abs(np.nan_to_num(z_score)) >= z_critical,
+    }
+
+
+def bootstrap_change_significance(lq_start: np.ndarray, lq_end: np.ndarray, rse_start: np.ndarray,
+                                  rse_end: np.ndarray, n_draws: int = 2000, seed: Optional[int] = None,
+                                  alpha: float = 0.05, max_cells: int = 8_000_000) -> dict:
+    """
+    Parametric bootstrap of LQ changes from employment RSEs
+
+    Each LQ is perturbed with a lognormal factor whose coefficient of variation
+    equals its RSE. All replicates for a block of occupations come from one
+    standard_normal call of shape (n_draws, 2, n); blocks are sized so a call
+    never exceeds max_cells draws (one block unless the panel is very large).
+
+    Args:
+        lq_start: LQs in the base year
+        lq_end: LQs in the comparison year
+        rse_start: Percent employment RSEs in the base year
+        rse_end: Percent employment RSEs in the comparison year
+        n_draws: Number of bootstrap replicates
+        seed: Optional RNG seed
+        alpha: Two-sided level for the confidence interval and flag
+        max_cells: Upper bound on the size of one block of draws
+
+    Returns:
+        Dictionary of arrays: change, change_se, z_score, ci_low, ci_high,
+        p_value, significant
+    """
+    rng = np.random.default_rng(seed)
+    arrays = [np.asarray(a, dtype=float).ravel() for a in (lq_start, lq_end, rse_start, rse_end)]
+    block = max(1, max_cells // (2 * n_draws))
+
+    starts = range(0, len(arrays[0]), block) or [0]
+    parts = [_bootstrap_block(*(a[i:i + block] for a in arrays), rng=rng, n_draws=n_draws, alpha=alpha)
+             for i in starts]
+
+    shape = np.shape(lq_start)
+    return {key: np.concatenate([part[key] for part in parts]).reshape(shape) for key in parts[0]}
+
+
+def _bootstrap_block(lq_start, lq_end, rse_start, rse_end, rng, n_draws, alpha) -> dict:
+    """Bootstrap one block of occupations with a single RNG call"""
+    lq = np.stack([np.asarray(lq_start, dtype=float), np.asarray(lq_end, dtype=float)])
+    cv = np.stack([np.asarray(rse_start, dtype=float), np.asarray(rse_end, dtype=float)]) / 100.0
+    sigma = np.sqrt(np.log1p(cv ** 2))
+
+    draws = rng.standard_normal((n_draws,) + lq.shape)
+    simulated = lq * np.exp(sigma * draws - 0.5 * sigma ** 2)
+    changes = simulated[:, 1] - simulated[:, 0]
+
+    change = lq[1] - lq[0]
+    change_se = np.std(changes, axis=0, ddof=1)
+    ci_low, ci_high = np.quantile(changes, [alpha / 2, 1 - alpha / 2], axis=0)
+    # Two-sided share of replicates on the other side of zero
+    p_value = 2.0 * np.minimum((changes <= 0).mean(axis=0), (changes >= 0).mean(axis=0))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z_score = np.where(change_se > 0, change / change_se, np.nan)
+
+    valid = ~np.isnan(changes).any(axis=0)
+    return {
+        'change': change,
+        'change_se': np.where(valid, change_se, np.nan),
+        'z_score': np.where(valid, z_score, np.nan),
+        'ci_low': np.where(valid, ci_low, np.nan),
+        'ci_high': np.where(valid, ci_high, np.nan),
+        'p_value': np.where(valid, np.minimum(p_value, 1.0), np.nan),
+        'significant': valid & ((ci_low > 0) | (ci_high < 0)),
+    }
+
+
+def add_change_significance(df: pd.DataFrame, lq_cols: Tuple[str, str], rse_cols: Tuple[str, str],
+                            method: str = 'delta', **kwargs) -> pd.DataFrame:
+    """
+    Append significance columns for LQ changes to a comparison table
+
+    Args:
+        df: Table with one row per occupation (and area)
+        lq_cols: (base year LQ column, comparison year LQ column)
+        rse_cols: (base year RSE column, comparison year RSE column)
+        method: 'delta' or 'bootstrap'
+        **kwargs: Passed to change_significance / bootstrap_change_significance
+
+    Returns:
+        Copy of df with change_se, z_score and significant columns (plus
+        ci_low, ci_high and p_value for the bootstrap)
+    """
+    lq_start = pd.to_numeric(df[lq_cols[0]], errors='coerce').to_numpy(dtype=float)
+    lq_end = pd.to_numeric(df[lq_cols[1]], errors='coerce').to_numpy(dtype=float)
+    rse_start = parse_rse(df[rse_cols[0]].to_numpy())
+    rse_end = parse_rse(df[rse_cols[1]].to_numpy())
+
+    if method == 'delta':
+        stats = change_significance(lq_start, lq_end, rse_start, rse_end, **kwargs)
+    elif method == 'bootstrap':
+        stats = bootstrap_change_significance(lq_start, lq_end, rse_start, rse_end, **kwargs)
+    else:
+        raise ValueError(f"Unknown method '{method}'. Use 'delta' or 'bootstrap'")
+
+    stats.pop('change')
+    return df.assign(**stats)
+
+
+def find_rse_column(columns: Sequence[str]) -> Optional[str]:
+    """Find the employment RSE column in a published OES table"""
+    for col in columns:
+        col_lower = str(col).lower()
+        if ('rse' in col_lower or 'relative standard error' in col_lower) and 'wage' not in col_lower:
+            return col
+    return None
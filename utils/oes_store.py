@@ -0,0 +1,235 @@
+"""
+Columnar result store for analysis outputs
+
+Writes typed Parquet (or Feather for hot intermediates) partitioned by area and
+year, so downstream stages reload tables with their dtypes intact instead of
+re-parsing CSV. CSV export is optional (OES_EXPORT_CSV=1 or export_csv=True).
+"""
+
+import os
+import re
+import glob
+import pandas as pd
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+FORMATS = {
+    'parquet': '.parquet',
+    'feather': '.feather',
+}
+
+DEFAULT_PARTITIONS = ('area', 'year')
+
+# Code columns that must never be coerced to numbers
+TEXT_COLUMNS = ('area', 'area_code', 'occupation_code', 'series_id')
+
+# Headers of identifier columns (OES/SOC/NAICS codes, series ids) that stay text
+CODE_HEADER = re.compile(r'(^|[\s_])(code|id|soc|naics|fips|cbsa)s?($|[\s_])', re.IGNORECASE)
+
+# Zero-padded digit strings ('0012'), whose leading zeros a numeric dtype would drop
+ZERO_PADDED = r'^0\d+$'
+
+
+class ResultStore:
+    """Partitioned Parquet/Feather store for analysis tables"""
+
+    def __init__(self, root: str = os.path.join("oes_data", "store"), fmt: str = 'parquet',
+                 export_csv: Optional[bool] = None):
+        """
+        Initialize result store
+
+        Args:
+            root: Root directory of the store
+            fmt: 'parquet' (default) or 'feather' for hot intermediates
+            export_csv: Also write a flat CSV copy. If not provided, read from
+                the OES_EXPORT_CSV env var
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported format '{fmt}'. Use one of {list(FORMATS)}")
+
+        self.root = root
+        self.fmt = fmt
+        if export_csv is None:
+            export_csv = os.getenv('OES_EXPORT_CSV', '').lower() in ('1', 'true', 'yes')
+        self.export_csv = export_csv
+
+    def table_dir(self, table: str) -> str:
+        """Directory holding all partitions of a table"""
+        return os.path.join(self.root, table)
+
+    def write(self, df: pd.DataFrame, table: str, area: Optional[str] = None, year: Optional[int] = None,
+              partition_cols: Sequence[str] = DEFAULT_PARTITIONS, csv_path: Optional[str] = None,
+              fmt: Optional[str] = None) -> List[str]:
+        """
+        Write a table, replacing the partitions it touches
+
+        Args:
+            df: DataFrame to write
+            table: Table name (directory under the store root)
+            area: Area code for every row; added as a column if missing
+            year: Survey/reference year for every row; added as a column if missing
+            partition_cols: Columns to partition by (those absent from df are skipped)
+            csv_path: Path of the flat CSV copy written when CSV export is enabled
+            fmt: Override the store format for this table
+
+        Returns:
+            List of written file paths
+        """
+        fmt = fmt or self.fmt
+        df = self._with_partition_values(df, area, year)
+        df = normalize_columns(df)
+        partition_cols = [col for col in partition_cols if col in df.columns]
+
+        written = []
+        if partition_cols:
+            groups = df.groupby(partition_cols, sort=False, observed=True, dropna=False)
+            for key, part in groups:
+                key = key if isinstance(key, tuple) else (key,)
+                part_dir = os.path.join(self.table_dir(table),
+                                        *[f"{col}={value}" for col, value in zip(partition_cols, key)])
+                written.append(self._write_part(part, part_dir, fmt))
+        else:
+            written.append(self._write_part(df, self.table_dir(table), fmt))
+
+        if self.export_csv and csv_path:
+            df.to_csv(csv_path, index=False)
+            written.append(csv_path)
+
+        return written
+
+    def read(self, table: str, area: Optional[Union[str, Iterable[str]]] = None,
+             year: Optional[Union[int, Iterable[int]]] = None,
+             columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Read a table, pruning partitions by area and year
+
+        Args:
+            table: Table name
+            area: Area code or list of area codes to load
+            year: Year or list of years to load
+            columns: Optional subset of columns
+
+        Returns:
+            Concatenated DataFrame (empty if nothing matches)
+        """
+        filters = {'area': area, 'year': year}
+        files = []
+        for fmt, ext in FORMATS.items():
+            files.extend((fmt, path) for path in
+                         glob.glob(os.path.join(self.table_dir(table), '**', f'*{ext}'), recursive=True))
+
+        frames = []
+        for fmt, path in sorted(files, key=lambda item: item[1]):
+            if not self._matches(path, filters):
+                continue
+            if fmt == 'parquet':
+                frames.append(pd.read_parquet(path, columns=columns))
+            else:
+                frames.append(pd.read_feather(path, columns=columns))
+
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(frames, ignore_index=True)
+
+    def exists(self, table: str) -> bool:
+        """Check whether any partition of a table has been written"""
+        return os.path.isdir(self.table_dir(table))
+
+    def _write_part(self, df: pd.DataFrame, part_dir: str, fmt: str) -> str:
+        """Write one partition, replacing previous files in it"""
+        os.makedirs(part_dir, exist_ok=True)
+        for ext in FORMATS.values():
+            for old in glob.glob(os.path.join(part_dir, f'part-*{ext}')):
+                os.remove(old)
+
+        path = os.path.join(part_dir, f"part-0{FORMATS[fmt]}")
+        df = df.reset_index(drop=True)
+        if fmt == 'parquet':
+            df.to_parquet(path, index=False)
+        else:
+            df.to_feather(path)
+        return path
+
+    @staticmethod
+    def _with_partition_values(df: pd.DataFrame, area: Optional[str], year: Optional[int]) -> pd.DataFrame:
+        """Attach constant area/year columns when they are not already present"""
+        extra = {}
+        if area is not None and 'area' not in df.columns:
+            extra['area'] = str(area)
+        if year is not None and 'year' not in df.columns:
+            extra['year'] = int(year)
+        return df.assign(**extra) if extra else df
+
+    @staticmethod
+    def _matches(path: str, filters: Dict[str, object]) -> bool:
+        """Check the key=value directories of a partition path against filters"""
+        parts = dict(segment.split('=', 1) for segment in path.split(os.sep) if '=' in segment)
+        for col, wanted in filters.items():
+            if wanted is None:
+                continue
+            # Unpartitioned files (e.g. current-vintage jobs without a year) never match a filter
+            if col not in parts:
+                return False
+            if isinstance(wanted, (str, int)):
+                wanted = [wanted]
+            if parts[col] not in {str(value) for value in wanted}:
+                return False
+        return True
+
+
+def normalize_columns(df: pd.DataFrame, text_cols: Sequence[str] = TEXT_COLUMNS) -> pd.DataFrame:
+    """
+    Make a frame safe for columnar formats
+
+    Column labels become strings, object columns holding only numbers are
+    converted to numeric dtypes and mixed text/number columns become strings,
+    so scraped tables keep a consistent schema across partitions. Code columns
+    (those in text_cols, headers that name a code or id, and columns holding
+    zero-padded values such as '0012') always stay strings.
+    """
+    df = df.copy()
+    df.columns = [str(col) for col in df.columns]
+    for col in df.columns:
+        if not (pd.api.types.is_object_dtype(df[col]) or pd.api.types.is_string_dtype(df[col])):
+            continue
+        if col in text_cols or CODE_HEADER.search(col) or _is_zero_padded(df[col]):
+            df[col] = df[col].astype('string')
+            continue
+        inferred = pd.api.types.infer_dtype(df[col], skipna=True)
+        if inferred in ('integer', 'floating', 'mixed-integer-float', 'decimal'):
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+        elif inferred in ('string', 'mixed', 'mixed-integer'):
+            converted = pd.to_numeric(df[col], errors='coerce')
+            if converted.notna().sum() == df[col].notna().sum():
+                df[col] = converted
+            else:
+                df[col] = df[col].astype('string')
+    return df
+
+
+def _is_zero_padded(series: pd.Series) -> bool:
+    """Check if any value of a text column is a digit string with a leading zero"""
+    values = series.dropna()
+    values = values[values.map(lambda value: isinstance(value, str))]
+    return bool(values.str.strip().str.match(ZERO_PADDED).any())
+
+
+def load_table(table: str, csv_path: Optional[str] = None, store: Optional[ResultStore] = None,
+               **filters) -> Optional[pd.DataFrame]:
+    """
+    Load a table from the store, falling back to a legacy CSV
+
+    Args:
+        table: Table name in the store
+        csv_path: Legacy CSV path used when the table has not been stored yet
+        store: Store to read from (defaults to ResultStore())
+        **filters: area/year/columns filters passed to ResultStore.read
+
+    Returns:
+        DataFrame, or None when neither source exists
+    """
+    store = store or ResultStore()
+    if store.exists(table):
+        return store.read(table, **filters)
+    if csv_path and os.path.exists(csv_path):
+        return pd.read_csv(csv_path)
+    return None
@@ -8,6 +8,9 @@ import pandas as pd
 import os
 from io import StringIO
 import re
+from lq_ranking import rank_top_k, format_rank_rows, print_rank_table
+from oes_store import ResultStore
+from soc_rollup import rollup_frame
 
 def process_extracted_html():
     """Process the extracted HTML data"""
@@ -52,10 +55,11 @@ def process_extracted_html():
         cleaned_table = clean_oes_data(main_table)
         
         if cleaned_table is not None:
-            # Save the cleaned data
-            output_file = os.path.join("oes_data", "la_oes_cleaned_data.csv")
-            cleaned_table.to_csv(output_file, index=False)
-            print(f"💾 Cleaned data saved to {output_file}")
+            # Save the cleaned data (Parquet partitioned by area/year; CSV only when export is enabled)
+            store = ResultStore()
+            store.write(cleaned_table, "la_oes_cleaned_data", area="31080", year=2024,
+                        csv_path=os.path.join("oes_data", "la_oes_cleaned_data.csv"))
+            print(f"💾 Cleaned data saved to {store.table_dir('la_oes_cleaned_data')}")
             
             # Analyze the data
             analyze_oes_data(cleaned_table)
@@ -164,25 +168,25 @@ def analyze_oes_data(df):
         print(f"   Max: {lq_stats['max']:.3f}")
         print(f"   Std: {lq_stats['std']:.3f}")
         
-        # Find highest LQ occupations
-        print(f"\n🏆 TOP 10 HIGHEST LOCATION QUOTIENTS:")
-        print("-" * 60)
+        # Find highest and lowest LQ occupations in one partial-selection pass
+        rankings = rank_top_k(df, {
+            'highest': (lq_col, 'largest'),
+            'lowest': (lq_col, 'smallest'),
+        }, k=10)
         
-        top_lq = df.nlargest(10, lq_col)
-        for i, (_, row) in enumerate(top_lq.iterrows(), 1):
-            occupation = str(row.iloc[0])[:50]  # First column should be occupation
-            lq_value = row[lq_col]
-            print(f"{i:2d}. {occupation:<50} LQ: {lq_value:.3f}")
+        # First column should be occupation
+        table_columns = [
+            (df.columns[0], lambda v: f"{str(v)[:50]:<50}"),
+            (lq_col, lambda v: f"LQ: {v:.3f}"),
+        ]
         
-        # Find lowest LQ occupations
-        print(f"\n📉 TOP 10 LOWEST LOCATION QUOTIENTS:")
-        print("-" * 60)
+        print_rank_table(f"\n🏆 TOP 10 HIGHEST LOCATION QUOTIENTS:", None,
+                         format_rank_rows(df, rankings['highest'], table_columns, rank_format="{:2d}. "),
+                         rule_width=60)
         
-        bottom_lq = df.nsmallest(10, lq_col)
-        for i, (_, row) in enumerate(bottom_lq.iterrows(), 1):
-            occupation = str(row.iloc[0])[:50]  # First column should be occupation
-            lq_value = row[lq_col]
-            print(f"{i:2d}. {occupation:<50} LQ: {lq_value:.3f}")
+        print_rank_table(f"\n📉 TOP 10 LOWEST LOCATION QUOTIENTS:", None,
+                         format_rank_rows(df, rankings['lowest'], table_columns, rank_format="{:2d}. "),
+                         rule_width=60)
         
         # Analyze by LQ categories
         print(f"\n📊 LOCATION QUOTIENT DISTRIBUTION:")
@@ -199,7 +203,6 @@ def analyze_oes_data(df):
         print(f"   Low concentration (LQ ≤ 0.5): {len(low_concentration)} occupations")
         
         # Save analysis results
-        analysis_file = os.path.join("oes_data", "la_oes_analysis_results.csv")
         
         # Create analysis summary
         analysis_summary = pd.DataFrame({
@@ -210,12 +213,62 @@ def analyze_oes_data(df):
                      lq_stats['mean'], lq_stats['50%']]
         })
         
-        analysis_summary.to_csv(analysis_file, index=False)
-        print(f"\n💾 Analysis results saved to {analysis_file}")
+        store = ResultStore()
+        store.write(analysis_summary, "la_oes_analysis_results", area="31080", year=2024,
+                    csv_path=os.path.join("oes_data", "la_oes_analysis_results.csv"))
+        print(f"\n💾 Analysis results saved to {store.table_dir('la_oes_analysis_results')}")
         
     except Exception as e:
         print(f"❌ Error analyzing data: {e}")
 
+def analyze_soc_groups(df):
+    """Roll detailed occupations up to SOC major groups and the custom groupings"""
+    print("\n🧩 SOC GROUP ROLLUP")
+    print("=" * 50)
+    
+    if df is None or df.empty:
+        print("❌ No data for rollup")
+        return None
+    
+    # Find key columns
+    occupation_col = 'Occupation (SOC code)' if 'Occupation (SOC code)' in df.columns else None
+    lq_col = None
+    employment_col = None
+    
+    for col in df.columns:
+        col_lower = col.lower()
+        if occupation_col is None and 'occupation' in col_lower:
+            occupation_col = col
+        elif lq_col is None and 'location quotient' in col_lower:
+            lq_col = col
+        elif (employment_col is None and 'employment' in col_lower
+              and not any(term in col_lower for term in ('percent', 'per 1,000', 'rse'))):
+            employment_col = col
+    
+    if not all([occupation_col, employment_col]):
+        print("❌ Occupation or employment column not found")
+        return None
+    
+    try:
+        # One sparse matrix product gives every group's employment and employment-weighted LQ
+        groups = rollup_frame(df.assign(area="31080"), occupation_col=occupation_col,
+                              employment_col=employment_col, lq_col=lq_col, levels=('major',))
+        groups = groups[groups['reported'] > 0].sort_values('employment', ascending=False)
+        
+        for _, row in groups.iterrows():
+            lq_text = f"LQ: {row['weighted_lq']:.3f}" if lq_col and pd.notna(row['weighted_lq']) else ""
+            print(f"   {row['group']:<30} {row['employment']:>12,.0f} ({int(row['reported'])} occupations) {lq_text}")
+        
+        store = ResultStore()
+        store.write(groups, "la_oes_soc_groups", area="31080", year=2024,
+                    csv_path=os.path.join("oes_data", "la_oes_soc_groups.csv"))
+        print(f"💾 SOC group rollup saved to {store.table_dir('la_oes_soc_groups')}")
+        return groups
+        
+    except Exception as e:
+        print(f"❌ Error rolling up SOC groups: {e}")
+        return None
+
 def create_location_quotient_report(df):
     """Create a comprehensive location quotient report"""
     print("\n📋 CREATING LOCATION QUOTIENT REPORT")
@@ -275,9 +328,10 @@ def create_location_quotient_report(df):
     report_df = pd.DataFrame(report_data)
     
     # Save report
-    report_file = os.path.join("oes_data", "la_location_quotient_report.csv")
-    report_df.to_csv(report_file, index=False)
-    print(f"💾 Location quotient report saved to {report_file}")
+    store = ResultStore()
+    store.write(report_df, "la_location_quotient_report", area="31080", year=2024,
+                csv_path=os.path.join("oes_data", "la_location_quotient_report.csv"))
+    print(f"💾 Location quotient report saved to {store.table_dir('la_location_quotient_report')}")
     
     # Print summary
     print(f"\n📊 REPORT SUMMARY:")
@@ -300,12 +354,16 @@ def main():
         # Create location quotient report
         report = create_location_quotient_report(data)
         
+        # Group employment and weighted LQs for SOC major groups and entertainment occupations
+        analyze_soc_groups(data)
+        
         print(f"\n✅ Data processing completed successfully!")
         print(f"📊 Processed {len(data)} occupations")
         print(f"📁 Files created:")
-        print(f"   - oes_data/la_oes_cleaned_data.csv")
-        print(f"   - oes_data/la_oes_analysis_results.csv")
-        print(f"   - oes_data/la_location_quotient_report.csv")
+        print(f"   - oes_data/store/la_oes_cleaned_data/")
+        print(f"   - oes_data/store/la_oes_analysis_results/")
+        print(f"   - oes_data/store/la_location_quotient_report/")
+        print(f"   - oes_data/store/la_oes_soc_groups/")
         
         print(f"\n🎯 Key findings:")
         print(f"   - Los Angeles has {len(data)} occupations with location quotient data")
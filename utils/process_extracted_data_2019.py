@@ -8,6 +8,7 @@ import pandas as pd
 import os
 from io import StringIO
 import re
+from oes_store import ResultStore
 
 def process_extracted_html_2019():
     """Process the extracted 2019 HTML data"""
@@ -52,10 +53,11 @@ def process_extracted_html_2019():
         cleaned_table = clean_oes_data_2019(main_table)
         
         if cleaned_table is not None:
-            # Save the cleaned data
-            output_file = os.path.join("oes_data_2019", "la_oes_2019_cleaned_data.csv")
-            cleaned_table.to_csv(output_file, index=False)
-            print(f"💾 Cleaned data saved to {output_file}")
+            # Save the cleaned data (Parquet partitioned by area/year; CSV only when export is enabled)
+            store = ResultStore()
+            store.write(cleaned_table, "la_oes_cleaned_data", area="31080", year=2019,
+                        csv_path=os.path.join("oes_data_2019", "la_oes_2019_cleaned_data.csv"))
+            print(f"💾 Cleaned data saved to {store.table_dir('la_oes_cleaned_data')}")
             
             # Analyze the data
             analyze_oes_data_2019(cleaned_table)
@@ -195,7 +197,6 @@ def analyze_oes_data_2019(df):
         print(f"   Low concentration (LQ ≤ 0.5): {len(low_concentration)} occupations")
         
         # Save analysis results
-        analysis_file = os.path.join("oes_data_2019", "la_oes_2019_analysis_results.csv")
         
         # Create analysis summary
         analysis_summary = pd.DataFrame({
@@ -206,8 +207,10 @@ def analyze_oes_data_2019(df):
                      lq_stats['mean'], lq_stats['50%']]
         })
         
-        analysis_summary.to_csv(analysis_file, index=False)
-        print(f"\n💾 Analysis results saved to {analysis_file}")
+        store = ResultStore()
+        store.write(analysis_summary, "la_oes_analysis_results", area="31080", year=2019,
+                    csv_path=os.path.join("oes_data_2019", "la_oes_2019_analysis_results.csv"))
+        print(f"\n💾 Analysis results saved to {store.table_dir('la_oes_analysis_results')}")
         
     except Exception as e:
         print(f"❌ Error analyzing data: {e}")
@@ -275,9 +278,10 @@ def create_location_quotient_report_2019(df):
         report_df.insert(0, 'Rank', range(1, len(report_df) + 1))
         
         # Save report
-        report_file = os.path.join("oes_data_2019", "la_location_quotient_2019_report.csv")
-        report_df.to_csv(report_file, index=False)
-        print(f"💾 Location quotient report saved to {report_file}")
+        store = ResultStore()
+        store.write(report_df, "la_location_quotient_report", area="31080", year=2019,
+                    csv_path=os.path.join("oes_data_2019", "la_location_quotient_2019_report.csv"))
+        print(f"💾 Location quotient report saved to {store.table_dir('la_location_quotient_report')}")
         
         # Print summary
         print(f"\n📊 REPORT SUMMARY:")
@@ -304,7 +308,7 @@ def main():
             
             print(f"\n✅ 2019 Data processing completed successfully!")
             print(f"📊 Processed {len(cleaned_data)} occupations")
-            print(f"📁 Files created in oes_data_2019/")
+            print(f"📁 Tables written to oes_data/store/ (year=2019 partitions)")
             
         else:
             print("\n❌ Data processing failed")
@@ -0,0 +1,283 @@
+"""
+Incremental rolling concentration metrics for the monthly CES feed
+
+Keeps running state per (area, sector): a 24-month ring buffer of area and
+national employment plus running 12-month sums. A new month (or a revision
+of a recent one) updates that state in constant time per series, instead of
+recomputing every ratio from scratch. Rolling metrics read straight from the
+state:
+
+- 12-month average employment (area and national)
+- year-over-year change of the latest month
+- rolling concentration ratio and rolling LQ (12-month averages against the
+  area's total nonfarm)
+
+State is persisted with np.savez and can be rebuilt from a CESPanel or from a
+stored concentration table.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, Optional, Sequence
+from bls_periods import month_index
+
+WINDOW = 12
+# Two windows of history so the value 12 months back is always available for YoY
+RING = 2 * WINDOW
+
+TOTAL_SECTOR = "00"
+
+
+class RollingConcentration:
+    """Running 12-month state per (area, sector) with O(1) monthly updates"""
+
+    def __init__(self, capacity: int = 64):
+        """
+        Initialize empty state
+
+        Args:
+            capacity: Initial number of (area, sector) rows to allocate
+        """
+        self.areas = np.empty(0, dtype=object)
+        self.sectors = np.empty(0, dtype=object)
+        self._index: Dict[tuple, int] = {}
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int):
+        """Allocate (or grow) the state arrays"""
+        old = getattr(self, 'area_ring', None)
+        n = 0 if old is None else len(self._index)
+
+        def grow(array, fill, shape_tail=()):
+            new = np.full((capacity,) + shape_tail, fill, dtype=array.dtype if array is not None else float)
+            if array is not None:
+                new[:n] = array[:n]
+            return new
+
+        self.area_ring = grow(old, np.nan, (RING,))
+        self.national_ring = grow(getattr(self, 'national_ring', None), np.nan, (RING,))
+        self.area_sum = grow(getattr(self, 'area_sum', None), 0.0)
+        self.national_sum = grow(getattr(self, 'national_sum', None), 0.0)
+        self.area_count = grow(getattr(self, 'area_count', None), 0.0)
+        self.national_count = grow(getattr(self, 'national_count', None), 0.0)
+        self.last_month = grow(getattr(self, 'last_month', None), -1.0).astype(np.int64)
+
+    def __len__(self):
+        return len(self._index)
+
+    def rows(self, areas: Iterable[str], sectors: Iterable[str]) -> np.ndarray:
+        """State rows of (area, sector) keys, adding rows for new keys"""
+        keys = list(zip((str(a) for a in areas), (str(s) for s in sectors)))
+        new_keys = [key for key in dict.fromkeys(keys) if key not in self._index]
+        if new_keys:
+            needed = len(self._index) + len(new_keys)
+            if needed > len(self.area_sum):
+                self._allocate(max(needed, 2 * len(self.area_sum)))
+            for key in new_keys:
+                self._index[key] = len(self._index)
+            self.areas = np.concatenate([self.areas, np.array([k[0] for k in new_keys], dtype=object)])
+            self.sectors = np.concatenate([self.sectors, np.array([k[1] for k in new_keys], dtype=object)])
+        return np.fromiter((self._index[key] for key in keys), dtype=np.int64, count=len(keys))
+
+    def update(self, areas: Sequence[str], sectors: Sequence[str], month: int,
+               area_values: np.ndarray, national_values: np.ndarray):
+        """
+        Apply one month of observations (new month or revision) for many series
+
+        Args:
+            areas: Area code per observation
+            sectors: Sector code per observation
+            month: Month index of every observation (bls_periods time index)
+            area_values: Area employment per observation
+            national_values: National employment of the same sector per observation
+        """
+        rows = self.rows(areas, sectors)
+        area_values = np.asarray(area_values, dtype=float)
+        national_values = np.asarray(national_values, dtype=float)
+
+        gap = month - self.last_month[rows]
+        fresh = (self.last_month[rows] < 0) | (gap >= RING)
+        if fresh.any():
+            self._reset(rows[fresh])
+            gap = np.where(fresh, 1, gap)
+            self.last_month[rows[fresh]] = month - 1
+
+        # Advance rows whose latest month is behind (at most RING constant-size steps)
+        advancing = gap > 0
+        for step in range(1, int(gap.max(initial=0)) + 1):
+            moving = rows[advancing & (gap >= step)]
+            if moving.size:
+                self._advance(moving, self.last_month[moving] + 1)
+
+        # Revisions within the ring replace the stored value; older ones are ignored
+        in_ring = gap > -RING
+        self._set(rows[in_ring], month, area_values[in_ring], national_values[in_ring])
+
+    def update_frame(self, df: pd.DataFrame, area_col: str = 'area', sector_col: str = 'sector',
+                     month_col: str = 'month', area_value_col: str = 'la_employment',
+                     national_value_col: str = 'national_employment'):
+        """Apply a long table of observations, one vectorized update per month in ascending order"""
+        for month, part in df.sort_values(month_col, kind='stable').groupby(month_col, sort=True):
+            self.update(part[area_col].to_numpy(), part[sector_col].to_numpy(), int(month),
+                        part[area_value_col].to_numpy(), part[national_value_col].to_numpy())
+
+    def _reset(self, rows: np.ndarray):
+        """Clear the state of rows that start over"""
+        self.area_ring[rows] = np.nan
+        self.national_ring[rows] = np.nan
+        self.area_sum[rows] = 0.0
+        self.national_sum[rows] = 0.0
+        self.area_count[rows] = 0.0
+        self.national_count[rows] = 0.0
+
+    def _advance(self, rows: np.ndarray, months: np.ndarray):
+        """Move rows to the next month: drop the month leaving the window and free its slot"""
+        leaving = (months - WINDOW) % RING
+        for ring, total, count in ((self.area_ring, self.area_sum, self.area_count),
+                                   (self.national_ring, self.national_sum, self.national_count)):
+            old = ring[rows, leaving]
+            known = ~np.isnan(old)
+            total[rows] -= np.where(known, old, 0.0)
+            count[rows] -= known
+            # The slot of the new month still holds the value from RING months ago
+            ring[rows, months % RING] = np.nan
+        self.last_month[rows] = months
+
+    def _set(self, rows: np.ndarray, month: int, area_values: np.ndarray, national_values: np.ndarray):
+        """Store values for a month, keeping the window sums in step"""
+        slot = month % RING
+        in_window = (self.last_month[rows] - month) < WINDOW
+        for ring, total, count, values in ((self.area_ring, self.area_sum, self.area_count, area_values),
+                                           (self.national_ring, self.national_sum, self.national_count, national_values)):
+            old = ring[rows, slot]
+            old_known, new_known = ~np.isnan(old), ~np.isnan(values)
+            delta = np.where(new_known, values, 0.0) - np.where(old_known, old, 0.0)
+            total[rows] += np.where(in_window, delta, 0.0)
+            count[rows] += np.where(in_window, new_known.astype(float) - old_known, 0.0)
+            ring[rows, slot] = values
+
+    def metrics(self, total_sector: str = TOTAL_SECTOR, min_months: int = WINDOW) -> pd.DataFrame:
+        """
+        Current rolling metrics for every (area, sector)
+
+        Args:
+            total_sector: Sector code of each area's total (for the rolling LQ)
+            min_months: Observed months required for the 12-month averages
+
+        Returns:
+            DataFrame with area, sector, month, employment, yoy_change,
+            yoy_percent_change, avg_12m, national_avg_12m,
+            rolling_concentration and rolling_lq
+        """
+        n = len(self._index)
+        rows = np.arange(n)
+        last = self.last_month[:n]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            area_avg = np.where(self.area_count[:n] >= min_months, self.area_sum[:n] / self.area_count[:n], np.nan)
+            national_avg = np.where(self.national_count[:n] >= min_months,
+                                    self.national_sum[:n] / self.national_count[:n], np.nan)
+
+            current = self.area_ring[rows, last % RING]
+            year_ago = self.area_ring[rows, (last - WINDOW) % RING]
+            yoy = current - year_ago
+
+            # Each area's total nonfarm averages, looked up by area
+            total_rows = np.array([self._index.get((area, total_sector), -1) for area in self.areas], dtype=np.int64)
+            has_total = total_rows >= 0
+            area_total = np.where(has_total, area_avg[total_rows], np.nan)
+            national_total = np.where(has_total, national_avg[total_rows], np.nan)
+
+            metrics = pd.DataFrame({
+                'area': self.areas,
+                'sector': self.sectors,
+                'month': last,
+                'employment': current,
+                'yoy_change': yoy,
+                'yoy_percent_change': yoy / year_ago * 100,
+                'avg_12m': area_avg,
+                'national_avg_12m': national_avg,
+                'rolling_concentration': area_avg / national_avg * 100,
+                'rolling_lq': (area_avg / area_total) / (national_avg / national_total),
+            })
+
+        numeric = metrics.columns[3:]
+        metrics[numeric] = metrics[numeric].replace([np.inf, -np.inf], np.nan)
+        return metrics
+
+    def save(self, path: str):
+        """Persist the state to a .npz file"""
+        n = len(self._index)
+        np.savez(path, areas=self.areas.astype(str), sectors=self.sectors.astype(str),
+                 area_ring=self.area_ring[:n], national_ring=self.national_ring[:n],
+                 area_sum=self.area_sum[:n], national_sum=self.national_sum[:n],
+                 area_count=self.area_count[:n], national_count=self.national_count[:n],
+                 last_month=self.last_month[:n])
+
+    @classmethod
+    def load(cls, path: str) -> 'RollingConcentration':
+        """Load state written by save()"""
+        with np.load(path) as data:
+            state = cls(capacity=max(len(data['areas']), 1))
+            state.rows(data['areas'], data['sectors'])
+            n = len(data['areas'])
+            for name in ('area_ring', 'national_ring', 'area_sum', 'national_sum',
+                         'area_count', 'national_count', 'last_month'):
+                getattr(state, name)[:n] = data[name]
+        return state
+
+    @classmethod
+    def from_panel(cls, panel, national_area: Optional[str] = None, last_months: int = RING) -> 'RollingConcentration':
+        """
+        Rebuild state from a CESPanel
+
+        Args:
+            panel: CESPanel (area x supersector x month)
+            national_area: Area code of the national rows (defaults to ces_panel.NATIONAL_AREA)
+            last_months: Months replayed from the end of the panel (RING is enough)
+
+        Returns:
+            RollingConcentration
+        """
+        from ces_panel import NATIONAL_AREA
+        national_pos = panel.area_index(national_area or NATIONAL_AREA)
+        metro = np.arange(len(panel.areas)) != national_pos
+
+        areas = np.repeat(panel.areas[metro], len(panel.supersectors))
+        sectors = np.tile(panel.supersectors, metro.sum())
+
+        state = cls(capacity=len(areas))
+        for t in range(max(0, len(panel.months) - last_months), len(panel.months)):
+            area_values = np.asarray(panel.values[metro, :, t], dtype=float).ravel()
+            national_values = np.tile(np.asarray(panel.values[national_pos, :, t], dtype=float), metro.sum())
+            state.update(areas, sectors, int(panel.months[t]), area_values, national_values)
+        return state
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, area: Optional[str] = None, sector_col: str = 'sector') -> 'RollingConcentration':
+        """
+        Rebuild state from a stored concentration table (date, sector,
+        la_employment, national_employment[, area])
+
+        Args:
+            df: Concentration table, e.g. the la_concentration_metrics store table
+            area: Area code used when the table has no area column
+            sector_col: Column identifying the sector
+
+        Returns:
+            RollingConcentration
+        """
+        dates = pd.DatetimeIndex(df['date'])
+        frame = pd.DataFrame({
+            'area': df['area'].astype(str).to_numpy() if 'area' in df.columns else str(area),
+            'sector': df[sector_col].astype(str).to_numpy(),
+            'month': month_index(dates.year, dates.month),
+            'la_employment': pd.to_numeric(df['la_employment'], errors='coerce').to_numpy(),
+            'national_employment': pd.to_numeric(df['national_employment'], errors='coerce').to_numpy(),
+        })
+        # Only the last RING months matter for the state
+        frame = frame[frame['month'] > frame['month'].max() - RING]
+
+        state = cls()
+        state.update_frame(frame)
+        return state
@@ -0,0 +1,180 @@
+"""
+Batch seasonal adjustment for not-seasonally-adjusted (CEU/SMU) series
+
+Classical ratio-to-moving-average decomposition run over a whole
+(series x month) array at once:
+
+1. trend   = centered 2x12 moving average along the month axis
+2. ratio   = value / trend
+3. factor  = mean ratio per calendar month, normalized to average 1
+4. adjusted = value / factor
+
+SeasonalFactors caches the per-series ratio sums and counts by calendar month,
+so later runs only add the months whose ratios became computable since the
+last update instead of refitting every series.
+"""
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict, Iterable, Optional, Sequence
+
+# Centered 2x12 moving average (13 taps, half weights at the ends)
+WEIGHTS = np.r_[0.5, np.ones(11), 0.5] / 12
+HALF_WINDOW = 6
+
+# Calendar months with fewer ratios than this keep a factor of 1 (no adjustment)
+MIN_YEARS = 3
+
+
+def centered_moving_average(values: np.ndarray) -> np.ndarray:
+    """
+    2x12 centered moving average along the last axis
+
+    Args:
+        values: (..., n_months) array of consecutive months
+
+    Returns:
+        Array of the same shape, NaN for the first and last 6 months and
+        wherever the window has a missing value
+    """
+    values = np.asarray(values, dtype=float)
+    trend = np.full(values.shape, np.nan)
+    if values.shape[-1] < len(WEIGHTS):
+        return trend
+    windows = sliding_window_view(values, len(WEIGHTS), axis=-1)
+    trend[..., HALF_WINDOW:values.shape[-1] - HALF_WINDOW] = windows @ WEIGHTS
+    return trend
+
+
+def _calendar_onehot(months: np.ndarray) -> np.ndarray:
+    """(n_months, 12) one-hot matrix of calendar months"""
+    return (np.asarray(months)[:, None] % 12 == np.arange(12)[None, :]).astype(float)
+
+
+class SeasonalFactors:
+    """Cached multiplicative seasonal factors per series with incremental updates"""
+
+    def __init__(self):
+        self.keys = []
+        self._index: Dict[str, int] = {}
+        self.ratio_sum = np.zeros((0, 12))
+        self.ratio_count = np.zeros((0, 12))
+        self.last_month = np.zeros(0, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def rows(self, keys: Iterable[str]) -> np.ndarray:
+        """Cache rows of series keys, adding rows for new series"""
+        keys = [str(key) for key in keys]
+        new_keys = [key for key in dict.fromkeys(keys) if key not in self._index]
+        if new_keys:
+            for key in new_keys:
+                self._index[key] = len(self.keys)
+                self.keys.append(key)
+            extra = len(new_keys)
+            self.ratio_sum = np.vstack([self.ratio_sum, np.zeros((extra, 12))])
+            self.ratio_count = np.vstack([self.ratio_count, np.zeros((extra, 12))])
+            self.last_month = np.concatenate([self.last_month, np.full(extra, -1, dtype=np.int64)])
+        return np.array([self._index[key] for key in keys], dtype=np.int64)
+
+    def update(self, keys: Sequence[str], values: np.ndarray, months: np.ndarray):
+        """
+        Add the seasonal ratios of months not seen before
+
+        Args:
+            keys: Series key per row of values
+            values: (n_series, n_months) array over consecutive months; passing
+                only the recent tail (13+ months) is enough for a refresh
+            months: Month index of each column (bls_periods time index)
+        """
+        rows = self.rows(keys)
+        values = np.asarray(values, dtype=float)
+        months = np.asarray(months, dtype=np.int64)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = values / centered_moving_average(values)
+
+        # Only ratios for months after each series' last cached month are new
+        new = ~np.isnan(ratio) & (months[None, :] > self.last_month[rows][:, None])
+        onehot = _calendar_onehot(months)
+        self.ratio_sum[rows] += np.where(new, ratio, 0.0) @ onehot
+        self.ratio_count[rows] += new.astype(float) @ onehot
+
+        latest = np.where(new, months[None, :], -1).max(axis=1)
+        self.last_month[rows] = np.maximum(self.last_month[rows], latest)
+
+    def factors(self, keys: Optional[Sequence[str]] = None, min_years: int = MIN_YEARS) -> np.ndarray:
+        """
+        Normalized seasonal factors
+
+        Args:
+            keys: Series keys (defaults to every cached series)
+            min_years: Ratios required per calendar month
+
+        Returns:
+            (n_series, 12) factors indexed by calendar month (0 = January),
+            1.0 where there is not enough history
+        """
+        rows = np.arange(len(self.keys)) if keys is None else self.rows(keys)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            raw = np.where(self.ratio_count[rows] >= min_years,
+                           self.ratio_sum[rows] / self.ratio_count[rows], np.nan)
+            raw = raw / np.nanmean(raw, axis=1, keepdims=True)
+        return np.where(np.isnan(raw), 1.0, raw)
+
+    def adjust(self, keys: Sequence[str], values: np.ndarray, months: np.ndarray,
+               min_years: int = MIN_YEARS) -> np.ndarray:
+        """Seasonally adjust a (n_series, n_months) array with the cached factors"""
+        factors = self.factors(keys, min_years)
+        return np.asarray(values, dtype=float) / factors[:, np.asarray(months) % 12]
+
+    def save(self, path: str):
+        """Persist the cache to a .npz file"""
+        np.savez(path, keys=np.array(self.keys, dtype=str), ratio_sum=self.ratio_sum,
+                 ratio_count=self.ratio_count, last_month=self.last_month)
+
+    @classmethod
+    def load(cls, path: str) -> 'SeasonalFactors':
+        """Load a cache written by save()"""
+        cache = cls()
+        with np.load(path) as data:
+            cache.rows(data['keys'])
+            cache.ratio_sum[:] = data['ratio_sum']
+            cache.ratio_count[:] = data['ratio_count']
+            cache.last_month[:] = data['last_month']
+        return cache
+
+
+def adjust_frame(df: pd.DataFrame, key_col: str, time_col: str, value_col: str,
+                 cache: Optional[SeasonalFactors] = None) -> pd.Series:
+    """
+    Seasonally adjust a long table of monthly series in one batch
+
+    Args:
+        df: Long table with one row per series and month
+        key_col: Series key column (e.g. series_id or sector)
+        time_col: Month index column (bls_periods time index)
+        value_col: Value column to adjust
+        cache: Factor cache to update and use (a fresh one if not given)
+
+    Returns:
+        Adjusted values aligned with df's index
+    """
+    cache = cache if cache is not None else SeasonalFactors()
+    if df.empty:
+        return pd.Series(dtype=float, index=df.index)
+
+    key_idx, keys = pd.factorize(df[key_col].astype(str))
+    months = df[time_col].to_numpy(dtype=np.int64)
+    first = months.min()
+    span = np.arange(first, months.max() + 1)
+
+    # Scatter into a dense (series x consecutive month) array
+    values = np.full((len(keys), len(span)), np.nan)
+    values[key_idx, months - first] = pd.to_numeric(df[value_col], errors='coerce').to_numpy(dtype=float)
+
+    cache.update(keys, values, span)
+    adjusted = cache.adjust(keys, values, span)
+    return pd.Series(adjusted[key_idx, months - first], index=df.index)
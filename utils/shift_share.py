@@ -0,0 +1,170 @@
+"""
+Vectorized shift-share decomposition of metro employment change
+
+For metro r, sector i and a (start, end) period pair, regional employment
+change e_i1 - e_i0 splits into:
+
+    national growth  NG = e_i0 * G              (G   = national total growth)
+    industry mix     IM = e_i0 * (g_i - G)      (g_i = national sector growth)
+    regional shift   RS = e_i0 * (r_i - g_i)    (r_i = regional sector growth)
+
+Every component is computed for all metros, sectors and period pairs at once
+by indexing a (metro x sector x period) employment array with the pair
+indices, giving (pair x metro x sector) arrays.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Sequence, Tuple
+
+COMPONENTS = ('actual_change', 'national_growth', 'industry_mix', 'regional_shift')
+
+
+def all_pairs(n_periods: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(start, end) indices of every ordered pair of periods"""
+    return np.triu_indices(n_periods, k=1)
+
+
+def shift_share(regional: np.ndarray, national: np.ndarray, national_total: Optional[np.ndarray] = None,
+                pairs: Optional[Tuple[Sequence[int], Sequence[int]]] = None) -> Dict[str, np.ndarray]:
+    """
+    Decompose regional employment change for every metro, sector and period pair
+
+    Args:
+        regional: (n_metros, n_sectors, n_periods) employment, e.g. annual averages
+        national: (n_sectors, n_periods) national employment of the same sectors
+        national_total: (n_periods,) national total employment. Defaults to
+            the sum over sectors (pass it explicitly when sectors overlap,
+            e.g. supersectors plus total private)
+        pairs: (start indices, end indices) along the period axis. Defaults
+            to every ordered pair
+
+    Returns:
+        Dictionary of (n_pairs, n_metros, n_sectors) arrays: actual_change,
+        national_growth, industry_mix, regional_shift, plus the growth rates
+        national_rate (n_pairs,), sector_rate (n_pairs, n_sectors) and
+        regional_rate (n_pairs, n_metros, n_sectors)
+    """
+    regional = np.asarray(regional, dtype=float)
+    if regional.ndim == 2:
+        regional = regional[None]
+    national = np.asarray(national, dtype=float)
+    if national_total is None:
+        national_total = np.nansum(national, axis=0)
+    national_total = np.asarray(national_total, dtype=float)
+
+    start, end = pairs if pairs is not None else all_pairs(regional.shape[-1])
+    start, end = np.asarray(start), np.asarray(end)
+
+    # Move the pair axis first: (pair, metro, sector) and (pair, sector)
+    e0 = np.moveaxis(regional[..., start], -1, 0)
+    e1 = np.moveaxis(regional[..., end], -1, 0)
+    n0 = national[:, start].T
+    n1 = national[:, end].T
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        national_rate = national_total[end] / national_total[start] - 1
+        sector_rate = n1 / n0 - 1
+        regional_rate = e1 / e0 - 1
+
+    national_growth = e0 * national_rate[:, None, None]
+    industry_mix = e0 * (sector_rate - national_rate[:, None])[:, None, :]
+    regional_shift = e0 * (regional_rate - sector_rate[:, None, :])
+
+    return {
+        'actual_change': e1 - e0,
+        'national_growth': national_growth,
+        'industry_mix': industry_mix,
+        'regional_shift': regional_shift,
+        'national_rate': national_rate,
+        'sector_rate': sector_rate,
+        'regional_rate': regional_rate,
+    }
+
+
+def shift_share_frame(result: Dict[str, np.ndarray], metros: Sequence[str], sectors: Sequence[str],
+                      periods: Sequence, pairs: Optional[Tuple[Sequence[int], Sequence[int]]] = None) -> pd.DataFrame:
+    """
+    Flatten shift_share output to a long table
+
+    Args:
+        result: Output of shift_share
+        metros: Labels of the metro axis
+        sectors: Labels of the sector axis
+        periods: Labels of the period axis
+        pairs: The pairs passed to shift_share (defaults to every ordered pair)
+
+    Returns:
+        DataFrame with start, end, metro, sector and one column per component
+    """
+    periods = np.asarray(periods)
+    start, end = pairs if pairs is not None else all_pairs(len(periods))
+    n_pairs, n_metros, n_sectors = result['actual_change'].shape
+    cells = n_metros * n_sectors
+
+    frame = pd.DataFrame({
+        'start': np.repeat(periods[np.asarray(start)], cells),
+        'end': np.repeat(periods[np.asarray(end)], cells),
+        'metro': np.tile(np.repeat(np.asarray(metros), n_sectors), n_pairs),
+        'sector': np.tile(np.asarray(sectors), n_pairs * n_metros),
+    })
+    for name in COMPONENTS:
+        frame[name] = result[name].ravel()
+    frame['regional_rate'] = result['regional_rate'].ravel() * 100
+    return frame
+
+
+def annual_averages(values: np.ndarray, months: np.ndarray, min_months: int = 12) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Annual averages along the last (month) axis of a panel
+
+    Args:
+        values: Array whose last axis is monthly
+        months: Month index of that axis (bls_periods time index)
+        min_months: Observed months required for a year's average
+
+    Returns:
+        Tuple of (years, array with the month axis replaced by a year axis)
+    """
+    values = np.asarray(values, dtype=float)
+    years = np.asarray(months) // 12
+    unique_years = np.unique(years)
+
+    # (..., year, month) sums via a one-hot year matrix: one matmul for every series
+    membership = (years[:, None] == unique_years[None, :]).astype(float)
+    known = ~np.isnan(values)
+    totals = np.where(known, values, 0.0) @ membership
+    counts = known.astype(float) @ membership
+    with np.errstate(divide='ignore', invalid='ignore'):
+        averages = np.where(counts >= min_months, totals / counts, np.nan)
+    return unique_years, averages
+
+
+def shift_share_from_panel(panel, sectors: Optional[Sequence[str]] = None, total_sector: str = "00",
+                           national_area: Optional[str] = None, pairs=None) -> pd.DataFrame:
+    """
+    Shift-share for every metro of a CESPanel on annual averages
+
+    Args:
+        panel: CESPanel
+        sectors: Supersector codes to decompose (defaults to every supersector
+            except the total)
+        total_sector: Supersector code of total nonfarm (national growth base)
+        national_area: Area code of the national rows (defaults to ces_panel.NATIONAL_AREA)
+        pairs: Optional (start, end) year-index pairs
+
+    Returns:
+        Long DataFrame from shift_share_frame (start/end are years)
+    """
+    from ces_panel import NATIONAL_AREA
+    national_pos = panel.area_index(national_area or NATIONAL_AREA)
+    if sectors is None:
+        sectors = [code for code in panel.supersectors if code != total_sector]
+    sector_pos = [panel.supersector_index(code) for code in sectors]
+    metro = np.flatnonzero(np.arange(len(panel.areas)) != national_pos)
+
+    years, annual = annual_averages(panel.values, panel.months)
+    national = annual[national_pos]
+    result = shift_share(annual[metro][:, sector_pos], national[sector_pos],
+                         national[panel.supersector_index(total_sector)], pairs)
+    return shift_share_frame(result, panel.areas[metro], sectors, years, pairs)
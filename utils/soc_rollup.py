@@ -0,0 +1,233 @@
+"""
+SOC hierarchy rollups with a sparse membership matrix
+
+Detailed occupations are mapped to broad/minor/major SOC groups (and custom
+groupings such as entertainment occupations) through one sparse
+(occupation x group) membership matrix. Group employment, employment-weighted
+LQs and changes for every area and group then come from a single sparse
+matrix product, and can be checked against BLS-published group totals.
+"""
+
+import re
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+SOC_LEVELS = ('major', 'minor', 'broad')
+
+# Custom groupings used in the docs, as SOC code prefixes (digits only)
+CUSTOM_GROUPS = {
+    'Entertainment Occupations': ['272', '274'],  # Entertainers/performers/sports + media equipment workers
+    'Personal Appearance Workers': ['3950'],      # Barbers, hairdressers, shampooers, ...
+}
+
+SOC_CODE_PATTERN = re.compile(r'(\d{2})-?(\d{4})')
+
+
+def normalize_soc(code) -> Optional[str]:
+    """Return a 6-digit SOC code ('27-2011', '272011', 'Actors (27-2011)' -> '272011')"""
+    match = SOC_CODE_PATTERN.search(str(code))
+    return match.group(1) + match.group(2) if match else None
+
+
+def soc_parent(code: str, level: str) -> str:
+    """
+    Parent group code of a 6-digit SOC code
+
+    Args:
+        code: 6-digit SOC code
+        level: 'major' (27-0000), 'minor' (27-2000) or 'broad' (27-2010)
+
+    Returns:
+        6-digit parent code
+    """
+    if level == 'major':
+        return code[:2] + '0000'
+    if level == 'minor':
+        return code[:3] + '000'
+    if level == 'broad':
+        return code[:5] + '0'
+    raise ValueError(f"Unknown SOC level '{level}'. Use one of {SOC_LEVELS}")
+
+
+def is_detailed(code: str) -> bool:
+    """Detailed occupations end in a non-zero digit (aggregates end in 0)"""
+    return code is not None and code[-1] != '0'
+
+
+def build_membership(occupation_codes: Sequence[str], levels: Sequence[str] = ('major', 'minor'),
+                     custom_groups: Optional[Dict[str, Iterable[str]]] = None) -> Tuple[sparse.csr_matrix, pd.DataFrame]:
+    """
+    Build the sparse (occupation x group) membership matrix
+
+    Args:
+        occupation_codes: Occupation codes of the matrix columns (any SOC format)
+        levels: SOC levels to roll up to
+        custom_groups: Mapping of group name -> SOC code prefixes
+
+    Returns:
+        Tuple of (CSR matrix of shape (n_occupations, n_groups), groups frame
+        with columns group, level)
+    """
+    codes = [normalize_soc(code) for code in occupation_codes]
+
+    rows, cols, groups, group_levels = [], [], [], []
+    index = {}
+
+    def add(row, group, level):
+        key = (level, group)
+        if key not in index:
+            index[key] = len(groups)
+            groups.append(group)
+            group_levels.append(level)
+        rows.append(row)
+        cols.append(index[key])
+
+    for row, code in enumerate(codes):
+        # Only detailed occupations are summed, so published aggregate rows are never double counted
+        if not is_detailed(code):
+            continue
+        for level in levels:
+            add(row, soc_parent(code, level), level)
+        for name, prefixes in (custom_groups or {}).items():
+            if any(code.startswith(prefix.replace('-', '')) for prefix in prefixes):
+                add(row, name, 'custom')
+
+    membership = sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(len(codes), len(groups)))
+    return membership, pd.DataFrame({'group': groups, 'level': group_levels})
+
+
+def rollup(employment: np.ndarray, membership: sparse.spmatrix, lq: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """
+    Aggregate an (area x occupation) matrix to (area x group) in one sparse product
+
+    Args:
+        employment: (n_areas, n_occupations) employment, NaN for suppressed cells
+        membership: (n_occupations, n_groups) membership matrix
+        lq: Optional (n_areas, n_occupations) LQs to employment-weight
+
+    Returns:
+        Dictionary of (n_areas, n_groups) arrays: employment, reported
+        (number of unsuppressed members) and, if lq is given, weighted_lq
+    """
+    e = np.atleast_2d(np.asarray(employment, dtype=float))
+    known = ~np.isnan(e)
+    e0 = np.where(known, e, 0.0)
+
+    # Stack the operands so one sparse matmul serves every aggregate
+    operands = [e0, known.astype(float)]
+    if lq is not None:
+        # Suppressed LQs only drop out of the weighted LQ, never out of employment
+        lq = np.atleast_2d(np.asarray(lq, dtype=float))
+        weighted = known & ~np.isnan(lq)
+        ew = np.where(weighted, e, 0.0)
+        operands.extend([ew * np.where(weighted, lq, 0.0), ew])
+    stacked = np.vstack(operands)
+    product = np.asarray((membership.T @ stacked.T).T)
+
+    n = e.shape[0]
+    result = {
+        'employment': product[:n],
+        'reported': product[n:2 * n],
+    }
+    if lq is not None:
+        numerator, denominator = product[2 * n:3 * n], product[3 * n:]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result['weighted_lq'] = np.where(denominator > 0, numerator / denominator, np.nan)
+    return result
+
+
+def rollup_changes(start: Dict[str, np.ndarray], end: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Employment and weighted-LQ changes between two rollups of the same membership"""
+    changes = {'employment_change': end['employment'] - start['employment']}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        changes['employment_percent_change'] = np.where(
+            start['employment'] > 0, changes['employment_change'] / start['employment'] * 100, np.nan)
+    if 'weighted_lq' in start and 'weighted_lq' in end:
+        changes['weighted_lq_change'] = end['weighted_lq'] - start['weighted_lq']
+    return changes
+
+
+def rollup_frame(df: pd.DataFrame, area_col: str = 'area', occupation_col: str = 'occupation_code',
+                 employment_col: str = 'employment', lq_col: Optional[str] = None,
+                 levels: Sequence[str] = ('major', 'minor'),
+                 custom_groups: Optional[Dict[str, Iterable[str]]] = CUSTOM_GROUPS) -> pd.DataFrame:
+    """
+    Roll a long (area, occupation) table up to SOC groups
+
+    Args:
+        df: Long table with one row per area and occupation
+        area_col: Area column
+        occupation_col: Occupation code column (any SOC format)
+        employment_col: Employment column
+        lq_col: Optional LQ column to employment-weight
+        levels: SOC levels to roll up to
+        custom_groups: Custom groupings (name -> SOC prefixes)
+
+    Returns:
+        Long DataFrame with area, group, level, employment, reported
+        (and weighted_lq)
+    """
+    codes = df[occupation_col].map(normalize_soc)
+    employment = pd.to_numeric(df[employment_col].astype(str).str.replace(',', '', regex=False), errors='coerce')
+    frame = pd.DataFrame({area_col: df[area_col].to_numpy(), 'code': codes.to_numpy(),
+                          'employment': employment.to_numpy()})
+    if lq_col is not None:
+        frame['lq'] = pd.to_numeric(df[lq_col], errors='coerce').to_numpy()
+    frame = frame.dropna(subset=['code'])
+
+    emp_matrix = frame.pivot_table(index=area_col, columns='code', values='employment', aggfunc='first', dropna=False)
+    membership, groups = build_membership(emp_matrix.columns, levels, custom_groups)
+
+    lq_matrix = None
+    if lq_col is not None:
+        lq_matrix = frame.pivot_table(index=area_col, columns='code', values='lq', aggfunc='first', dropna=False)
+        lq_matrix = lq_matrix.reindex(index=emp_matrix.index, columns=emp_matrix.columns).to_numpy(dtype=float)
+
+    result = rollup(emp_matrix.to_numpy(dtype=float), membership, lq_matrix)
+
+    n_areas, n_groups = len(emp_matrix.index), len(groups)
+    out = pd.DataFrame({
+        area_col: np.repeat(emp_matrix.index.to_numpy(), n_groups),
+        'group': np.tile(groups['group'].to_numpy(), n_areas),
+        'level': np.tile(groups['level'].to_numpy(), n_areas),
+    })
+    for name, values in result.items():
+        out[name] = values.ravel()
+    return out
+
+
+def check_against_published(rolled: pd.DataFrame, published: pd.DataFrame, area_col: str = 'area',
+                            group_col: str = 'group', employment_col: str = 'employment',
+                            tolerance: float = 0.05) -> pd.DataFrame:
+    """
+    Compare rolled-up group employment with BLS-published group totals
+
+    Published totals include suppressed detail, so a shortfall is expected
+    where members are suppressed; rows are flagged when the relative gap
+    exceeds tolerance.
+
+    Args:
+        rolled: Output of rollup_frame
+        published: Published totals with area, group (SOC code) and employment columns
+        area_col: Area column
+        group_col: Group column in both frames
+        employment_col: Employment column in published
+        tolerance: Allowed relative difference
+
+    Returns:
+        Rolled rows joined with published totals, with relative_difference and
+        consistent columns
+    """
+    published = published[[area_col, group_col, employment_col]].copy()
+    published[group_col] = published[group_col].map(normalize_soc)
+    published[employment_col] = pd.to_numeric(published[employment_col].astype(str).str.replace(',', '', regex=False),
+                                               errors='coerce')
+    published = published.rename(columns={employment_col: 'published_employment'})
+
+    merged = rolled.merge(published, on=[area_col, group_col], how='inner')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        merged['relative_difference'] = (merged['employment'] - merged['published_employment']) / merged['published_employment']
+    merged['consistent'] = merged['relative_difference'].abs() <= tolerance
+    return merged